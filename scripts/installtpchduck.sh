@@ -0,0 +1,13 @@
+echo "Installing DuckDB ..."
+pip install duckdb==1.5.6
+echo "Generating TPC-H data for DuckDB ..."
+python3 -c "
+import duckdb
+connection = duckdb.connect('/tmp/tpch.duckdb')
+connection.execute('install tpch')
+connection.execute('load tpch')
+connection.execute('call dbgen(sf=1)')
+queries = connection.execute('select query from tpch_queries()').fetchall()
+with open('/tmp/tpch_queries.sql', 'w') as file:
+    file.write('\n'.join(q[0] for q in queries))
+"
@@ -19,7 +19,7 @@ import search.objectives
 import torch
 
 from parameters.util import decompose_val
-from search.objectives import calculate_reward
+from search.objectives import calculate_reward, uses_latency
 from dbms.postgres import PgConfig
 
 class DDPGenv(object):
@@ -47,6 +47,8 @@ class DDPGenv(object):
         self.knob_units = []
         self.metric_dim = 1
         self._set_val_ranges()
+        if uses_latency(objective):
+            self.benchmark.track_latency()
         self.dbms.reset_config()
         self.dbms.reconfigure()
         self.def_metrics = self.benchmark.evaluate()
@@ -73,17 +75,17 @@ class DDPGenv(object):
 
     def evaluate(self, knob_data):
         """ Evaluate current configuration. """
-        self.dbms.reset_config()
+        config = {}
         for i in range(self.knob_dim):
             knob = self.knob_names[i]
             min_ = self.knobs_min[i]
             max_ = self.knobs_max[i]
             int_val = int(round(min_ + (max_ - min_) * knob_data[i]))
             unit = self.knob_units[i]
-            value = str(int_val) + unit
-            print(f'Setting {knob} to {value}')
-            success = self.dbms.set_param_smart(knob, value)
-            print(f'Set successful: {success}')
+            config[knob] = str(int_val) + unit
+        print(f'Setting knobs to {config}')
+        self.dbms.apply_config(config)
+        print(f'Set successfully: {self.dbms.changed()}')
         self.dbms.reconfigure()
         metrics = self.benchmark.evaluate()
         reward_val = calculate_reward(metrics, self.def_metrics, self.objective)
@@ -14,8 +14,13 @@ sys.path.append(str(src_dir))
 sys.path.append(str(root_dir))
 print(sys.path)
 
+from benchmark.compress import CompressedOLAP
+from benchmark.reset import DBReset
+from dbms.duck import DuckDBConfig
 from dbms.postgres import PgConfig
 from dbms.mysql import MySQLconfig
+from dbms.simulated import read_model, SimulatedDBMS
+from dbms.sqlite import SQLiteConfig
 from pybullet_utils.util import set_global_seeds
 from configparser import ConfigParser
 from doc.collection import DocCollection
@@ -24,6 +29,8 @@ from stable_baselines3 import DQN
 from stable_baselines3 import A2C
 from stable_baselines3.common.utils import set_random_seed
 import benchmark
+import benchmark.factory
+import benchmark.oltp
 import environment.multi_doc
 import numpy as np
 import random
@@ -52,7 +59,7 @@ def get_value(configuration, category, property_, default):
 config_dir = root_dir.joinpath('demo_configs')
 docs_dir = root_dir.joinpath('demo_docs')
 
-for config_path, path_to_docs, log_path in [
+experiments = [
     (config_dir.joinpath('pg_tpch_base.ini'), 
         docs_dir.joinpath('postgres100'), 'pg_tpch_log'),
     (config_dir.joinpath('ms_tpch_base.ini'), 
@@ -63,7 +70,15 @@ for config_path, path_to_docs, log_path in [
         docs_dir.joinpath('mysql100'), 'ms_tpcc_log'),
     (config_dir.joinpath('pg_tpch_base.ini'), 
         docs_dir.joinpath('pg_tpch_single'), 'pg_tpch_single_log')
-    ]:
+    ]
+# Optionally, run single experiment (e.g., with simulated DBMS):
+# allbench.py sim_tpch_base.ini postgres100 sim_tpch_log
+if len(sys.argv) == 4:
+    experiments = [(
+        config_dir.joinpath(sys.argv[1]), 
+        docs_dir.joinpath(sys.argv[2]), sys.argv[3])]
+
+for config_path, path_to_docs, log_path in experiments:
     config_path = str(config_path)
     path_to_docs = str(path_to_docs)
     
@@ -101,12 +116,24 @@ for config_path, path_to_docs, log_path in [
     db_pwd = get_value(config, 'DATABASE', 'password', '')
     restart_cmd = get_value(config, 'DATABASE', 'restart_cmd', '')
     recover_cmd = get_value(config, 'DATABASE', 'recovery_cmd', '')
+    sim_model = get_value(config, 'DATABASE', 'sim_model', None)
     if def_db == 'ms':
         dbms_id = 1
+    elif def_db == 'sim':
+        dbms_id = 2
+    elif def_db == 'sqlite':
+        dbms_id = 3
+    elif def_db == 'duck':
+        dbms_id = 4
     else:
         dbms_id = 0
     
     benchmark_type = int(get_value(config, 'BENCHMARK', 'type', 0))
+    race_factor = get_value(config, 'BENCHMARK', 'race_factor', None)
+    race_factor = None if race_factor is None else float(race_factor)
+    compress_error = get_value(config, 'BENCHMARK', 'compress_error', None)
+    compress_error = None if compress_error is None else float(compress_error)
+    validate_every = int(get_value(config, 'BENCHMARK', 'validate_every', 10))
     if benchmark_type == 0:
         query_path = get_value(config, 'BENCHMARK', 'queries', '')
         objective = search.objectives.Objective.TIME
@@ -117,9 +144,33 @@ for config_path, path_to_docs, log_path in [
         target_db = get_value(config, 'DATABASE', 'target_db', '')
         reset_every = int(get_value(config, 'BENCHMARK', 'reset_every', 10))
         oltp_result = pathlib.Path(oltp_home).joinpath('results')
+        monitor_s = get_value(config, 'BENCHMARK', 'monitor_s', None)
+        monitor_s = None if monitor_s is None else float(monitor_s)
+        rel_tolerance = float(
+            get_value(config, 'BENCHMARK', 'rel_tolerance', 0.05))
+        objective = search.objectives.Objective.THROUGHPUT
+    elif benchmark_type == 2:
+        query_path = get_value(config, 'BENCHMARK', 'queries', '')
+        nr_streams = int(get_value(config, 'BENCHMARK', 'nr_streams', 2))
+        objective = search.objectives.Objective.THROUGHPUT
+    elif benchmark_type == 3:
+        oltp_script = get_value(
+            config, 'BENCHMARK', 'transactions', 'read_update')
+        if oltp_script == 'read_update':
+            nr_warehouses = int(
+                get_value(config, 'BENCHMARK', 'nr_warehouses', 1))
+            transactions = benchmark.oltp.read_update_mix(nr_warehouses)
+        else:
+            transactions = benchmark.oltp.read_transactions(oltp_script)
+        nr_clients = int(get_value(config, 'BENCHMARK', 'nr_clients', 8))
+        warmup_s = float(get_value(config, 'BENCHMARK', 'warmup_s', 10))
+        measure_s = float(get_value(config, 'BENCHMARK', 'measure_s', 60))
         objective = search.objectives.Objective.THROUGHPUT
     else:
         raise ValueError(f'Error - unknown benchmark type: {benchmark_type}')
+    objective_name = get_value(config, 'BENCHMARK', 'objective', None)
+    if objective_name is not None:
+        objective = search.objectives.from_name(objective_name)
     
     if dbms_id == 0:
         dbms = PgConfig(
@@ -129,18 +180,45 @@ for config_path, path_to_docs, log_path in [
         dbms = MySQLconfig(
             db_name, db_user, db_pwd, restart_cmd, 
             recover_cmd, timeout_s)
+    elif dbms_id == 2:
+        dbms = SimulatedDBMS(read_model(sim_model), timeout_s)
+    elif dbms_id == 3:
+        dbms = SQLiteConfig(db_name, timeout_s)
+    elif dbms_id == 4:
+        dbms = DuckDBConfig(db_name, timeout_s)
     else:
         raise ValueError(f'Unknown DBMS ID: {dbms}')
     
-    if benchmark_type == 0:
-        bench = benchmark.evaluate.OLAP(dbms, query_path)
+    if dbms_id == 2:
+        bench = benchmark.evaluate.SimulatedOLAP(dbms, race_factor)
+    elif benchmark_type == 0:
+        if compress_error is None:
+            bench = benchmark.evaluate.OLAP(dbms, query_path, race_factor)
+        else:
+            bench = CompressedOLAP(
+                dbms, query_path, compress_error, validate_every, race_factor)
     elif benchmark_type == 1:
         bench = benchmark.evaluate.TpcC(
             oltp_home, oltp_config, oltp_result, 
-            dbms, template_db, target_db, reset_every)
+            dbms, template_db, target_db, reset_every,
+            monitor_s, rel_tolerance, DBReset.from_file(config))
+    elif benchmark_type == 2:
+        bench = benchmark.evaluate.OLAPStreams(dbms, query_path, nr_streams)
+    elif benchmark_type == 3:
+        bench = benchmark.oltp.OLTP(
+            dbms, transactions, nr_clients, warmup_s, measure_s)
     else:
         raise ValueError(f'Unknown benchmark type: {benchmark_type}')
     
+    options = config['BENCHMARK'] if 'BENCHMARK' in config else {}
+    benchmark.factory.configure(bench, options, dbms)
+    halving_eta = get_value(config, 'BENCHMARK', 'halving_eta', None)
+    halving_eta = None if halving_eta is None else float(halving_eta)
+    screen_plans = int(get_value(config, 'BENCHMARK', 'screen_plans', 0))
+    objective_weights = get_value(config, 'BENCHMARK', 'objective_weights', None)
+    if objective_weights is not None:
+        objective_weights = search.objectives.parse_weights(objective_weights)
+    
     for run_ctr in range(5):
         # Initialize for new run
         dbms.reset_config()
@@ -150,7 +228,8 @@ for config_path, path_to_docs, log_path in [
         # Initialize input documents
         docs = DocCollection(
             docs_path=path_to_docs, dbms=dbms, size_threshold=max_length,
-            use_implicit=use_implicit, filter_params=filter_params)
+            use_implicit=use_implicit, filter_params=filter_params,
+            batch_size=min_batch_size)
         
         hint_rows = []
         for param, doc_hints in docs.param_to_hints.items():
@@ -177,7 +256,9 @@ for config_path, path_to_docs, log_path in [
             dbms=dbms, benchmark=bench, 
             hardware={'memory':memory, 'disk':disk, 'cores':cores}, 
             hints_per_episode=nr_hints, nr_evals=nr_evals, 
-            scale_perf=p_scaling, scale_asg=a_scaling, objective=objective)
+            scale_perf=p_scaling, scale_asg=a_scaling, objective=objective,
+            halving_eta=halving_eta, screen_plans=screen_plans,
+            objective_weights=objective_weights)
         unsupervised_env.reset()
         # unsupervised_env = GymEnvironment(unsupervised_env, device=device)
         
@@ -0,0 +1,135 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.sampling import mean_var
+from benchmark.sketch import merge_sketches
+from dbms.catalog import fingerprint
+import json
+import math
+import os
+import platform
+import time
+
+
+def hardware_id():
+    """ Returns hash describing the hardware of the current machine. """
+    try:
+        memory = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        memory = None
+    return fingerprint(
+        platform.node(), platform.machine(),
+        platform.processor(), os.cpu_count(), memory)
+
+
+class EvaluationCache():
+    """ Persistent cache of benchmark results, avoids re-running benchmarks.
+
+    Results are stored per evaluation context (describing DBMS version,
+    hardware, and workload) and configuration (in canonical form). Each
+    entry keeps multiple measurements to estimate variance.
+    """
+
+    def __init__(self, path, max_age_s=None, max_rel_std=None, max_samples=5):
+        """ Initializes cache, loads results stored in file (if any).
+
+        Args:
+            path: path to JSON file storing cached results
+            max_age_s: re-measure if most recent result is older (if not None)
+            max_rel_std: re-measure if standard deviation of metric,
+                relative to the mean, exceeds this threshold (if not None)
+            max_samples: keep at most that many measurements per entry
+        """
+        self.path = path
+        self.max_age_s = max_age_s
+        self.max_rel_std = max_rel_std
+        self.max_samples = max_samples
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as file:
+                    self.entries = json.load(file)
+                print(f'Loaded {len(self.entries)} cached results from {path}')
+            except Exception as e:
+                print(f'Exception while loading cached results: {e}')
+
+    def lookup(self, context, config, metric, min_samples=1):
+        """ Returns cached metrics or None if (re-)measurement is needed.
+
+        Args:
+            context: hash of DBMS version, hardware, and workload
+            config: configuration in canonical form
+            metric: name of performance metric (e.g., time)
+            min_samples: require that many measurements (at most the
+                number of measurements kept per entry)
+
+        Returns:
+            latest metrics with mean, variance, and number of measurements
+            for given metric, and with latency sketch merged over all
+            measurements, or None if no valid cache entry exists
+        """
+        samples = self._fresh(self.entries.get(self._key(context, config), []))
+        # Errors may be transient (e.g., lost connections), hence ignored
+        samples = [s for s in samples if not s['metrics']['error']]
+        if not samples or len(samples) < min(min_samples, self.max_samples):
+            return None
+        values = [s['metrics'][metric] for s in samples]
+        mean, variance = mean_var(values)
+        if self.max_rel_std is not None and (
+            len(values) < 2 or
+            math.sqrt(variance) > self.max_rel_std * abs(mean)):
+            return None
+        metrics = dict(samples[-1]['metrics'])
+        sketch = merge_sketches([s['metrics'] for s in samples])
+        if sketch is not None:
+            metrics['latency_sketch'] = sketch
+        metrics[metric] = mean
+        metrics['variance'] = variance
+        metrics['nr_samples'] = len(values)
+        metrics['cached'] = True
+        return metrics
+
+    def store(self, context, config, metrics):
+        """ Adds measurement to cache and writes cache to disk.
+
+        Censored measurements (of runs aborted early) and failed runs
+        (errors may be transient) are not stored.
+
+        Args:
+            context: hash of DBMS version, hardware, and workload
+            config: configuration in canonical form
+            metrics: dictionary with measured performance metrics
+        """
+        if metrics.get('censored', False) or metrics.get('error', False):
+            return
+        key = self._key(context, config)
+        samples = self._fresh(self.entries.get(key, []))
+        samples.append({'stored_s': time.time(), 'metrics': dict(metrics)})
+        self.entries[key] = samples[-self.max_samples:]
+        self._save()
+
+    def _fresh(self, samples):
+        """ Returns samples that are not outdated. """
+        if self.max_age_s is None:
+            return list(samples)
+        min_s = time.time() - self.max_age_s
+        return [s for s in samples if s['stored_s'] >= min_s]
+
+    def _key(self, context, config):
+        """ Returns key for given context and (canonical) configuration. """
+        return json.dumps([context, config], sort_keys=True)
+
+    def _save(self):
+        """ Writes all cache entries to disk. """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as file:
+                json.dump(self.entries, file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f'Exception while storing cached results: {e}')
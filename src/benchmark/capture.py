@@ -0,0 +1,217 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import random
+import re
+
+# Placeholders for constants in normalized statements (e.g., "$1")
+placeholder_pattern = re.compile(r'\$([0-9]+)')
+# Comparisons between columns and placeholders (e.g., "t.a < $1")
+column_first_pattern = re.compile(
+    r'([A-Za-z_]\w*)\s*(?:=|<>|!=|<=|>=|<|>|\s(?:not\s+)?i?like\s)\s*\$([0-9]+)',
+    re.IGNORECASE)
+placeholder_first_pattern = re.compile(
+    r'\$([0-9]+)\s*(?:=|<>|!=|<=|>=|<|>)\s*(?:[A-Za-z_]\w*\.)?([A-Za-z_]\w*)',
+    re.IGNORECASE)
+# Ranges and lists of placeholders (e.g., "a between $1 and $2")
+between_pattern = re.compile(
+    r'([A-Za-z_]\w*)\s+between\s+\$([0-9]+)\s+and\s+\$([0-9]+)', re.IGNORECASE)
+in_pattern = re.compile(
+    r'([A-Za-z_]\w*)\s+in\s*\(((?:\s*\$[0-9]+\s*,?)+)\)', re.IGNORECASE)
+# Row limits and offsets (e.g., "limit $1")
+limit_pattern = re.compile(r'\b(limit|offset)\s+\$([0-9]+)', re.IGNORECASE)
+# Typed placeholders (e.g., "date $1", "$1::int", "cast($1 as date)")
+type_first_pattern = re.compile(
+    r'\b(date|time|timestamp|interval)\s+\$([0-9]+)', re.IGNORECASE)
+cast_pattern = re.compile(
+    r'\$([0-9]+)\s*::\s*([A-Za-z_]\w*)', re.IGNORECASE)
+cast_call_pattern = re.compile(
+    r'\bcast\s*\(\s*\$([0-9]+)\s+as\s+([A-Za-z_]\w*)', re.IGNORECASE)
+# Tables in FROM clauses (without sub-queries) and join operands
+from_pattern = re.compile(
+    r'\bfrom\s+([^()]*?)(?=\bwhere\b|\bgroup\s+by\b|\border\s+by\b|'
+    r'\bhaving\b|\blimit\b|\bunion\b|\(|\)|;|$)', 
+    re.IGNORECASE | re.DOTALL)
+table_pattern = re.compile(r'^\s*([A-Za-z_][\w.]*)')
+# Values for row limits and offsets
+limit_values = {'limit':[1, 10, 100], 'offset':[0, 10]}
+# Values for typed placeholders not compared to columns (by type prefix)
+type_values = [
+    ('timestamp', '2000-01-01 00:00:00'), ('time', '12:00:00'),
+    ('date', '2000-01-01'), ('interval', '3'), ('int', '1'), 
+    ('smallint', '1'), ('bigint', '1'), ('numeric', '1'), ('decimal', '1'),
+    ('float', '1'), ('real', '1'), ('double', '1'), ('bool', 'true'),
+    ('text', 'a'), ('varchar', 'a'), ('char', 'a')]
+
+
+def capture_workload(dbms, nr_statements=20, seed=0):
+    """ Captures weighted workload from statement statistics of the server.
+
+    The workload contains the read-only statements with highest total
+    execution time. Placeholders for constants are bound to values taken
+    from column statistics (statements with placeholders that cannot be
+    bound are skipped, their total execution time is reported). Each
+    statement is weighted by its number of calls,
+    weights are scaled to an average of one. Hence, the weighted run time
+    of the workload is proportional to the time the server spends on
+    those statements.
+
+    Args:
+        dbms: read statement statistics from this DBMS
+        nr_statements: capture at most that many statements
+        seed: seed for selecting parameter values
+
+    Returns:
+        list of dictionaries with query text, weight, number of calls, and
+            total execution time (in milliseconds) of each statement
+    """
+    rng = random.Random(seed)
+    col_to_vals = {}
+    statements = []
+    skipped_ms = 0
+    for text, calls, total_ms in dbms.top_statements(nr_statements):
+        query = bind_parameters(text, dbms, rng, col_to_vals)
+        if query is None:
+            print(f'Cannot bind parameters, skipping statement: {text}')
+            skipped_ms += total_ms
+        else:
+            statements.append(
+                {'query': query, 'calls': calls, 'total_ms': total_ms})
+    total_calls = sum(s['calls'] for s in statements)
+    for statement in statements:
+        statement['weight'] = \
+            statement['calls'] * len(statements) / max(total_calls, 1)
+    captured_ms = sum(s['total_ms'] for s in statements)
+    print(f'Captured {len(statements)} statements ({captured_ms} ms)')
+    if skipped_ms:
+        print(f'Skipped statements account for {skipped_ms} ms')
+    return statements
+
+
+def bind_parameters(text, dbms, rng, col_to_vals=None):
+    """ Replaces placeholders in statement text by constants.
+
+    Placeholders compared to columns are bound to random values among
+    the most frequent values or histogram bounds of that column (see
+    column_values of DBMS), restricted to the tables in FROM clauses.
+    Bounds of ranges are sorted. Row limits and offsets are bound to
+    small integers. Other placeholders with known type (e.g., "date $1"
+    or "$1::int") are bound to a fixed value of that type.
+
+    Args:
+        text: statement text with placeholders (e.g., "$1")
+        dbms: DBMS providing column statistics
+        rng: random number generator for selecting values
+        col_to_vals: caches column values across statements
+
+    Returns:
+        statement with bound parameters or None if binding fails
+    """
+    if col_to_vals is None:
+        col_to_vals = {}
+    tables = statement_tables(text)
+    nr_to_limit = {nr:kind.lower() for kind, nr in limit_pattern.findall(text)}
+    nr_to_type = {nr:t.lower() for t, nr in type_first_pattern.findall(text)}
+    for pattern in [cast_pattern, cast_call_pattern]:
+        for nr, type_name in pattern.findall(text):
+            nr_to_type.setdefault(nr, type_name.lower())
+    nr_to_col = {}
+    for column, nr in column_first_pattern.findall(text):
+        nr_to_col[nr] = column
+    for nr, column in placeholder_first_pattern.findall(text):
+        nr_to_col.setdefault(nr, column)
+    ranges = []
+    for column, low_nr, high_nr in between_pattern.findall(text):
+        nr_to_col[low_nr] = nr_to_col[high_nr] = column
+        ranges.append((low_nr, high_nr))
+    for column, nr_list in in_pattern.findall(text):
+        for nr in placeholder_pattern.findall(nr_list):
+            nr_to_col[nr] = column
+
+    nr_to_val = {}
+    nr_to_sql = {}
+    for nr in set(placeholder_pattern.findall(text)):
+        if nr in nr_to_limit:
+            nr_to_sql[nr] = str(rng.choice(limit_values[nr_to_limit[nr]]))
+            continue
+        values = []
+        column = nr_to_col.get(nr)
+        if column is not None:
+            key = (column, tables)
+            if key not in col_to_vals:
+                col_to_vals[key] = dbms.column_values(column, tables or None)
+            values = col_to_vals[key]
+        if values:
+            nr_to_val[nr] = rng.choice(values)
+        elif _type_value(nr_to_type.get(nr)) is not None:
+            nr_to_val[nr] = _type_value(nr_to_type[nr])
+        else:
+            return None
+    for low_nr, high_nr in ranges:
+        low, high = sorted(
+            [nr_to_val[low_nr], nr_to_val[high_nr]], key=_sort_key)
+        nr_to_val[low_nr], nr_to_val[high_nr] = low, high
+    for nr, value in nr_to_val.items():
+        nr_to_sql[nr] = _literal(value)
+    return placeholder_pattern.sub(lambda m:nr_to_sql[m.group(1)], text)
+
+
+def statement_tables(text):
+    """ Returns names of tables in FROM clauses of statement.
+    
+    Args:
+        text: SQL statement (table names may be qualified by schema)
+    
+    Returns:
+        sorted tuple of table names (lower case, without schema)
+    """
+    tables = set()
+    for from_clause in from_pattern.findall(text):
+        for operand in re.split(r',|\bjoin\b', from_clause, flags=re.I):
+            match = table_pattern.match(operand)
+            if match:
+                tables.add(match.group(1).split('.')[-1].lower())
+    return tuple(sorted(tables))
+
+
+def write_workload(path, statements):
+    """ Writes weighted statements into query file (see OLAP benchmark).
+
+    Args:
+        path: path to query file
+        statements: captured statements (see capture_workload)
+    """
+    parts = []
+    for statement in statements:
+        parts.append(
+            f"-- calls: {statement['calls']}, " \
+            f"total ms: {statement['total_ms']}\n" \
+            f"-- weight: {statement['weight']}\n" \
+            f"{statement['query'].strip().rstrip(';')}")
+    with open(path, 'w') as file:
+        file.write(';\n\n'.join(parts))
+
+
+def _literal(value):
+    """ Returns SQL string literal representing value. """
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _type_value(type_name):
+    """ Returns value for placeholder of given type (None if unknown). """
+    if type_name is not None:
+        for prefix, value in type_values:
+            if type_name.startswith(prefix):
+                return value
+    return None
+
+
+def _sort_key(value):
+    """ Sorts numbers by value, other values as strings (after numbers). """
+    try:
+        return (0, float(value), '')
+    except ValueError:
+        return (1, 0, str(value))
@@ -0,0 +1,297 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.evaluate import OLAP, weight_pattern
+from dbms.catalog import fingerprint
+import math
+import numpy as np
+
+# Maximal number of k-means iterations per clustering
+max_iterations = 50
+# Quantile of standard normal distribution for 95% error bounds
+z_95 = 1.96
+
+
+def plan_matrix(features, query_ms):
+    """ Returns standardized feature vectors describing queries.
+
+    Features are the logarithms of run time, estimated cost, and
+    estimated rows, as well as the fraction of plan nodes per node type.
+    Node type fractions are scaled to have the same total weight as one
+    of the other features. Queries without plan features are described
+    by their run time alone.
+
+    Args:
+        features: plan features of each query (see plan_features of DBMS)
+        query_ms: run time of each query with default configuration
+
+    Returns:
+        numpy array with one row per query
+    """
+    if None in features:
+        features = [{'nodes':{}, 'rows':0, 'cost':0}] * len(query_ms)
+    node_types = sorted({t for f in features for t in f['nodes']})
+    rows = []
+    for f, q_ms in zip(features, query_ms):
+        nr_nodes = max(sum(f['nodes'].values()), 1)
+        rows.append(
+            [math.log1p(q_ms), math.log1p(f['cost']), math.log1p(f['rows'])] +
+            [f['nodes'].get(t, 0) / nr_nodes for t in node_types])
+    matrix = np.array(rows, dtype=float)
+    std = matrix.std(axis=0)
+    std[std == 0] = 1
+    matrix = (matrix - matrix.mean(axis=0)) / std
+    if node_types:
+        matrix[:, 3:] /= math.sqrt(len(node_types))
+    return matrix
+
+
+def cluster(matrix, nr_clusters, seed=0):
+    """ Clusters rows of matrix via k-means (with k-means++ seeding).
+
+    Args:
+        matrix: numpy array with one row per item
+        nr_clusters: number of clusters (at most number of items)
+        seed: seed for selecting initial centers
+
+    Returns:
+        list of clusters, each one a list of row indices
+    """
+    rng = np.random.default_rng(seed)
+    nr_items = matrix.shape[0]
+    nr_clusters = min(nr_clusters, nr_items)
+    centers = [matrix[rng.integers(nr_items)]]
+    while len(centers) < nr_clusters:
+        dists = np.min([((matrix - c) ** 2).sum(axis=1) for c in centers], axis=0)
+        if dists.sum() <= 0:
+            break
+        centers.append(matrix[rng.choice(nr_items, p=dists / dists.sum())])
+    centers = np.array(centers)
+    assignment = None
+    for _ in range(max_iterations):
+        dists = ((matrix[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_assignment = dists.argmin(axis=1)
+        if assignment is not None and (new_assignment == assignment).all():
+            break
+        assignment = new_assignment
+        for c in range(len(centers)):
+            if (assignment == c).any():
+                centers[c] = matrix[assignment == c].mean(axis=0)
+    clusters = [list(np.flatnonzero(assignment == c)) for c in range(len(centers))]
+    return [[int(i) for i in c] for c in clusters if c]
+
+
+def error_bound(clusters, contributions):
+    """ Returns relative 95% error bound for estimating total time.
+
+    Each cluster is treated as a stratum from which its representative is
+    a random sample (stratified sampling with one sample per stratum). The
+    bound grows with the variance of per-query time contributions within
+    clusters. It assumes that query times vary across configurations as
+    much as they vary between queries of the same cluster.
+
+    Args:
+        clusters: list of clusters (lists of query indices)
+        contributions: weighted run time of each query
+
+    Returns:
+        half-width of confidence interval, relative to total time
+    """
+    total = sum(contributions)
+    if total <= 0:
+        return 0.0
+    variance = 0.0
+    for members in clusters:
+        values = np.array([contributions[i] for i in members])
+        variance += len(members) ** 2 * values.var()
+    return z_95 * math.sqrt(variance) / total
+
+
+def compress(query_ms, weights, features, max_error=0.05, seed=0):
+    """ Selects weighted subset of queries that represents workload.
+
+    Queries are clustered by plan features and run time with default
+    configuration (see plan_matrix). Uses the smallest number of clusters
+    (determined via doubling and bisection) whose error bound (see
+    error_bound) is below the threshold. The representative of each
+    cluster is the query closest to the cluster center. It is weighted
+    such that weighted time of representatives equals weighted time of
+    the entire workload with default configuration.
+
+    Args:
+        query_ms: run time of each query with default configuration
+        weights: weight of each query in workload
+        features: plan features of each query
+        max_error: maximal error bound of compressed workload
+        seed: seed for clustering
+
+    Returns:
+        tuple: list of representatives (query index, weight, and indices
+            of represented queries) and error bound
+    """
+    nr_queries = len(query_ms)
+    matrix = plan_matrix(features, query_ms)
+    contributions = [w * q_ms for w, q_ms in zip(weights, query_ms)]
+
+    def clusters_bound(nr_clusters):
+        """ Returns clusters and their error bound. """
+        clusters = cluster(matrix, nr_clusters, seed)
+        return clusters, error_bound(clusters, contributions)
+
+    upper = 1
+    clusters, bound = clusters_bound(upper)
+    while bound > max_error and upper < nr_queries:
+        upper = min(2 * upper, nr_queries)
+        clusters, bound = clusters_bound(upper)
+    lower = upper // 2 + 1
+    while lower < upper:
+        middle = (lower + upper) // 2
+        mid_clusters, mid_bound = clusters_bound(middle)
+        if mid_bound <= max_error:
+            upper, clusters, bound = middle, mid_clusters, mid_bound
+        else:
+            lower = middle + 1
+
+    representatives = []
+    for members in clusters:
+        center = matrix[members].mean(axis=0)
+        dists = ((matrix[members] - center) ** 2).sum(axis=1)
+        rep_id = members[int(dists.argmin())]
+        cluster_ms = sum(contributions[i] for i in members)
+        if query_ms[rep_id] > 0:
+            weight = cluster_ms / query_ms[rep_id]
+        else:
+            weight = sum(weights[i] for i in members)
+        representatives.append((rep_id, weight, sorted(members)))
+    representatives.sort()
+    return representatives, bound
+
+
+def write_compressed(path, queries, representatives, bound):
+    """ Writes representative queries with weights into query file.
+
+    Args:
+        path: path to query file (see OLAP benchmark)
+        queries: all workload queries
+        representatives: representatives with weights (see compress)
+        bound: error bound of compressed workload
+    """
+    parts = []
+    for query_id, weight, members in representatives:
+        query = weight_pattern.sub('', queries[query_id]).strip()
+        parts.append(
+            f'-- represents queries {", ".join(str(m) for m in members)} ' \
+            f'(error bound: {bound:.4f})\n-- weight: {weight}\n{query}')
+    with open(path, 'w') as file:
+        file.write(';\n\n'.join(parts))
+
+
+class CompressedOLAP(OLAP):
+    """ Runs representative queries of OLAP workload, validates periodically.
+
+    The first evaluation runs the entire workload (with the default
+    configuration) and selects representative queries, based on query
+    plans and run times. Subsequent evaluations run representatives only.
+    Each new best configuration is validated on the entire workload if
+    the last validation happened sufficiently many evaluations ago.
+    """
+
+    def __init__(self, dbms, query_path, max_error=0.05,
+                 validate_every=10, race_factor=None):
+        """ Initialize with database, queries, and compression settings.
+
+        Args:
+            dbms: interface for configurable DBMS
+            query_path: path to file containing queries
+            max_error: maximal error bound of compressed workload
+            validate_every: validate new best configurations on entire
+                workload after at least that many evaluations
+            race_factor: abort runs slower than best run by this factor
+        """
+        super().__init__(dbms, query_path, race_factor)
+        self.all_queries = self.queries
+        self.all_weights = self.weights
+        self.max_error = max_error
+        self.validate_every = validate_every
+        self.representatives = None
+        self.last_validation = 0
+
+    def workload_id(self):
+        """ Returns hash of queries and their weights. """
+        return fingerprint(self.queries, self.weights)
+
+    def _cached_metrics(self):
+        """ Returns cached metrics, always measures before compression. """
+        if self.representatives is None:
+            return None
+        return super()._cached_metrics()
+
+    def _compress(self, query_ms):
+        """ Selects representatives based on query run times.
+
+        Args:
+            query_ms: run time of each workload query
+
+        Returns:
+            dictionary describing compressed workload
+        """
+        features = [self.dbms.plan_features(q) for q in self.all_queries]
+        self.representatives, bound = compress(
+            query_ms, self.all_weights, features, self.max_error)
+        self.queries = [self.all_queries[r] for r, _, _ in self.representatives]
+        self.weights = [w for _, w, _ in self.representatives]
+        self.last_validation = self.eval_ctr
+        print(f'Compressed {len(self.all_queries)} queries into ' \
+              f'{len(self.queries)} (error bound: {bound})')
+        if self.log_path:
+            write_compressed(
+                self.log_path + '_workload', self.all_queries,
+                self.representatives, bound)
+        return {'query_ids': [r for r, _, _ in self.representatives],
+                'weights': self.weights, 'error_bound': bound}
+
+    def _measure(self):
+        """ Measures performance, compresses workload or validates results.
+
+        Returns:
+            metrics with description of compressed workload (after first
+            measurement) or validation results (if validating)
+        """
+        metrics = super()._measure()
+        if metrics['error'] or metrics['censored']:
+            return metrics
+        if self.representatives is None:
+            metrics = dict(metrics)
+            metrics['compression'] = self._compress(metrics['query_ms'])
+        elif metrics['time'] < self.min_time and \
+            self.eval_ctr - self.last_validation >= self.validate_every:
+            metrics = dict(metrics)
+            metrics['validation'] = self._validate(metrics['time'])
+        return metrics
+
+    def _validate(self, estimate_ms):
+        """ Runs entire workload and compares to estimate by representatives.
+
+        Args:
+            estimate_ms: weighted time of representatives
+
+        Returns:
+            dictionary with time of entire workload and relative error
+        """
+        compressed = self.queries, self.weights
+        self.queries, self.weights = self.all_queries, self.all_weights
+        try:
+            error, _, total_ms, _ = self._run_workload(float('inf'))
+        finally:
+            self.queries, self.weights = compressed
+        self.last_validation = self.eval_ctr
+        if error:
+            return {'error': True}
+        rel_error = abs(estimate_ms - total_ms) / max(total_ms, 1e-6)
+        print(f'Validation: {total_ms} ms for all queries, ' \
+              f'{estimate_ms} ms estimated (error: {rel_error})')
+        if rel_error > self.max_error:
+            print(f'Warning: error exceeds bound of {self.max_error}')
+        return {'error': False, 'time': total_ms, 'rel_error': rel_error}
@@ -5,27 +5,135 @@ Created on Apr 2, 2021
 '''
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import csv
 import glob
+import json
 import math
 import os
 import pandas as pd
 import psycopg2
+import random
+import re
+import signal
 import subprocess
 import time
+from benchmark.cache import hardware_id
+from benchmark.reset import DBReset
+from benchmark.sampling import AdaptiveSampler, mean_var
+from benchmark.sketch import merge_sketches, metric_percentiles, QuantileSketch
+from dbms.catalog import fingerprint
 from dbms.generic_dbms import ConfigurableDBMS
+from dbms.simulated import SimulatedDBMS
+
+# Periodic throughput output of OLTP benchmark (with interval monitoring)
+oltp_throughput_pattern = re.compile(
+    r'Throughput:\s*([0-9]+(?:\.[0-9]+)?)', re.IGNORECASE)
+# Comment lines assigning weights to workload queries (e.g., "-- weight: 2.5")
+weight_pattern = re.compile(
+    r'^\s*--\s*weight:\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*$', 
+    re.MULTILINE)
+
+
+def read_queries(path):
+    """ Reads SQL queries, separated by semicolons, from file.
+    
+    Args:
+        path: path to file containing SQL queries
+    
+    Returns:
+        list of queries (without trailing semicolon)
+    """
+    with open(path) as file:
+        return split_queries(file.read())
+
+def query_weights(queries):
+    """ Returns weights of queries, given by comments in query text.
+    
+    A query is weighted by adding a comment line of the form 
+    "-- weight: 2.5" before the query. Queries without such comment
+    have weight one.
+    
+    Args:
+        queries: list of SQL queries (see read_queries)
+    
+    Returns:
+        list of weights (one per query)
+    """
+    weights = []
+    for query in queries:
+        match = weight_pattern.search(query)
+        weights.append(float(match.group(1)) if match else 1.0)
+    return weights
+
+def split_queries(sql):
+    """ Splits SQL text into queries, separated by semicolons.
+    
+    Semicolons within string literals, quoted identifiers, and comments
+    do not separate queries.
+    
+    Args:
+        sql: text containing SQL queries
+    
+    Returns:
+        list of queries (without trailing semicolon)
+    """
+    queries = []
+    start = 0
+    quote = None
+    pos = 0
+    while pos < len(sql):
+        char = sql[pos]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ['\'', '"']:
+            quote = char
+        elif sql.startswith('--', pos):
+            end = sql.find('\n', pos)
+            pos = len(sql) if end < 0 else end
+        elif char == ';':
+            queries.append(sql[start:pos])
+            start = pos + 1
+        pos += 1
+    queries.append(sql[start:])
+    return [q.strip() for q in queries if q.strip()]
 
 class Benchmark(ABC):
     """ Runs a benchmark to evaluate database configuration. """
     
+    # Name of performance metric (key in dictionary returned by evaluate)
+    metric = None
+    # Number of runs combined to estimate latency percentiles
+    latency_runs = 1
+    
     def __init__(self):
-        """ Initializes logging. """
+        """ Initializes logging, result cache, repetition policy, and telemetry. """
         self.log = []
+        self.cache = None
+        self.dbms_version = None
+        self.sampler = None
+        self.telemetry = None
+        # Measure each configuration at least that many times
+        self.min_samples = 1
     
     @abstractmethod
     def evaluate(self):
         """ Evaluates performance for benchmark and returns reward. """
         raise NotImplementedError()
     
+    def track_latency(self):
+        """ Measures configurations often enough for latency percentiles. """
+        self.min_samples = max(self.min_samples, self.latency_runs)
+    
+    def has_cached_result(self):
+        """ Returns True iff results for current DBMS configuration are cached. """
+        return self._cached_metrics() is not None
+    
+    def workload_id(self):
+        """ Returns hash identifying the workload (None disables caching). """
+        return None
+    
     @abstractmethod
     def print_stats(self):
         """ Prints out some benchmark statistics. """
@@ -41,25 +149,128 @@ class Benchmark(ABC):
         self.run_ctr = run_ctr
         self.eval_ctr = 0
         self.start_ms = time.time() * 1000.0
+        # DBMS version is queried once per run (see _cache_key)
+        self.dbms_version = None
         
         self.log_path = log_path
         self.log_perf_path = log_path + '_performance'
         self.log_conf_path = log_path + '_configure'
+        self.log_details_path = log_path + '_details'
         
         if run_ctr == 0:
             with open(self.log_perf_path, 'w') as file:
                 file.write('run\teval\tmillis\tbestQuality\tcurQuality\n')
             with open(self.log_conf_path, 'w') as file:
                 file.write('run\teval\tmillis\tbestConf\tcurConf\n')
+            with open(self.log_details_path, 'w') as file:
+                file.write('run\teval\tmillis\tdetails\n')
         
         self._init_stats()
             
+    def _cache_key(self):
+        """ Returns evaluation context and canonical DBMS configuration. """
+        if self.dbms_version is None:
+            self.dbms_version = self.dbms.version_id()
+        context = fingerprint(
+            type(self.dbms).__name__, self.dbms.db, self.dbms_version,
+            hardware_id(), self.workload_id())
+        config = self.dbms.canonical_config(self.dbms.changed())
+        return context, config
+    
+    def _cache_metrics(self, metrics):
+        """ Store metrics measured for current DBMS configuration in cache. """
+        if self.cache is not None and self.workload_id() is not None:
+            context, config = self._cache_key()
+            self.cache.store(context, config, metrics)
+    
+    def _cached_metrics(self):
+        """ Returns cached metrics for current DBMS configuration or None. """
+        if self.cache is None or self.workload_id() is None:
+            return None
+        context, config = self._cache_key()
+        return self.cache.lookup(
+            context, config, self.metric, self.min_samples)
+    
+    def _incumbent(self):
+        """ Returns performance of best configuration (None if unknown). """
+        return None
+    
     @abstractmethod
     def _init_stats(self):
         """ Initializes benchmark statistics. """
         raise NotImplementedError()
             
-    def _log(self, best_quality, best_config, cur_quality, cur_config):
+    def _measure(self):
+        """ Measures performance of current configuration.
+        
+        Resource telemetry is collected during all measurements (if a
+        telemetry sampler is set).
+        
+        Returns:
+            metrics (see _repeat_samples), with telemetry if collected
+        """
+        if self.telemetry is None:
+            return self._repeat_samples()
+        self.telemetry.start()
+        metrics = dict(self._repeat_samples())
+        metrics['telemetry'] = self.telemetry.stop()
+        return metrics
+    
+    def _repeat_samples(self):
+        """ Measures performance until results are conclusive.
+        
+        Repeats measurements at least min_samples times and until the 
+        sampler (if any) considers the results conclusive. Each measurement
+        is added to the cache.
+        
+        Returns:
+            metrics of last measurement with mean, variance, and number of
+            measurements of the performance metric
+        """
+        samples = []
+        while True:
+            sample = self._sample()
+            self._cache_metrics(sample)
+            samples.append(sample)
+            if sample['error'] or sample.get('censored', False):
+                return sample
+            values = [s[self.metric] for s in samples]
+            if len(samples) >= self.min_samples and (self.sampler is None or \
+                self.sampler.done(values, self._incumbent())):
+                break
+        if len(samples) == 1:
+            # Single measurements may come with their own statistics
+            metrics = dict(sample)
+            metrics.setdefault('variance', 0.0)
+            metrics.setdefault('nr_samples', 1)
+            return metrics
+        metrics = self._merge(samples)
+        mean, variance = mean_var(values)
+        metrics[self.metric] = mean
+        metrics['variance'] = variance
+        metrics['nr_samples'] = len(samples)
+        print(f'Mean {self.metric} over {len(samples)} runs: {mean} ' \
+              f'(variance: {variance})')
+        return metrics
+    
+    def _merge(self, samples):
+        """ Merges metrics of repeated measurements (except for main metric). 
+        
+        Latency sketches of all measurements are merged (if available).
+        """
+        metrics = dict(samples[-1])
+        sketch = merge_sketches(samples)
+        if sketch is not None:
+            metrics['latency_sketch'] = sketch
+        return metrics
+    
+    @abstractmethod
+    def _sample(self):
+        """ Measures performance once and returns dictionary of metrics. """
+        raise NotImplementedError()
+    
+    def _log(self, best_quality, best_config, cur_quality, cur_config, 
+             details=None):
         """ Write quality and timestamp to log file. 
         
         Note: this method has no effect if no log file path was specified.
@@ -69,6 +280,7 @@ class Benchmark(ABC):
             best_config: description of associated configuration (as dictionary)
             cur_quality: quality of most recently tried configuration
             cur_config: most recently tried configuration
+            details: dictionary with further statistics on current evaluation
         """
         cur_ms = time.time() * 1000.0
         total_ms = cur_ms - self.start_ms
@@ -88,47 +300,108 @@ class Benchmark(ABC):
                 file.write(
                     f'{self.run_ctr}\t{self.eval_ctr}\t{total_ms}\t' +
                     f'{best_config}\t{cur_config}\n')
+            with open(self.log_details_path, 'a') as file:
+                file.write(
+                    f'{self.run_ctr}\t{self.eval_ctr}\t{total_ms}\t' +
+                    f'{json.dumps(details or {})}\n')
     
 class OLAP(Benchmark):
     """ Runs an OLAP style benchmark with single queries stored in files. """
     
-    def __init__(self, dbms: ConfigurableDBMS, query_path):
+    metric = 'time'
+    # Percentiles over query times of single runs are dominated by few
+    # slow queries, hence query times of multiple runs are combined.
+    latency_runs = 5
+    
+    def __init__(self, dbms: ConfigurableDBMS, query_path, race_factor=None):
         """ Initialize with database and path to queries. 
         
         Args:
             dbms: interface for configurable DBMS
             query_path: path to file containing queries
+            race_factor: abort runs slower than best run by this factor
+                (racing is disabled if None)
         """
         super().__init__()
         self.dbms = dbms
         self.query_path = query_path
+        self.queries = read_queries(query_path) if query_path else []
+        self.weights = query_weights(self.queries)
+        self.race_factor = race_factor
         self.log_path = None
         self._init_stats()
     
     def evaluate(self):
         """ Run all benchmark queries. 
         
+        Time is the sum of query run times, weighted by query weights (see
+        query_weights), single query times are not weighted. If racing is
+        enabled, runs are aborted once their run time exceeds the run time
+        of the best configuration (multiplied by the racing factor). The
+        result is censored in that case: the reported time is a lower
+        bound on the time required to run all queries.
+        
+        Results are taken from the cache (if any) if available. Runs are
+        repeated as long as the sampler (if any) requests it, time is the
+        mean over all runs in that case.
+        
         Returns:
-            Dictionary containing error flag and time in milliseconds
+            Dictionary containing error and censoring flags, time in 
+            milliseconds, restart time, run times of single queries, sketch
+            of query run times, and variance and number of measurements
         """
         self.print_stats()
         self.eval_ctr += 1
-        start_ms = time.time() * 1000.0
-        error = self.dbms.exec_file(self.query_path)
-        end_ms = time.time() * 1000.0
-        millis = end_ms - start_ms
+        restart_ms = self.dbms.restart_latency()
+        metrics = self._cached_metrics()
+        if metrics is None:
+            metrics = self._measure()
+        else:
+            print(f'Using cached result ({metrics.get("nr_samples")} runs)')
+        metrics['restart_ms'] = restart_ms
+        error = metrics['error']
+        millis = metrics['time']
+        query_ms = metrics['query_ms']
         # Update statistics
         config = self.dbms.changed() if self.dbms else None
-        if not error:
+        if not error and not metrics['censored']:
             if millis < self.min_time:
                 self.min_time = millis
                 self.min_conf = config
+                self.min_query_ms = query_ms
             if millis > self.max_time:
                 self.max_time = millis
                 self.max_conf = config
         # Logging
-        self._log(self.min_time, self.min_conf, millis, config)
-        return {'error': error, 'time': millis}
+        details = {
+            'restart_ms': restart_ms, 'query_ms': query_ms, 
+            'censored': metrics['censored'], 
+            'cached': metrics.get('cached', False),
+            'variance': metrics.get('variance'),
+            'nr_samples': metrics.get('nr_samples'),
+            'telemetry': metrics.get('telemetry'),
+            'compression': metrics.get('compression'),
+            'validation': metrics.get('validation')}
+        self._log(self.min_time, self.min_conf, millis, config, details)
+        return metrics
+    
+    def evaluate_queries(self, query_ids):
+        """ Run subset of benchmark queries (low-fidelity evaluation).
+        
+        Results are neither cached nor logged and do not change statistics
+        on the best configuration (which refer to the entire workload).
+        
+        Args:
+            query_ids: indices of queries to run
+        
+        Returns:
+            Dictionary containing error flag, weighted time in milliseconds,
+            and run times of single queries (in the order of query_ids)
+        """
+        error, _, millis, query_ms = self._run_workload(
+            float('inf'), query_ids)
+        print(f'Ran {len(query_ids)} queries in {millis} ms (error: {error})')
+        return {'error': error, 'time': millis, 'query_ms': query_ms}
     
     def print_stats(self):
         """ Print out benchmark statistics. """
@@ -144,12 +417,300 @@ class OLAP(Benchmark):
         self.max_time = 0
         self.min_conf = {}
         self.max_conf = {}
+        self.min_query_ms = []
+    
+    def workload_id(self):
+        """ Returns hash of all workload queries. """
+        return fingerprint(self.queries)
+    
+    def _incumbent(self):
+        """ Returns time of best run (None if no successful run yet). """
+        return None if self.min_time == float('inf') else self.min_time
+    
+    def _merge(self, samples):
+        """ Averages run times of single queries over repeated runs. """
+        metrics = super()._merge(samples)
+        nr_samples = len(samples)
+        metrics['query_ms'] = [sum(q_ms) / nr_samples for q_ms in zip(
+            *[s['query_ms'] for s in samples])]
+        return metrics
+    
+    def _race_budget(self):
+        """ Returns time budget (in ms) for next run when racing. """
+        if self.race_factor is None:
+            return float('inf')
+        return self.race_factor * self.min_time
+    
+    def _sample(self):
+        """ Runs workload once and returns dictionary of metrics. """
+        error, censored, millis, query_ms = self._run_workload(
+            self._race_budget())
+        sketch = QuantileSketch()
+        for q_ms in query_ms:
+            sketch.add(q_ms)
+        return {
+            'error': error, 'censored': censored, 'time': millis, 
+            'query_ms': query_ms, 'latency_sketch': sketch.to_dict()}
+    
+    def _run_query(self, query_id):
+        """ Run one query and measure its execution time.
+        
+        Args:
+            query_id: index of query in workload
+        
+        Returns:
+            tuple: error flag and time in milliseconds
+        """
+        start_ms = time.time() * 1000.0
+        error = self.dbms.exec_query(self.queries[query_id])
+        end_ms = time.time() * 1000.0
+        return error, end_ms - start_ms
+    
+    def _run_workload(self, budget_ms, query_ids=None):
+        """ Run queries and measure execution time per query.
+        
+        Stops at the first query that fails (e.g., due to a timeout). The
+        per-query timeout is reduced to cancel queries once the run exceeds
+        its time budget (the run is censored in that case).
+        
+        Args:
+            budget_ms: censor run once its run time exceeds this budget
+            query_ids: indices of queries to run (all queries if None)
+        
+        Returns:
+            tuple: error and censoring flags, weighted total time and list 
+                of query times (in ms)
+        """
+        timeout_s = float(self.dbms.timeout_s)
+        query_ms = []
+        total_ms = 0
+        error = False
+        censored = False
+        limited = False
+        if query_ids is None:
+            query_ids = range(len(self.queries))
+        for query_id in query_ids:
+            weight = self.weights[query_id]
+            remaining_s = (budget_ms - total_ms) / 1000.0
+            if remaining_s <= 0:
+                censored = True
+                break
+            if weight > 0:
+                remaining_s /= weight
+            if remaining_s < timeout_s:
+                limited = True
+                self.dbms.set_timeout(max(remaining_s, 0.001))
+            query_error, millis = self._run_query(query_id)
+            query_ms.append(millis)
+            total_ms += weight * millis
+            if query_error:
+                # Queries canceled due to budget take (about) the budget
+                if limited and total_ms >= 0.9 * budget_ms:
+                    censored = True
+                else:
+                    error = True
+                    print(f'Error executing query {query_id} of {self.query_path}')
+                break
+        if limited:
+            self.dbms.set_timeout(timeout_s)
+        if censored:
+            print(f'Aborted run after {total_ms} ms ' \
+                  f'(best run: {self.min_time} ms)')
+        return error, censored, total_ms, query_ms
+
+
+class SimulatedOLAP(OLAP):
+    """ OLAP benchmark whose run times are derived from a performance model. """
+    
+    def __init__(self, dbms: SimulatedDBMS, race_factor=None):
+        """ Initialize with simulated database.
+        
+        Args:
+            dbms: simulated DBMS, modeling query run times
+            race_factor: abort runs slower than best run by this factor
+        """
+        super().__init__(dbms, None, race_factor)
+        self.queries = dbms.queries
+        self.weights = [1.0] * len(self.queries)
+    
+    def _run_query(self, query_id):
+        """ Simulate one query and return simulated execution time.
+        
+        Args:
+            query_id: index of query in simulated workload
+        
+        Returns:
+            tuple: error flag and simulated time in milliseconds
+        """
+        error, times_ms = self.dbms.simulate([query_id])
+        return error, sum(times_ms)
+    
+class OLAPStreams(Benchmark):
+    """ Runs concurrent query streams, similar to the TPC-H throughput test. 
+    
+    Each stream runs all queries (in a stream-specific order) over its own 
+    connection to the database. Performance is measured as the number of
+    queries per hour (i.e., throughput).
+    """
+    
+    metric = 'throughput'
+    
+    def __init__(self, dbms: ConfigurableDBMS, query_path, nr_streams):
+        """ Initialize with database, path to queries, and number of streams.
+        
+        Args:
+            dbms: interface for configurable DBMS (must support sessions)
+            query_path: path to file containing queries
+            nr_streams: number of concurrent query streams
+        """
+        super().__init__()
+        self.dbms = dbms
+        self.query_path = query_path
+        self.queries = read_queries(query_path)
+        self.nr_streams = nr_streams
+        self.orders = [self._stream_order(s) for s in range(nr_streams)]
+        self.log_path = None
+        self._init_stats()
+    
+    def evaluate(self):
+        """ Run all query streams concurrently.
+        
+        Results are taken from the cache (if any) if available. Runs are
+        repeated as long as the sampler (if any) requests it, throughput is
+        the mean over all runs in that case.
+        
+        Returns:
+            Dictionary containing error flag, throughput in queries per hour,
+            restart time, run time and mean query latency per stream (in 
+            milliseconds), as well as variance and number of measurements
+        """
+        self.eval_ctr += 1
+        config = self.dbms.changed()
+        restart_ms = self.dbms.restart_latency()
+        metrics = self._cached_metrics()
+        if metrics is None:
+            metrics = self._measure()
+        else:
+            print(f'Using cached result ({metrics.get("nr_samples")} runs)')
+        metrics['restart_ms'] = restart_ms
+        error = metrics['error']
+        throughput = metrics['throughput']
+        # Update statistics
+        if not error:
+            if throughput > self.max_throughput:
+                self.max_throughput = throughput
+                self.max_config = config
+            if throughput < self.min_throughput:
+                self.min_throughput = throughput
+                self.min_config = config
+        # Logging
+        self.print_stats()
+        details = {
+            'restart_ms': restart_ms, 'stream_ms': metrics['stream_ms'],
+            'latency_ms': metrics['latency_ms'],
+            'cached': metrics.get('cached', False),
+            'variance': metrics.get('variance'),
+            'nr_samples': metrics.get('nr_samples'),
+            'telemetry': metrics.get('telemetry')}
+        self._log(
+            self.max_throughput, self.max_config, 
+            throughput, config, details)
+        return metrics
+    
+    def print_stats(self):
+        """ Print out benchmark statistics. """
+        print(f'Minimal throughput {self.min_throughput} with configuration {self.min_config}')
+        print(f'Maximal throughput {self.max_throughput} with configuration {self.max_config}')
+    
+    def workload_id(self):
+        """ Returns hash of workload queries and number of streams. """
+        return fingerprint(self.queries, self.nr_streams)
+    
+    def _incumbent(self):
+        """ Returns best throughput (None if no successful run yet). """
+        return self.max_throughput if self.max_config else None
+    
+    def _init_stats(self):
+        """ Reset minimal and maximal throughput (and configurations). """
+        self.min_throughput = float('inf')
+        self.min_config = {}
+        self.max_throughput = 0
+        self.max_config = {}
+    
+    def _merge(self, samples):
+        """ Averages run times and latencies of streams over repeated runs. """
+        metrics = dict(samples[-1])
+        nr_samples = len(samples)
+        for key in ['stream_ms', 'latency_ms']:
+            metrics[key] = [sum(ms) / nr_samples for ms in zip(
+                *[s[key] for s in samples])]
+        return metrics
+    
+    def _run_stream(self, stream_id):
+        """ Runs queries of one stream over a separate connection.
+        
+        Args:
+            stream_id: run queries in the order associated with this stream
+        
+        Returns:
+            tuple: error flag and list of query times (in ms)
+        """
+        session = self.dbms.open_session()
+        if session is None:
+            return True, []
+        query_ms = []
+        error = False
+        for query_id in self.orders[stream_id]:
+            start_ms = time.time() * 1000.0
+            error = session.exec_query(self.queries[query_id])
+            query_ms.append(time.time() * 1000.0 - start_ms)
+            if error:
+                print(f'Error executing query {query_id} in stream {stream_id}')
+                break
+        session.close_session()
+        return error, query_ms
     
+    def _sample(self):
+        """ Runs all streams once and returns dictionary of metrics. """
+        start_ms = time.time() * 1000.0
+        with ThreadPoolExecutor(max_workers=self.nr_streams) as pool:
+            results = list(pool.map(self._run_stream, range(self.nr_streams)))
+        total_ms = time.time() * 1000.0 - start_ms
+        error = any(e for e, _ in results)
+        nr_queries = sum(len(q_ms) for _, q_ms in results)
+        throughput = -1 if error else nr_queries * 3600000.0 / total_ms
+        stream_ms = [sum(q_ms) for _, q_ms in results]
+        latency_ms = [sum(q_ms) / max(len(q_ms), 1) for _, q_ms in results]
+        print(f'Ran {nr_queries} queries in {total_ms} ms ' \
+              f'({self.nr_streams} streams, error: {error})')
+        return {
+            'error': error, 'throughput': throughput, 
+            'stream_ms': stream_ms, 'latency_ms': latency_ms}
+    
+    def _stream_order(self, stream_id):
+        """ Returns order of queries for given stream (fixed per stream). 
+        
+        The first stream runs queries in the order of the query file, the
+        other streams use pseudo-random permutations of that order.
+        """
+        order = list(range(len(self.queries)))
+        if stream_id > 0:
+            random.Random(stream_id).shuffle(order)
+        return order
+
+
 class TpcC(Benchmark):
     """ Runs the TPC-C benchmark. """
     
+    metric = 'throughput'
+    # Ignore throughput of that many initial monitoring intervals (warmup)
+    warmup_intervals = 1
+    # Wait for so many seconds for benchmark to terminate after stopping it
+    stop_timeout_s = 30
+    
     def __init__(self, oltp_path, config_path, result_path, 
-                 dbms, template_db, target_db, reset_every):
+                 dbms, template_db, target_db, reset_every,
+                 monitor_s=None, rel_tolerance=0.05, resetter=None):
         """ Initialize with given paths. 
         
         Args:
@@ -160,6 +721,11 @@ class TpcC(Benchmark):
             template_db: used as template to re-initialize DB
             target_db: used for running the benchmark
             reset_every: reset database every i-th evaluation
+            monitor_s: monitor throughput in intervals of that many seconds
+                and stop runs early if possible (disabled if None)
+            rel_tolerance: stop once confidence interval of throughput,
+                relative to the mean, is tighter than this tolerance
+            resetter: re-initializes database (default strategies if None)
         """
         super().__init__()
         self.oltp_path = oltp_path
@@ -169,6 +735,10 @@ class TpcC(Benchmark):
         self.template_db = template_db
         self.target_db = target_db
         self.reset_every = reset_every
+        self.monitor_s = monitor_s
+        self.monitor = AdaptiveSampler(float('inf'), rel_tolerance, 3)
+        self.resetter = resetter if resetter else DBReset.default()
+        self.last_reset = None
         self._init_stats()
         self.evals_since_reset = 0
         self.log_path = None
@@ -176,46 +746,25 @@ class TpcC(Benchmark):
     def evaluate(self):
         """ Evaluates current configuration on TPC-C benchmark.
         
+        Results are taken from the cache (if any) if available. Runs are
+        repeated as long as the sampler (if any) requests it, throughput is
+        the mean over all runs in that case.
+        
         Returns:
-            Dictionary containing error flag and throughput
+            Dictionary containing error flag and throughput, as well as
+            variance and number of measurements
          """
-        self._remove_oltp_results()
         self.eval_ctr += 1
-        self.evals_since_reset += 1
-        if self.evals_since_reset > self.reset_every:
-            self._reset_db()
-            self.evals_since_reset = 0
-        throughput = -1
-        had_error = True
         config = self.dbms.changed() if self.dbms else None
-        try:
-            # Run benchmark
-            return_code = subprocess.run(\
-                ['./oltpbenchmark', '-b', 'tpcc', '-c', self.config_path,
-                '--execute=true', '-s', '120', '-o', 'tuningtest'],
-                cwd = self.oltp_path)
-            print(f'Benchmark return code: {return_code}')
-            
-            # Extract throughput from generated files
-            df = pd.read_csv(f'{self.result_path}/tuningtest.res')
-            throughput = df[' throughput(req/sec)'].median()
-            if not math.isnan(throughput):
-                print(f'Measured valid throughput: {throughput}')
-                had_error = False
-            else:
-                print(f'Error - throughput is NaN!')
-                
-            # Check for MySQL specific read-only flags (if activated, 
-            # OLTP benchmark reports large throughput due to exceptions).
-            ms_ro_flags = ['read_only', 'super_read_only', 
-                           'transaction_read_only', 'innodb_read_only']
-            true_ro_flags = [f for f in ms_ro_flags 
-                             if f in config and str(config[f]) == '1']
-            if true_ro_flags:
-                print('MS Read-only flags set - do not count throughput')
-                had_error = True
-        except (Exception, psycopg2.DatabaseError) as e:
-            print(f'Exception for TPC-C: {e}')
+        restart_ms = self.dbms.restart_latency() if self.dbms else 0.0
+        metrics = self._cached_metrics()
+        if metrics is None:
+            metrics = self._measure()
+        else:
+            print(f'Using cached result ({metrics.get("nr_samples")} runs)')
+        metrics['restart_ms'] = restart_ms
+        had_error = metrics['error']
+        throughput = metrics['throughput']
         # Update statistics
         if not had_error:
             if throughput > self.max_throughput:
@@ -226,8 +775,18 @@ class TpcC(Benchmark):
                 self.min_config = config
         # Logging
         self.print_stats()
-        self._log(self.max_throughput, self.max_config, throughput, config)
-        return {'error': had_error, 'throughput': throughput}
+        details = {
+            'restart_ms': restart_ms, 'cached': metrics.get('cached', False),
+            'stopped_early': metrics.get('stopped_early', False),
+            'reset': metrics.get('reset'),
+            'latency_ms': metric_percentiles(metrics),
+            'variance': metrics.get('variance'),
+            'nr_samples': metrics.get('nr_samples'),
+            'telemetry': metrics.get('telemetry')}
+        self._log(
+            self.max_throughput, self.max_config, 
+            throughput, config, details)
+        return metrics
     
     def print_stats(self):
         """ Print out benchmark statistics. """
@@ -238,13 +797,184 @@ class TpcC(Benchmark):
         """ Reset database along with logging and statistics. """
         self._reset_db()
         super().reset(log_path, run_ctr)
+    
+    def workload_id(self):
+        """ Returns hash of benchmark configuration file. """
+        try:
+            with open(self.config_path) as file:
+                return fingerprint('tpcc', file.read())
+        except OSError:
+            return None
         
+    def _incumbent(self):
+        """ Returns best throughput (None if no successful run yet). """
+        return self.max_throughput if self.max_config else None
+    
     def _init_stats(self):
         """ Reset minimal and maximal throughput (and configurations). """
         self.min_throughput = float('inf')
         self.min_config = {}
         self.max_throughput = 0
         self.max_config = {}
+    
+    def _sample(self):
+        """ Runs benchmark once and returns dictionary of metrics. """
+        config = self.dbms.changed() if self.dbms else None
+        return self._run_benchmark(config)
+    
+    def _oltp_cmd(self):
+        """ Returns command line for running OLTP benchmark. """
+        cmd = ['./oltpbenchmark', '-b', 'tpcc', '-c', self.config_path,
+               '--execute=true', '-s', '120', '-o', 'tuningtest']
+        if self.monitor_s is not None:
+            cmd += ['-im', str(int(self.monitor_s * 1000))]
+        return cmd
+    
+    def _read_latencies(self):
+        """ Returns sketch of transaction latencies (in ms) or None.
+        
+        Latencies are read from the raw results file of the OLTP benchmark
+        (one line per transaction, latency in microseconds). The file is
+        processed line by line, only the sketch is kept in memory.
+        """
+        try:
+            with open(f'{self.result_path}/tuningtest.raw') as file:
+                reader = csv.reader(file)
+                header = [h.lower() for h in next(reader)]
+                column = next(i for i, h in enumerate(header) if 'latency' in h)
+                sketch = QuantileSketch()
+                for row in reader:
+                    if len(row) > column:
+                        sketch.add(float(row[column]) / 1000.0)
+            return sketch if sketch.count else None
+        except (OSError, StopIteration, ValueError) as e:
+            print(f'Cannot read transaction latencies: {e}')
+            return None
+    
+    def _read_throughput(self):
+        """ Returns median throughput from result file of OLTP benchmark. """
+        df = pd.read_csv(f'{self.result_path}/tuningtest.res')
+        return df[' throughput(req/sec)'].median()
+    
+    def _run_benchmark(self, config):
+        """ Runs TPC-C benchmark and extracts throughput.
+        
+        If throughput is monitored, the reported throughput is the mean over
+        monitoring intervals (and the run may stop early). Otherwise, it is
+        the median over the results file.
+        
+        Args:
+            config: current DBMS configuration
+        
+        Returns:
+            dictionary with error flag, throughput, and sketch of transaction
+            latencies (as well as variance and number of throughput samples
+            if throughput is monitored)
+        """
+        self._remove_oltp_results()
+        self.evals_since_reset += 1
+        metrics = {'error': True, 'throughput': -1}
+        if self.evals_since_reset > self.reset_every:
+            self._reset_db()
+            self.evals_since_reset = 0
+            metrics['reset'] = self.last_reset
+        try:
+            # Run benchmark
+            if self.monitor_s is None:
+                return_code = subprocess.run(
+                    self._oltp_cmd(), cwd = self.oltp_path)
+                print(f'Benchmark return code: {return_code}')
+                streamed = {}
+            else:
+                streamed = self._run_monitored()
+            
+            # Extract throughput from generated files if not monitored
+            if streamed:
+                metrics.update(streamed)
+            else:
+                metrics['throughput'] = self._read_throughput()
+            sketch = self._read_latencies()
+            if sketch is not None:
+                metrics['latency_sketch'] = sketch.to_dict()
+            throughput = metrics['throughput']
+            if not math.isnan(throughput):
+                print(f'Measured valid throughput: {throughput}')
+                metrics['error'] = False
+            else:
+                print(f'Error - throughput is NaN!')
+                
+            # Check for MySQL specific read-only flags (if activated, 
+            # OLTP benchmark reports large throughput due to exceptions).
+            ms_ro_flags = ['read_only', 'super_read_only', 
+                           'transaction_read_only', 'innodb_read_only']
+            true_ro_flags = [f for f in ms_ro_flags 
+                             if str((config or {}).get(f)) == '1']
+            if true_ro_flags:
+                print('MS Read-only flags set - do not count throughput')
+                metrics['error'] = True
+        except (Exception, psycopg2.DatabaseError) as e:
+            print(f'Exception for TPC-C: {e}')
+        return metrics
+    
+    def _run_monitored(self):
+        """ Runs benchmark while monitoring throughput, stops early if possible.
+        
+        The run stops once the confidence interval of throughput (over the
+        monitoring intervals) is tight enough or once it clearly separates
+        current throughput from the best throughput seen so far.
+        
+        Returns:
+            dictionary with mean throughput, variance, number of intervals,
+            and early stopping flag (empty if no throughput was reported)
+        """
+        # New session to stop processes started by the benchmark script
+        process = subprocess.Popen(
+            self._oltp_cmd(), cwd=self.oltp_path, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, start_new_session=True)
+        values = []
+        nr_intervals = 0
+        stopped_early = False
+        for line in process.stdout:
+            match = oltp_throughput_pattern.search(line)
+            if match:
+                nr_intervals += 1
+                if nr_intervals > self.warmup_intervals:
+                    values.append(float(match.group(1)))
+                if self.monitor.done(values, self._incumbent()):
+                    stopped_early = True
+                    break
+        if stopped_early:
+            print(f'Stopping benchmark after {nr_intervals} intervals')
+            self._stop_group(process)
+        else:
+            try:
+                process.wait(self.stop_timeout_s)
+            except subprocess.TimeoutExpired:
+                self._stop_group(process)
+        process.stdout.close()
+        print(f'Benchmark return code: {process.returncode}')
+        if not values:
+            return {}
+        throughput, variance = mean_var(values)
+        return {
+            'throughput': throughput, 'variance': variance,
+            'nr_samples': len(values), 'stopped_early': stopped_early}
+        
+    def _stop_group(self, process):
+        """ Terminates process and all processes it started (same group).
+        
+        Processes that are still running after the stop timeout are killed.
+        
+        Args:
+            process: process started in a new session (leads its group)
+        """
+        _signal_group(process.pid, signal.SIGTERM)
+        deadline_s = time.time() + self.stop_timeout_s
+        while _signal_group(process.pid, 0) and time.time() < deadline_s:
+            process.poll()
+            time.sleep(0.1)
+        _signal_group(process.pid, signal.SIGKILL)
+        process.wait()
         
     def _remove_oltp_results(self):
         """ Removes old result files from OLTP benchmark. """
@@ -257,4 +987,15 @@ class TpcC(Benchmark):
 
     def _reset_db(self):
         """ Reload TPC-C database from template database. """
-        self.dbms.copy_db(self.template_db, self.target_db)
\ No newline at end of file
+        strategy, reset_ms = self.resetter.reset(
+            self.dbms, self.template_db, self.target_db)
+        self.last_reset = {'strategy': strategy, 'ms': reset_ms}
+
+
+def _signal_group(group_id, signal_nr):
+    """ Sends signal to process group, returns False if group is gone. """
+    try:
+        os.killpg(group_id, signal_nr)
+        return True
+    except ProcessLookupError:
+        return False
@@ -3,10 +3,97 @@ Created on May 12, 2021
 
 @author: immanueltrummer
 '''
+from benchmark.cache import EvaluationCache
+from benchmark.compress import CompressedOLAP
+from benchmark.reset import DBReset
+from benchmark.resources import ResourceSampler
+from benchmark.sampling import AdaptiveSampler
+from dbms.simulated import SimulatedDBMS
 import benchmark.evaluate
+import benchmark.oltp
 import search.objectives
 
 
+def add_arguments(parser):
+    """ Adds command line arguments describing the benchmark to parser.
+    
+    Args:
+        parser: argument parser of tuning script (see from_args)
+    """
+    parser.add_argument(
+        '--oltp_script', type=str, default=None,
+        help='Tune for transactions in script (or "read_update" for built-in mix)')
+    parser.add_argument(
+        '--nr_warehouses', type=int, default=1,
+        help='Number of warehouses for built-in read/update mix')
+    parser.add_argument(
+        '--nr_clients', type=int, default=8,
+        help='Number of concurrent clients running transactions')
+    parser.add_argument(
+        '--warmup_s', type=float, default=10,
+        help='Run transactions for that many seconds before measuring')
+    parser.add_argument(
+        '--measure_s', type=float, default=60,
+        help='Measure transaction throughput for that many seconds')
+    parser.add_argument(
+        '--nr_streams', type=int, default=1,
+        help='Maximize throughput of that many concurrent query streams')
+    parser.add_argument(
+        '--objective', type=str, default=None, 
+        choices={'time', 'throughput', 'p95_latency', 'p99_latency'},
+        help='Optimization goal (derived from workload if not specified)')
+    parser.add_argument(
+        '--race_factor', type=float, default=None,
+        help='Abort workload runs slower than best run by this factor')
+    parser.add_argument(
+        '--compress_error', type=float, default=None,
+        help='Run representative queries with this maximal error bound')
+    parser.add_argument(
+        '--validate_every', type=int, default=10,
+        help='Validate best configurations on all queries in these intervals')
+    parser.add_argument(
+        '--eval_cache', type=str, default=None,
+        help='Path to file caching benchmark results across runs')
+    parser.add_argument(
+        '--cache_max_age_s', type=float, default=None,
+        help='Re-measure cached results older than this (in seconds)')
+    parser.add_argument(
+        '--cache_max_rel_std', type=float, default=None,
+        help='Re-measure cached results with higher relative deviation')
+    parser.add_argument(
+        '--max_samples', type=int, default=1,
+        help='Repeat measurements up to this many times per configuration')
+    parser.add_argument(
+        '--rel_ci', type=float, default=0.05,
+        help='Stop repetitions once confidence interval is that tight')
+    parser.add_argument(
+        '--telemetry_s', type=float, default=0,
+        help='Sample resource consumption at this interval (0 disables)')
+
+
+def configure(bench, options, dbms):
+    """ Configures result cache, repetitions, and telemetry of benchmark.
+    
+    Args:
+        bench: configure this benchmark
+        options: maps option names to values (command line arguments or 
+            BENCHMARK section of configuration file, values may be strings)
+        dbms: benchmark runs on this DBMS (telemetry is read from it)
+    """
+    cache_path = options.get('eval_cache')
+    if cache_path:
+        bench.cache = EvaluationCache(
+            cache_path, _number(options, 'cache_max_age_s', float),
+            _number(options, 'cache_max_rel_std', float))
+    max_samples = _number(options, 'max_samples', int, 1)
+    if max_samples > 1:
+        rel_ci = _number(options, 'rel_ci', float, 0.05)
+        bench.sampler = AdaptiveSampler(max_samples, rel_ci)
+    telemetry_s = _number(options, 'telemetry_s', float, 0)
+    if telemetry_s > 0:
+        bench.telemetry = ResourceSampler(dbms, telemetry_s)
+
+
 def from_file(config, dbms):
     """ Generate benchmark object from configuration file. 
     
@@ -18,9 +105,34 @@ def from_file(config, dbms):
         object representing configured benchmark
     """
     bench_type = config['BENCHMARK']['type']
-    if bench_type == 'olap':
+    race_factor = config['BENCHMARK'].getfloat('race_factor', fallback=None)
+    if isinstance(dbms, SimulatedDBMS):
+        bench = benchmark.evaluate.SimulatedOLAP(dbms, race_factor)
+    elif bench_type == 'olap':
+        path_to_queries = config['BENCHMARK']['queries']
+        compress_error = config['BENCHMARK'].getfloat(
+            'compress_error', fallback=None)
+        if compress_error is None:
+            bench = benchmark.evaluate.OLAP(dbms, path_to_queries, race_factor)
+        else:
+            bench = CompressedOLAP(
+                dbms, path_to_queries, compress_error,
+                config['BENCHMARK'].getint('validate_every', fallback=10),
+                race_factor)
+    elif bench_type == 'streams':
         path_to_queries = config['BENCHMARK']['queries']
-        bench = benchmark.evaluate.OLAP(dbms, path_to_queries)
+        nr_streams = int(config['BENCHMARK']['nr_streams'])
+        bench = benchmark.evaluate.OLAPStreams(
+            dbms, path_to_queries, nr_streams)
+    elif bench_type == 'oltp':
+        transactions = _transactions(
+            config['BENCHMARK']['transactions'], 
+            config['BENCHMARK'].getint('nr_warehouses', fallback=1))
+        bench = benchmark.oltp.OLTP(
+            dbms, transactions, 
+            config['BENCHMARK'].getint('nr_clients', fallback=8),
+            config['BENCHMARK'].getfloat('warmup_s', fallback=10),
+            config['BENCHMARK'].getfloat('measure_s', fallback=60))
     else:
         template_db = config['DATABASE']['template_db']
         target_db = config['DATABASE']['target_db']
@@ -28,9 +140,14 @@ def from_file(config, dbms):
         oltp_config = config['BENCHMARK']['oltp_config']
         oltp_result = config['BENCHMARK']['oltp_result']
         reset_every = int(config['BENCHMARK']['reset_every'])
+        monitor_s = config['BENCHMARK'].getfloat('monitor_s', fallback=None)
+        rel_tolerance = config['BENCHMARK'].getfloat(
+            'rel_tolerance', fallback=0.05)
         bench = benchmark.evaluate.TpcC(
             oltp_home, oltp_config, oltp_result, 
-            dbms, template_db, target_db, reset_every)
+            dbms, template_db, target_db, reset_every,
+            monitor_s, rel_tolerance, DBReset.from_file(config))
+    configure(bench, config['BENCHMARK'], dbms)
     return bench
 
 
@@ -44,13 +161,35 @@ def from_args(args, dbms):
     Returns:
         tuple of optimization objective and benchmark.
     """
-    if args.query_path is not None:
+    if isinstance(dbms, SimulatedDBMS):
+        # Minimize run time of simulated workload
+        objective = search.objectives.Objective.TIME
+        bench = benchmark.evaluate.SimulatedOLAP(dbms, args.race_factor)
+    elif args.oltp_script is not None:
+        # Tune for maximizing throughput of transaction mix
+        objective = search.objectives.Objective.THROUGHPUT
+        transactions = _transactions(args.oltp_script, args.nr_warehouses)
+        bench = benchmark.oltp.OLTP(
+            dbms, transactions, args.nr_clients, 
+            args.warmup_s, args.measure_s)
+    elif args.query_path is not None and args.nr_streams > 1:
+        # Tune for maximizing throughput of concurrent query streams
+        objective = search.objectives.Objective.THROUGHPUT
+        bench = benchmark.evaluate.OLAPStreams(
+            dbms, args.query_path, args.nr_streams)
+    elif args.query_path is not None and args.compress_error is not None:
+        # Tune for minimizing run time of representative queries
+        objective = search.objectives.Objective.TIME
+        bench = CompressedOLAP(
+            dbms, args.query_path, args.compress_error, 
+            args.validate_every, args.race_factor)
+    elif args.query_path is not None:
         # Tune for minimizing run time of given workload
         objective = search.objectives.Objective.TIME
-        bench = benchmark.evaluate.OLAP(dbms, args.query_path)
-        return objective, bench
+        bench = benchmark.evaluate.OLAP(
+            dbms, args.query_path, args.race_factor)
     else:
-        raise ValueError('This re-implementation does not yet support OLTP!')
+        raise ValueError('Specify queries or OLTP transactions to tune for!')
 
         # oltp_home = get_value(config, 'BENCHMARK', 'oltp_home', '')
         # oltp_config = get_value(config, 'BENCHMARK', 'oltp_config', '')
@@ -61,4 +200,31 @@ def from_args(args, dbms):
         # objective = search.objectives.Objective.THROUGHPUT
         # bench = benchmark.evaluate.TpcC(
             # oltp_home, oltp_config, oltp_result, 
-            # dbms, template_db, target_db, reset_every)
\ No newline at end of file
+            # dbms, template_db, target_db, reset_every)
+    
+    if args.objective is not None:
+        objective = search.objectives.from_name(args.objective)
+    configure(bench, vars(args), dbms)
+    return objective, bench
+
+
+def _transactions(oltp_script, nr_warehouses):
+    """ Returns built-in read/update mix or transactions read from file.
+    
+    Args:
+        oltp_script: "read_update" or path to weighted transaction script
+        nr_warehouses: number of warehouses (for built-in read/update mix)
+    
+    Returns:
+        list of weighted transactions
+    """
+    if oltp_script == 'read_update':
+        return benchmark.oltp.read_update_mix(nr_warehouses)
+    else:
+        return benchmark.oltp.read_transactions(oltp_script)
+
+
+def _number(options, name, num_type, default=None):
+    """ Returns numerical option or default if not specified. """
+    value = options.get(name)
+    return default if value is None else num_type(value)
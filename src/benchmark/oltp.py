@@ -0,0 +1,317 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.evaluate import Benchmark, split_queries
+from benchmark.sketch import metric_percentiles, QuantileSketch
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from dbms.catalog import fingerprint
+from dbms.generic_dbms import ConfigurableDBMS
+from typing import Dict, List, Tuple
+import random
+import re
+import time
+
+# Placeholders for parameters in transaction statements (e.g., :w_id)
+param_pattern = re.compile(r'(?<!:):([A-Za-z_][A-Za-z0-9_]*)')
+
+# Synthetic mix of reads and updates on the TPC-C schema of the OLTP
+# benchmark. Transactions use TPC-C tables and weights but do not follow
+# the TPC-C statement sequences (e.g., no orders are inserted or delivered).
+read_update_script = '''
+-- transaction item_update 45
+-- param w_id 1 {nr_warehouses}
+-- param d_id 1 10
+-- param c_id 1 3000
+-- param i_id 1 100000
+select w_tax from warehouse where w_id = :w_id;
+select d_tax, d_next_o_id from district
+where d_w_id = :w_id and d_id = :d_id;
+update district set d_next_o_id = d_next_o_id + 1
+where d_w_id = :w_id and d_id = :d_id;
+select c_discount, c_last, c_credit from customer
+where c_w_id = :w_id and c_d_id = :d_id and c_id = :c_id;
+select i_price, i_name, i_data from item where i_id = :i_id;
+select s_quantity from stock where s_w_id = :w_id and s_i_id = :i_id;
+update stock set s_quantity = s_quantity - 1, s_ytd = s_ytd + 1,
+s_order_cnt = s_order_cnt + 1 where s_w_id = :w_id and s_i_id = :i_id;
+
+-- transaction payment 43
+-- param w_id 1 {nr_warehouses}
+-- param d_id 1 10
+-- param c_id 1 3000
+-- param amount 1 5000
+update warehouse set w_ytd = w_ytd + :amount where w_id = :w_id;
+update district set d_ytd = d_ytd + :amount
+where d_w_id = :w_id and d_id = :d_id;
+update customer set c_balance = c_balance - :amount,
+c_ytd_payment = c_ytd_payment + :amount,
+c_payment_cnt = c_payment_cnt + 1
+where c_w_id = :w_id and c_d_id = :d_id and c_id = :c_id;
+insert into history (h_c_id, h_c_d_id, h_c_w_id, h_d_id, h_w_id,
+h_date, h_amount, h_data) values (:c_id, :d_id, :w_id, :d_id, :w_id,
+current_timestamp, :amount, 'payment');
+
+-- transaction order_status 4
+-- param w_id 1 {nr_warehouses}
+-- param d_id 1 10
+-- param c_id 1 3000
+select c_balance, c_first, c_middle, c_last from customer
+where c_w_id = :w_id and c_d_id = :d_id and c_id = :c_id;
+select o_id, o_carrier_id, o_entry_d from oorder
+where o_w_id = :w_id and o_d_id = :d_id and o_c_id = :c_id
+order by o_id desc limit 1;
+
+-- transaction customer_update 4
+-- param w_id 1 {nr_warehouses}
+-- param d_id 1 10
+-- param c_id 1 3000
+-- param amount 1 5000
+select min(no_o_id) from new_order
+where no_w_id = :w_id and no_d_id = :d_id;
+update customer set c_balance = c_balance + :amount,
+c_delivery_cnt = c_delivery_cnt + 1
+where c_w_id = :w_id and c_d_id = :d_id and c_id = :c_id;
+
+-- transaction stock_level 4
+-- param w_id 1 {nr_warehouses}
+-- param d_id 1 10
+-- param threshold 10 20
+select count(distinct s_i_id) from order_line, stock
+where ol_w_id = :w_id and ol_d_id = :d_id and ol_o_id >= (
+select d_next_o_id - 20 from district
+where d_w_id = :w_id and d_id = :d_id)
+and s_w_id = :w_id and s_i_id = ol_i_id and s_quantity < :threshold;
+'''
+
+
+@dataclass
+class Transaction():
+    """ Describes one transaction type of an OLTP workload. """
+    name: str
+    weight: float # relative frequency in transaction mix
+    params: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    statements: List[str] = field(default_factory=list)
+
+    def bind(self, rng):
+        """ Returns statements with parameters replaced by random values.
+
+        Args:
+            rng: random number generator (parameters are drawn uniformly)
+
+        Returns:
+            list of SQL statements
+        """
+        values = {p:str(rng.randint(l, u)) for p, (l, u) in self.params.items()}
+        return [param_pattern.sub(
+            lambda m: values.get(m.group(1), m.group(0)), s)
+            for s in self.statements]
+
+
+def parse_transactions(script):
+    """ Parses weighted transaction script.
+
+    Each transaction starts with a line of the form
+    "-- transaction <name> <weight>", followed by lines of the form
+    "-- param <name> <min> <max>" declaring integer parameters. The SQL
+    statements of the transaction follow (separated by semicolons) and
+    refer to parameters as :<name>. Parameter values are drawn uniformly
+    at random from the declared range for each execution.
+
+    Args:
+        script: text describing weighted transactions
+
+    Returns:
+        list of transactions
+    """
+    transactions = []
+    lines = []
+    for line in script.splitlines() + ['-- transaction']:
+        tokens = line.split()
+        if tokens[:2] == ['--', 'transaction']:
+            if transactions:
+                transactions[-1].statements = split_queries('\n'.join(lines))
+            if len(tokens) == 4:
+                transactions.append(Transaction(tokens[2], float(tokens[3])))
+            elif len(tokens) != 2:
+                raise ValueError(f'Cannot parse transaction header: {line}')
+            lines = []
+        elif tokens[:2] == ['--', 'param'] and transactions:
+            if len(tokens) != 5:
+                raise ValueError(f'Cannot parse parameter: {line}')
+            transactions[-1].params[tokens[2]] = (
+                int(tokens[3]), int(tokens[4]))
+        elif transactions:
+            lines.append(line)
+    return transactions
+
+
+def read_transactions(path):
+    """ Reads weighted transaction script from file (see parse_transactions). """
+    with open(path) as file:
+        return parse_transactions(file.read())
+
+
+def read_update_mix(nr_warehouses):
+    """ Returns synthetic read/update mix for given number of warehouses. """
+    return parse_transactions(
+        read_update_script.format(nr_warehouses=nr_warehouses))
+
+
+class OLTP(Benchmark):
+    """ Runs weighted transaction mix from concurrent clients.
+
+    Each client runs over its own database session (in a separate thread)
+    and picks transactions at random, according to their weights. Only
+    transactions finishing in the measurement window (after warmup) count.
+    """
+
+    metric = 'throughput'
+
+    def __init__(
+            self, dbms: ConfigurableDBMS, transactions, nr_clients,
+            warmup_s, measure_s):
+        """ Initialize with database, transactions, and measurement window.
+
+        Args:
+            dbms: interface for configurable DBMS (must support sessions)
+            transactions: list of weighted transactions
+            nr_clients: number of concurrent clients
+            warmup_s: run transactions for that many seconds before measuring
+            measure_s: measure throughput for that many seconds
+        """
+        super().__init__()
+        self.dbms = dbms
+        self.transactions = transactions
+        self.weights = [t.weight for t in transactions]
+        self.nr_clients = nr_clients
+        self.warmup_s = warmup_s
+        self.measure_s = measure_s
+        self.log_path = None
+        self._init_stats()
+
+    def evaluate(self):
+        """ Run transaction mix from all clients concurrently.
+
+        Results are taken from the cache (if any) if available. Runs are
+        repeated as long as the sampler (if any) requests it, throughput is
+        the mean over all runs in that case.
+
+        Returns:
+            Dictionary containing error flag, throughput in transactions per
+            second, latency percentiles (in milliseconds) and their sketch,
+            number of aborted transactions, restart time, variance and
+            number of measurements
+        """
+        self.eval_ctr += 1
+        config = self.dbms.changed()
+        restart_ms = self.dbms.restart_latency()
+        metrics = self._cached_metrics()
+        if metrics is None:
+            metrics = self._measure()
+        else:
+            print(f'Using cached result ({metrics.get("nr_samples")} runs)')
+        metrics['restart_ms'] = restart_ms
+        error = metrics['error']
+        throughput = metrics['throughput']
+        # Update statistics
+        if not error:
+            if throughput > self.max_throughput:
+                self.max_throughput = throughput
+                self.max_config = config
+            if throughput < self.min_throughput:
+                self.min_throughput = throughput
+                self.min_config = config
+        # Logging
+        self.print_stats()
+        details = {
+            'restart_ms': restart_ms,
+            'latency_ms': metric_percentiles(metrics) or metrics['latency_ms'],
+            'aborted': metrics['aborted'],
+            'cached': metrics.get('cached', False),
+            'variance': metrics.get('variance'),
+            'nr_samples': metrics.get('nr_samples'),
+            'telemetry': metrics.get('telemetry')}
+        self._log(
+            self.max_throughput, self.max_config,
+            throughput, config, details)
+        return metrics
+
+    def print_stats(self):
+        """ Print out benchmark statistics. """
+        print(f'Minimal throughput {self.min_throughput} with configuration {self.min_config}')
+        print(f'Maximal throughput {self.max_throughput} with configuration {self.max_config}')
+
+    def workload_id(self):
+        """ Returns hash of transactions, clients, and measurement window. """
+        return fingerprint(
+            [asdict(t) for t in self.transactions], self.nr_clients,
+            self.warmup_s, self.measure_s)
+
+    def _incumbent(self):
+        """ Returns best throughput (None if no successful run yet). """
+        return self.max_throughput if self.max_config else None
+
+    def _init_stats(self):
+        """ Reset minimal and maximal throughput (and configurations). """
+        self.min_throughput = float('inf')
+        self.min_config = {}
+        self.max_throughput = 0
+        self.max_config = {}
+
+    def _run_client(self, client_id, start_s):
+        """ Runs transactions until the end of the measurement window.
+
+        Args:
+            client_id: number of client (used as seed for random choices)
+            start_s: start time of warmup (in seconds since epoch)
+
+        Returns:
+            tuple: sketch of latencies of committed transactions in
+                measurement window (in ms) and number of aborted
+                transactions in window, None if no session could be opened
+        """
+        session = self.dbms.open_session()
+        if session is None:
+            return None
+        rng = random.Random(client_id)
+        measure_start_s = start_s + self.warmup_s
+        end_s = measure_start_s + self.measure_s
+        sketch = QuantileSketch()
+        nr_aborted = 0
+        while time.time() < end_s:
+            transaction = rng.choices(self.transactions, self.weights)[0]
+            txn_start_s = time.time()
+            committed = session.exec_transaction(transaction.bind(rng))
+            txn_end_s = time.time()
+            if measure_start_s <= txn_end_s <= end_s:
+                if committed:
+                    sketch.add((txn_end_s - txn_start_s) * 1000.0)
+                else:
+                    nr_aborted += 1
+        session.close_session()
+        return sketch, nr_aborted
+
+    def _sample(self):
+        """ Runs all clients once and returns dictionary of metrics. """
+        start_s = time.time()
+        with ThreadPoolExecutor(max_workers=self.nr_clients) as pool:
+            results = list(pool.map(
+                self._run_client, range(self.nr_clients),
+                [start_s] * self.nr_clients))
+        sketch = QuantileSketch()
+        for result in results:
+            if result:
+                sketch.merge(result[0])
+        nr_aborted = sum(r[1] for r in results if r)
+        error = None in results or not sketch.count
+        throughput = -1 if error else sketch.count / self.measure_s
+        latency_ms = sketch.percentiles()
+        print(f'Committed {sketch.count} transactions ' \
+              f'(aborted: {nr_aborted}, latency: {latency_ms})')
+        return {
+            'error': error, 'throughput': throughput,
+            'latency_ms': latency_ms, 'aborted': nr_aborted,
+            'latency_sketch': sketch.to_dict()}
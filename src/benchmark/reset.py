@@ -0,0 +1,403 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dbms.catalog import fingerprint
+from dbms.mysql import MySQLconfig
+from dbms.postgres import PgConfig
+import os
+import shutil
+import subprocess
+import time
+
+# Database dumps are cached in this directory by default
+dump_dir = os.path.join(os.path.expanduser('~'), '.dbbert', 'dumps')
+
+
+class ResetStrategy(ABC):
+    """ Strategy for re-initializing a database from a template database. """
+
+    # Name of strategy (used for reporting)
+    name = None
+
+    @abstractmethod
+    def available(self, dbms):
+        """ Returns True iff strategy can be used for given DBMS. """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def reset(self, dbms, source_db, target_db):
+        """ Copy source to target database, returns success flag.
+
+        Args:
+            dbms: configurable DBMS managing both databases
+            source_db: name of template database
+            target_db: name of database to re-initialize
+
+        Returns:
+            True iff target database was re-initialized
+        """
+        raise NotImplementedError()
+
+
+class CopyDB(ResetStrategy):
+    """ Uses copy method of DBMS (e.g., serial dump and restore). """
+
+    name = 'copy_db'
+
+    def available(self, dbms):
+        """ Copying is supported by all DBMS. """
+        return True
+
+    def reset(self, dbms, source_db, target_db):
+        """ Copy source to target database via DBMS interface. """
+        return dbms.copy_db(source_db, target_db)
+
+
+class TemplateCopy(ResetStrategy):
+    """ Creates Postgres database with template database. """
+
+    name = 'template_copy'
+
+    def available(self, dbms):
+        """ Template copies are supported by Postgres. """
+        return isinstance(dbms, PgConfig)
+
+    def reset(self, dbms, source_db, target_db):
+        """ Drop target database and re-create it from template. """
+        return dbms.copy_db(source_db, target_db)
+
+
+class ParallelDump(ResetStrategy):
+    """ Dumps and loads MySQL tables in parallel (one table per worker). """
+
+    name = 'parallel_dump'
+
+    def __init__(self, nr_workers=4):
+        """ Initialize with degree of parallelism.
+
+        Args:
+            nr_workers: process that many tables in parallel
+        """
+        self.nr_workers = nr_workers
+
+    def available(self, dbms):
+        """ Requires MySQL client tools. """
+        return isinstance(dbms, MySQLconfig) and \
+            shutil.which('mysql') is not None and \
+            shutil.which('mysqldump') is not None
+
+    def reset(self, dbms, source_db, target_db):
+        """ Re-create target database, then copy tables in parallel. """
+        tables = self._tables(dbms, source_db)
+        if not tables or not self._recreate(dbms, target_db):
+            return False
+        return self._run_all(
+            [lambda t=t: self._copy_table(dbms, source_db, t, target_db)
+             for t in tables])
+
+    def _client(self, dbms, tool='mysql'):
+        """ Returns arguments invoking MySQL client tool (without password). """
+        return [tool, f'--user={dbms.user}']
+
+    def _copy_table(self, dbms, source_db, table, target_db):
+        """ Pipes dump of one table into client, returns success flag. """
+        env = self._env(dbms)
+        dump = subprocess.Popen(
+            self._client(dbms, 'mysqldump') + [source_db, table],
+            stdout=subprocess.PIPE, env=env)
+        load = subprocess.Popen(
+            self._client(dbms) + [target_db], stdin=dump.stdout, env=env)
+        dump.stdout.close()
+        return load.wait() == 0 and dump.wait() == 0
+
+    def _env(self, dbms):
+        """ Returns environment passing password to client tools.
+        
+        Passwords are not passed as arguments (visible to other users).
+        """
+        env = dict(os.environ)
+        env['MYSQL_PWD'] = dbms.password
+        return env
+
+    def _recreate(self, dbms, target_db):
+        """ Drop target database and create empty database, returns success. """
+        return dbms.update(f'drop database if exists {target_db}') and \
+            dbms.update(f'create database {target_db}')
+
+    def _run_all(self, jobs):
+        """ Runs jobs in parallel, returns True iff all succeed.
+        
+        Args:
+            jobs: functions without arguments returning success flags
+        """
+        with ThreadPoolExecutor(max_workers=self.nr_workers) as pool:
+            results = list(pool.map(lambda job: job(), jobs))
+        return all(results)
+
+    def _tables(self, dbms, db):
+        """ Returns names of all tables in given database. """
+        result = subprocess.run(
+            self._client(dbms) + ['-N', '-B', '-e', 'show tables', db],
+            capture_output=True, text=True, env=self._env(dbms))
+        if result.returncode != 0:
+            return []
+        return [t for t in result.stdout.splitlines() if t]
+
+
+class CachedDump(ParallelDump):
+    """ Dumps MySQL tables once into files, loads them in parallel.
+    
+    Dumps are stored per template database and per version of its
+    content, identified by table metadata (creation and update times,
+    sizes, and row counts). Hence, the template database is dumped again
+    after it changes (or after update times are lost by a restart).
+    """
+
+    name = 'cached_dump'
+
+    def __init__(self, nr_workers=4, cache_dir=dump_dir):
+        """ Initialize with degree of parallelism and cache directory.
+
+        Args:
+            nr_workers: process that many tables in parallel
+            cache_dir: store dump files of template databases here
+        """
+        super().__init__(nr_workers)
+        self.cache_dir = cache_dir
+
+    def invalidate(self, source_db=None):
+        """ Deletes cached dumps of given template database (or of all).
+        
+        Args:
+            source_db: name of template database (None for all databases)
+        """
+        if source_db is None:
+            path = self.cache_dir
+        else:
+            path = os.path.join(self.cache_dir, source_db)
+        print(f'Deleting cached dumps in {path}')
+        shutil.rmtree(path, ignore_errors=True)
+
+    def reset(self, dbms, source_db, target_db):
+        """ Dump source database (unless cached), then load into target. """
+        tables = self._tables(dbms, source_db)
+        content_id = self._content_id(dbms, source_db, tables)
+        if content_id is None:
+            return False
+        db_dir = os.path.join(self.cache_dir, source_db, content_id)
+        if not os.path.exists(os.path.join(db_dir, 'complete')):
+            self.invalidate(source_db)
+            if not self._dump(dbms, source_db, tables, db_dir):
+                return False
+        if not self._recreate(dbms, target_db):
+            return False
+        paths = [os.path.join(db_dir, f) for f in os.listdir(db_dir)
+                 if f.endswith('.sql')]
+        return self._run_all(
+            [lambda p=p: self._load(dbms, p, target_db) for p in paths])
+
+    def _content_id(self, dbms, source_db, tables):
+        """ Returns hash of table metadata (None if unavailable).
+        
+        Metadata is read from information_schema, without scanning tables.
+        Cached statistics are disabled for the session (MySQL 8) to obtain
+        current update times and sizes.
+        """
+        if not tables:
+            return None
+        dbms.update('set session information_schema_stats_expiry = 0')
+        rows = dbms.query_all(
+            'select table_name, create_time, update_time, data_length, ' \
+            'index_length, table_rows from information_schema.tables ' \
+            f'where table_schema = {_literal(source_db)}')
+        if not rows or not set(tables) <= {str(r[0]) for r in rows}:
+            return None
+        return fingerprint(*sorted(str(r) for r in rows))
+
+    def _dump(self, dbms, source_db, tables, db_dir):
+        """ Dumps given tables of source database into files of directory. """
+        print(f'Dumping {source_db} into {db_dir}')
+        os.makedirs(db_dir)
+        if not self._run_all(
+            [lambda t=t: self._dump_table(dbms, source_db, t, db_dir)
+             for t in tables]):
+            return False
+        with open(os.path.join(db_dir, 'complete'), 'w') as file:
+            file.write('\n'.join(tables))
+        return True
+
+    def _dump_table(self, dbms, source_db, table, db_dir):
+        """ Dumps one table into file of directory, returns success flag. """
+        with open(os.path.join(db_dir, f'{table}.sql'), 'wb') as file:
+            result = subprocess.run(
+                self._client(dbms, 'mysqldump') + [source_db, table],
+                stdout=file, env=self._env(dbms))
+        return result.returncode == 0
+
+    def _load(self, dbms, path, target_db):
+        """ Loads dump file into target database, returns success flag. """
+        with open(path, 'rb') as file:
+            result = subprocess.run(
+                self._client(dbms) + [target_db], stdin=file,
+                env=self._env(dbms))
+        return result.returncode == 0
+
+
+class FileClone(ResetStrategy):
+    """ Replaces data directory by a clone of a snapshot directory.
+
+    The snapshot must be taken from the stopped server with default
+    configuration. Files are cloned via reflinks if the file system
+    supports them (regular copies otherwise). Hard links are not used as
+    database systems modify data files in place.
+    """
+
+    name = 'file_clone'
+
+    def __init__(self, snapshot_dir, data_dir, stop_cmd):
+        """ Initialize with directories and command to stop the server.
+
+        Args:
+            snapshot_dir: directory containing snapshot of data directory
+            data_dir: data directory of database server
+            stop_cmd: command for stopping database server
+        """
+        self.snapshot_dir = snapshot_dir
+        self.data_dir = data_dir
+        self.stop_cmd = stop_cmd
+
+    def available(self, dbms):
+        """ Requires snapshot and data directory. """
+        return os.path.isdir(self.snapshot_dir) and \
+            os.path.isdir(self.data_dir)
+
+    def reset(self, dbms, source_db, target_db):
+        """ Clone snapshot, swap data directories, and restart server.
+
+        The data directory is only swapped once the server has stopped.
+        The previous data directory is kept until the server runs with
+        the clone and restored if restarting fails. The current
+        configuration is applied again after the restart.
+        """
+        clone_dir = self.data_dir.rstrip('/') + '.clone'
+        old_dir = self.data_dir.rstrip('/') + '.old'
+        if os.path.exists(old_dir):
+            print(f'Directory {old_dir} exists (previous reset failed?)')
+            return False
+        shutil.rmtree(clone_dir, ignore_errors=True)
+        result = subprocess.run(
+            ['cp', '-a', '--reflink=auto', self.snapshot_dir, clone_dir])
+        if result.returncode != 0:
+            return False
+        if not dbms.stop_server(self.stop_cmd):
+            shutil.rmtree(clone_dir, ignore_errors=True)
+            dbms.start_server()
+            return False
+        os.rename(self.data_dir, old_dir)
+        os.rename(clone_dir, self.data_dir)
+        if dbms.start_server():
+            shutil.rmtree(old_dir, ignore_errors=True)
+            return True
+        print(f'Restart failed, restoring data directory from {old_dir}')
+        if dbms.stop_server(self.stop_cmd):
+            os.rename(self.data_dir, clone_dir)
+            os.rename(old_dir, self.data_dir)
+            shutil.rmtree(clone_dir, ignore_errors=True)
+        else:
+            print(f'Server still running, keeping {old_dir}')
+        dbms.start_server()
+        return False
+
+
+class DBReset():
+    """ Resets databases via fastest available strategy, reports time. """
+
+    def __init__(self, strategies):
+        """ Initialize with strategies, ordered by priority.
+
+        Args:
+            strategies: try strategies in this order
+        """
+        self.strategies = strategies
+
+    @classmethod
+    def default(cls, nr_workers=4, cache_dir=dump_dir, clone=None):
+        """ Returns reset layer trying faster strategies first.
+
+        Args:
+            nr_workers: degree of parallelism for dumping and loading
+            cache_dir: cache dumps of template databases here
+            clone: strategy cloning data directory (if any)
+
+        Returns:
+            reset layer with default strategies
+        """
+        strategies = [] if clone is None else [clone]
+        strategies += [
+            TemplateCopy(), CachedDump(nr_workers, cache_dir),
+            ParallelDump(nr_workers), CopyDB()]
+        return cls(strategies)
+
+    @classmethod
+    def from_file(cls, config):
+        """ Initializes reset layer from configuration file.
+
+        Data directories are only cloned if a snapshot directory is given.
+        Cached dumps are deleted if the configuration asks for it.
+
+        Args:
+            cls: class (currently, only DBReset)
+            config: configuration read from file
+
+        Returns:
+            reset layer with default strategies
+        """
+        section = config['BENCHMARK']
+        clone = None
+        if 'snapshot_dir' in section:
+            clone = FileClone(
+                section['snapshot_dir'], section['data_dir'],
+                section['stop_cmd'])
+        resetter = cls.default(
+            section.getint('reset_workers', fallback=4),
+            section.get('dump_cache_dir', fallback=dump_dir), clone)
+        if section.getboolean('clear_dump_cache', fallback=False):
+            for strategy in resetter.strategies:
+                if isinstance(strategy, CachedDump):
+                    strategy.invalidate()
+        return resetter
+
+    def reset(self, dbms, source_db, target_db):
+        """ Copy source to target database, falls back on failures.
+
+        Args:
+            dbms: configurable DBMS managing both databases
+            source_db: name of template database
+            target_db: name of database to re-initialize
+
+        Returns:
+            tuple: name of successful strategy (None if all fail) and
+                reset time in milliseconds
+        """
+        start_ms = time.time() * 1000.0
+        for strategy in self.strategies:
+            if strategy.available(dbms):
+                if strategy.reset(dbms, source_db, target_db):
+                    reset_ms = time.time() * 1000.0 - start_ms
+                    print(f'Reset via {strategy.name} took {reset_ms} ms')
+                    return strategy.name, reset_ms
+                print(f'Reset via {strategy.name} failed')
+        reset_ms = time.time() * 1000.0 - start_ms
+        print(f'Could not reset {target_db} from {source_db}')
+        return None, reset_ms
+
+
+def _literal(value):
+    """ Returns MySQL string literal (escaping quotes and backslashes). """
+    escaped = value.replace('\\', '\\\\').replace("'", "''")
+    return f"'{escaped}'"
+
@@ -0,0 +1,258 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import os
+import threading
+import time
+
+# Directory describing running processes (Linux)
+proc_dir = '/proc'
+# Directory describing block devices (Linux)
+block_dir = '/sys/block'
+# Size of sectors in disk statistics (in bytes)
+sector_bytes = 512
+
+
+class ResourceSampler():
+    """ Collects resource telemetry while benchmarks run.
+    
+    CPU utilization and memory consumption of server processes are sampled
+    periodically by a background thread. Disk statistics (read from /proc)
+    and DBMS counters (e.g., checkpoints or buffer pool reads) are compared
+    between start and end of the measurement. Telemetry is only available
+    on Linux (fields are None otherwise).
+    """
+    
+    def __init__(self, dbms, interval_s=1.0):
+        """ Initialize sampler for given DBMS.
+        
+        Args:
+            dbms: read statistics and process IDs from this DBMS
+            interval_s: sample CPU and memory in intervals of that many seconds
+        """
+        self.dbms = dbms
+        self.interval_s = interval_s
+        self.thread = None
+        self.stopped = threading.Event()
+    
+    def start(self):
+        """ Takes initial snapshot and starts sampling in background. """
+        self.pids = self.dbms.server_pids()
+        self.start_s = time.time()
+        self.start_cpu = _cpu_times()
+        self.start_disk = _disk_stats()
+        self.start_counters = self.dbms.stat_counters()
+        self.cpu_utils = []
+        self.max_rss = None
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """ Stops sampling and returns telemetry since start.
+        
+        Returns:
+            dictionary with duration (seconds), mean and maximal CPU 
+            utilization and fraction of CPU time waiting for I/O, bytes 
+            and operations per second read and written on disk, maximal
+            resident memory of server processes (bytes), page cache hit 
+            ratio, and deltas of DBMS counters
+        """
+        self.stopped.set()
+        self.thread.join()
+        duration_s = max(time.time() - self.start_s, 1e-6)
+        cpu_util, iowait = _cpu_fractions(self.start_cpu, _cpu_times())
+        if cpu_util is not None:
+            self.cpu_utils.append(cpu_util)
+        disk = _deltas(self.start_disk, _disk_stats())
+        counters = _deltas(self.start_counters, self.dbms.stat_counters())
+        record = {
+            'duration_s': duration_s, 'cpu_util': cpu_util, 
+            'max_cpu_util': max(self.cpu_utils, default=None),
+            'iowait': iowait, 'read_bytes': disk.get('read_bytes'),
+            'write_bytes': disk.get('write_bytes'),
+            'read_iops': _rate(disk.get('read_ops'), duration_s),
+            'write_iops': _rate(disk.get('write_ops'), duration_s),
+            'max_rss': self.max_rss, 
+            'cache_hit_ratio': self.dbms.cache_hit_ratio(counters),
+            'counters': {c:v for c, v in counters.items() if v}}
+        return {k:round(v, 4) if isinstance(v, float) else v 
+                for k, v in record.items()}
+    
+    def _run(self):
+        """ Samples CPU utilization and server memory until stopped. """
+        last_cpu = self.start_cpu
+        while not self.stopped.wait(self.interval_s):
+            cpu = _cpu_times()
+            cpu_util, _ = _cpu_fractions(last_cpu, cpu)
+            if cpu_util is not None:
+                self.cpu_utils.append(cpu_util)
+            last_cpu = cpu
+            rss = current_rss(self.pids)
+            if rss is not None:
+                self.max_rss = max(self.max_rss or 0, rss)
+
+
+def current_rss(pids):
+    """ Returns summed resident set size of processes (None if unknown). """
+    total = None
+    for pid in pids:
+        kb = _status_kb(pid, 'VmRSS')
+        if kb is not None:
+            total = (total or 0) + kb * 1024
+    return total
+
+
+def current_pss(pids):
+    """ Returns summed proportional set size of processes (in bytes).
+    
+    Unlike the resident set size, the proportional set size divides 
+    shared memory (e.g., shared buffers) among processes that map it.
+    Hence, shared memory is counted only once for all processes.
+    
+    Args:
+        pids: IDs of processes (e.g., processes of database server)
+    
+    Returns:
+        proportional set size in bytes or None if unavailable
+    """
+    total = None
+    for pid in pids:
+        kb = _rollup_kb(pid, 'Pss')
+        if kb is not None:
+            total = (total or 0) + kb * 1024
+    return total
+
+
+class PeakMemory():
+    """ Samples memory consumption of processes to determine its peak.
+    
+    Memory consumption is the summed proportional set size of processes
+    (see current_pss), sampled periodically by a background thread.
+    """
+    
+    def __init__(self, pids, interval_s=0.1):
+        """ Initialize sampler for given processes.
+        
+        Args:
+            pids: IDs of processes (e.g., processes of database server)
+            interval_s: sample memory in intervals of that many seconds
+        """
+        self.pids = pids
+        self.interval_s = interval_s
+        self.peak = None
+        self.thread = None
+        self.stopped = threading.Event()
+    
+    def start(self):
+        """ Starts sampling memory in background. """
+        self.peak = None
+        self.stopped.clear()
+        self._sample()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """ Stops sampling and returns peak memory in bytes (None if unknown). """
+        self.stopped.set()
+        self.thread.join()
+        self._sample()
+        return self.peak
+    
+    def _run(self):
+        """ Samples memory until stopped. """
+        while not self.stopped.wait(self.interval_s):
+            self._sample()
+    
+    def _sample(self):
+        """ Updates peak memory consumption. """
+        pss = current_pss(self.pids)
+        if pss is not None:
+            self.peak = max(self.peak or 0, pss)
+
+
+def _status_kb(pid, field):
+    """ Returns field of process status in kilobytes (None if unavailable). """
+    try:
+        with open(os.path.join(proc_dir, str(pid), 'status')) as file:
+            for line in file:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _rollup_kb(pid, field):
+    """ Returns field of accumulated memory map in kilobytes (or None). """
+    try:
+        with open(os.path.join(proc_dir, str(pid), 'smaps_rollup')) as file:
+            for line in file:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _cpu_fractions(start, end):
+    """ Returns fraction of busy CPU time and of time waiting for I/O.
+    
+    Args:
+        start: CPU times at start of interval (see _cpu_times)
+        end: CPU times at end of interval
+    
+    Returns:
+        tuple: utilization and I/O wait fraction (None if unknown)
+    """
+    if start is None or end is None:
+        return None, None
+    deltas = [e - s for s, e in zip(start, end)]
+    total = sum(deltas)
+    if total <= 0:
+        return None, None
+    idle, iowait = deltas[3], deltas[4]
+    return (total - idle - iowait) / total, iowait / total
+
+
+def _cpu_times():
+    """ Returns aggregate CPU times of all cores (None if unavailable). """
+    try:
+        with open(os.path.join(proc_dir, 'stat')) as file:
+            fields = file.readline().split()
+        return [int(f) for f in fields[1:9]]
+    except (OSError, ValueError):
+        return None
+
+
+def _deltas(start, end):
+    """ Returns differences between counters at end and start. """
+    return {k:v - start[k] for k, v in end.items() if k in start}
+
+
+def _disk_stats():
+    """ Returns bytes and operations read and written on all disks. """
+    stats = {'read_bytes':0, 'write_bytes':0, 'read_ops':0, 'write_ops':0}
+    try:
+        with open(os.path.join(proc_dir, 'diskstats')) as file:
+            for line in file:
+                fields = line.split()
+                device = fields[2]
+                # Skip partitions (counted by disk) and virtual devices
+                if device.startswith(('loop', 'ram')) or \
+                    not os.path.exists(os.path.join(block_dir, device)):
+                    continue
+                stats['read_ops'] += int(fields[3])
+                stats['read_bytes'] += int(fields[5]) * sector_bytes
+                stats['write_ops'] += int(fields[7])
+                stats['write_bytes'] += int(fields[9]) * sector_bytes
+    except (OSError, ValueError, IndexError):
+        return {}
+    return stats
+
+
+def _rate(count, duration_s):
+    """ Returns count per second (None if count is unknown). """
+    return None if count is None else count / duration_s
@@ -0,0 +1,75 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import math
+
+# Quantiles of Student's t-distribution for two-sided 95% confidence
+t_quantiles = {
+    1:12.71, 2:4.30, 3:3.18, 4:2.78, 5:2.57, 6:2.45, 7:2.36, 8:2.31,
+    9:2.26, 10:2.23, 15:2.13, 20:2.09, 30:2.04}
+
+
+def mean_var(values):
+    """ Returns mean and sample variance of values (variance 0 if single). """
+    nr_values = len(values)
+    mean = sum(values) / nr_values
+    if nr_values < 2:
+        return mean, 0.0
+    variance = sum((v - mean) ** 2 for v in values) / (nr_values - 1)
+    return mean, variance
+
+
+def t_quantile(dof):
+    """ Returns t-quantile for 95% confidence (conservative if not tabled). """
+    if dof > 30:
+        return 1.96
+    return t_quantiles[max(d for d in t_quantiles if d <= max(dof, 1))]
+
+
+class AdaptiveSampler():
+    """ Decides when to stop repeating measurements of one configuration.
+
+    Measurements are repeated until the 95% confidence interval of the mean
+    is tight enough, until it excludes the performance of the best
+    configuration (so the decision on the best configuration is clear),
+    or until the maximal number of measurements is reached.
+    """
+
+    def __init__(self, max_samples, rel_ci=0.05, min_samples=2):
+        """ Initializes stopping criterion.
+
+        Args:
+            max_samples: take at most that many measurements
+            rel_ci: stop if half-width of confidence interval, relative
+                to the mean, is below this threshold
+            min_samples: take at least that many measurements
+        """
+        self.max_samples = max_samples
+        self.rel_ci = rel_ci
+        self.min_samples = min(min_samples, max_samples)
+
+    def done(self, values, incumbent):
+        """ Returns True iff no further measurements are required.
+
+        Args:
+            values: performance measured so far
+            incumbent: performance of best configuration (None if unknown)
+
+        Returns:
+            True iff sampling can stop
+        """
+        nr_values = len(values)
+        if nr_values >= self.max_samples:
+            return True
+        if nr_values < self.min_samples:
+            return False
+        mean, variance = mean_var(values)
+        half_width = t_quantile(nr_values - 1) * math.sqrt(variance / nr_values)
+        if half_width <= self.rel_ci * abs(mean):
+            return True
+        if incumbent is not None and (
+            mean - half_width > incumbent or mean + half_width < incumbent):
+            return True
+        return False
@@ -0,0 +1,124 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import math
+
+# Latency percentiles reported by benchmarks
+reported_percentiles = [50, 95, 99]
+
+
+class QuantileSketch():
+    """ Streaming quantile sketch with bounded relative error.
+
+    Values are counted in buckets whose boundaries grow geometrically
+    (similar to DDSketch). Hence, memory consumption grows with the
+    logarithm of the value range, not with the number of values. Sketches
+    of separate runs or clients can be merged without loss of accuracy.
+    """
+
+    def __init__(self, rel_error=0.01):
+        """ Initialize empty sketch.
+
+        Args:
+            rel_error: maximal relative error of quantiles
+        """
+        self.rel_error = rel_error
+        self.gamma = (1 + rel_error) / (1 - rel_error)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.nr_zeros = 0
+        self.count = 0
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Restores sketch from dictionary (see to_dict).
+
+        Args:
+            cls: class (currently, only QuantileSketch)
+            data: dictionary describing sketch
+
+        Returns:
+            sketch with same counts as described one
+        """
+        sketch = cls(data['rel_error'])
+        sketch.buckets = {int(b):c for b, c in data['buckets'].items()}
+        sketch.nr_zeros = data['nr_zeros']
+        sketch.count = sketch.nr_zeros + sum(sketch.buckets.values())
+        return sketch
+
+    def add(self, value):
+        """ Adds one value (values below zero count as zero). """
+        if value <= 0:
+            self.nr_zeros += 1
+        else:
+            bucket = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        """ Adds all values counted by other sketch (same relative error). """
+        if other.rel_error != self.rel_error:
+            raise ValueError('Cannot merge sketches with different errors')
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.nr_zeros += other.nr_zeros
+        self.count += other.count
+
+    def percentiles(self):
+        """ Returns dictionary with reported percentiles (e.g., p95). """
+        return {f'p{p}':self.quantile(p/100.0) for p in reported_percentiles}
+
+    def quantile(self, fraction):
+        """ Returns quantile (nearest rank, None if sketch is empty).
+
+        Args:
+            fraction: fraction of values below quantile (e.g., 0.95)
+
+        Returns:
+            approximate quantile, up to the relative error
+        """
+        if not self.count:
+            return None
+        rank = max(int(round(fraction * self.count)), 1)
+        seen = self.nr_zeros
+        if seen >= rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return None
+
+    def to_dict(self):
+        """ Returns dictionary describing sketch (e.g., for JSON). """
+        return {
+            'rel_error': self.rel_error, 'nr_zeros': self.nr_zeros,
+            'buckets': {str(b):c for b, c in self.buckets.items()}}
+
+
+def metric_percentiles(metrics):
+    """ Returns reported latency percentiles of metrics (None if no sketch). """
+    if 'latency_sketch' not in metrics:
+        return None
+    return QuantileSketch.from_dict(metrics['latency_sketch']).percentiles()
+
+
+def merge_sketches(metrics_list):
+    """ Returns merged latency sketch of metrics (None if no sketch).
+    
+    Args:
+        metrics_list: metrics of multiple measurements
+    
+    Returns:
+        dictionary describing merged sketch (see QuantileSketch.to_dict)
+    """
+    sketches = [m['latency_sketch'] for m in metrics_list 
+                if 'latency_sketch' in m]
+    if not sketches:
+        return None
+    sketch = QuantileSketch.from_dict(sketches[0])
+    for other in sketches[1:]:
+        sketch.merge(QuantileSketch.from_dict(other))
+    return sketch.to_dict()
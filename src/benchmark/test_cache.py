@@ -0,0 +1,109 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.cache import EvaluationCache
+from benchmark.evaluate import SimulatedOLAP
+from benchmark.sketch import QuantileSketch
+from dbms.simulated import SimulatedDBMS
+import os
+import tempfile
+import time
+import unittest
+
+class TestEvaluationCache(unittest.TestCase):
+    """ Test persistent caching of evaluation results. """
+
+    def setUp(self):
+        """ Initialize temporary directory for cache file. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache.json')
+
+    def tearDown(self):
+        """ Delete cache file. """
+        self.tmp_dir.cleanup()
+
+    def test_persistence(self):
+        """ Test storing results and loading them from disk. """
+        cache = EvaluationCache(self.path)
+        self.assertIsNone(cache.lookup('ctx', {'a':'1'}, 'time'))
+        cache.store('ctx', {'a':'1'}, {'error':False, 'time':100})
+        cache.store('ctx', {'a':'1'}, {'error':False, 'time':200})
+        cache.store('ctx', {'a':'1'}, {'error':False, 'censored':True, 'time':50})
+        cache = EvaluationCache(self.path)
+        metrics = cache.lookup('ctx', {'a':'1'}, 'time')
+        self.assertEqual(metrics['time'], 150)
+        self.assertEqual(metrics['variance'], 5000)
+        self.assertEqual(metrics['nr_samples'], 2)
+        self.assertTrue(metrics['cached'])
+        self.assertIsNone(cache.lookup('other', {'a':'1'}, 'time'))
+        self.assertIsNone(cache.lookup('ctx', {'a':'2'}, 'time'))
+
+    def test_remeasure(self):
+        """ Test re-measuring outdated or high-variance results. """
+        cache = EvaluationCache(self.path, max_rel_std=0.1)
+        cache.store('ctx', {}, {'error':False, 'time':100})
+        self.assertIsNone(cache.lookup('ctx', {}, 'time'))
+        cache.store('ctx', {}, {'error':False, 'time':104})
+        self.assertEqual(cache.lookup('ctx', {}, 'time')['time'], 102)
+        cache.store('ctx', {}, {'error':False, 'time':200})
+        self.assertIsNone(cache.lookup('ctx', {}, 'time'))
+        cache = EvaluationCache(self.path, max_age_s=60)
+        self.assertIsNotNone(cache.lookup('ctx', {}, 'time'))
+        key = cache._key('ctx', {})
+        for sample in cache.entries[key]:
+            sample['stored_s'] = time.time() - 120
+        self.assertIsNone(cache.lookup('ctx', {}, 'time'))
+
+    def test_errors(self):
+        """ Test that failed runs are neither stored nor used. """
+        cache = EvaluationCache(self.path)
+        cache.store('ctx', {}, {'error':True, 'time':0})
+        self.assertIsNone(cache.lookup('ctx', {}, 'time'))
+        cache.store('ctx', {}, {'error':False, 'time':100})
+        key = cache._key('ctx', {})
+        cache.entries[key].append(
+            {'stored_s':time.time(), 'metrics':{'error':True, 'time':0}})
+        metrics = cache.lookup('ctx', {}, 'time')
+        self.assertFalse(metrics['error'])
+        self.assertEqual(metrics['time'], 100)
+        self.assertEqual(metrics['nr_samples'], 1)
+
+    def test_min_samples(self):
+        """ Test requiring multiple measurements and merging sketches. """
+        cache = EvaluationCache(self.path, max_samples=3)
+        for latency_ms in [10, 20, 30]:
+            sketch = QuantileSketch()
+            sketch.add(latency_ms)
+            cache.store('ctx', {}, {
+                'error':False, 'time':latency_ms, 
+                'latency_sketch':sketch.to_dict()})
+            if latency_ms < 30:
+                self.assertIsNone(cache.lookup('ctx', {}, 'time', 3))
+        metrics = cache.lookup('ctx', {}, 'time', 3)
+        sketch = QuantileSketch.from_dict(metrics['latency_sketch'])
+        self.assertEqual(sketch.count, 3)
+        self.assertIsNotNone(cache.lookup('ctx', {}, 'time', 5))
+
+    def test_benchmark(self):
+        """ Test using cached results for equivalent configurations. """
+        dbms = SimulatedDBMS()
+        bench = SimulatedOLAP(dbms)
+        bench.cache = EvaluationCache(self.path)
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        dbms.apply_config({'work_mem':'64MB', 'jit':'on'})
+        dbms.reconfigure()
+        metrics = bench.evaluate()
+        self.assertFalse(metrics.get('cached', False))
+        dbms.apply_config({'work_mem':'64000kB'})
+        self.assertTrue(bench.has_cached_result())
+        metrics_2 = bench.evaluate()
+        self.assertTrue(metrics_2['cached'])
+        self.assertEqual(metrics['time'], metrics_2['time'])
+        dbms.version_id = lambda: self.fail('Version queried again')
+        self.assertTrue(bench.has_cached_result())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.capture import (
+    bind_parameters, capture_workload, statement_tables, write_workload)
+from benchmark.evaluate import OLAP
+from dbms.sqlite import SQLiteConfig
+import os
+import random
+import tempfile
+import unittest
+
+class StatsSQLite(SQLiteConfig):
+    """ SQLite database with statement statistics given by test. """
+
+    def column_values(self, column, tables=None):
+        """ Returns all distinct values of column in table t. """
+        if tables is not None and 't' not in tables:
+            return []
+        cursor = self.connection.execute(f'select distinct {column} from t')
+        return [str(r[0]) for r in cursor.fetchall()]
+
+    def top_statements(self, nr_statements):
+        """ Returns fixed statements with placeholders. """
+        return [
+            ('select count(*) from t where a = $1', 30, 300.0),
+            ('select * from t where a between $1 and $2 limit $3', 20, 100.0),
+            ('select sum(a) from t where b in ($1, $2)', 10, 50.0),
+            ('select count(*) from u where a = $1', 5, 25.0)]
+
+
+class TestCapture(unittest.TestCase):
+    """ Test capturing weighted workloads from statement statistics. """
+
+    def setUp(self):
+        """ Initialize SQLite database in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.dbms = StatsSQLite(db_path, 10)
+        self.dbms.update('create table t(a int, b text)')
+        self.dbms.update(
+            "insert into t values (1, 'x'), (2, 'y'), (3, 'it''s')")
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_bind_parameters(self):
+        """ Test binding placeholders to column values. """
+        rng = random.Random(0)
+        for _ in range(10):
+            query = bind_parameters(
+                'select * from t where $2 >= a and a >= $1',
+                self.dbms, rng)
+            self.assertNotIn('$', query)
+            query = bind_parameters(
+                'select * from t where a between $1 and $2', self.dbms, rng)
+            low, high = [int(v.strip("' ")) for v in
+                         query.split('between')[1].split('and')]
+            self.assertLessEqual(low, high)
+        query = bind_parameters(
+            "select * from t where b like $1 and b <> 'x'", self.dbms, rng)
+        self.assertNotIn('$', query)
+        query = bind_parameters(
+            'select * from t order by a limit $1 offset $2', self.dbms, rng)
+        limit, offset = [int(v) for v in query.split()[-3::2]]
+        self.assertIn(limit, [1, 10, 100])
+        self.assertIn(offset, [0, 10])
+        self.assertIsNone(bind_parameters('select $1', self.dbms, rng))
+        # Columns of tables that do not appear in the query have no values
+        self.assertIsNone(bind_parameters(
+            'select * from u where a = $1', self.dbms, rng))
+
+    def test_bind_typed(self):
+        """ Test binding typed placeholders not compared to columns. """
+        rng = random.Random(0)
+        query = bind_parameters(
+            'select date $1 - interval $2 day, $3::int, cast($4 as text)',
+            self.dbms, rng)
+        self.assertEqual(
+            query, "select date '2000-01-01' - interval '3' day, " \
+            "'1'::int, cast('a' as text)")
+
+    def test_statement_tables(self):
+        """ Test extracting tables from FROM clauses. """
+        self.assertEqual(statement_tables(
+            'select * from s.t1 x, t2 inner join T3 on (x.a = T3.a) ' \
+            'where x.a in (select b from t4 where c = 1) limit 3'), 
+            ('t1', 't2', 't3', 't4'))
+        self.assertEqual(statement_tables('select 1'), ())
+
+    def test_capture(self):
+        """ Test capturing and replaying weighted workload. """
+        statements = capture_workload(self.dbms)
+        self.assertEqual(len(statements), 3)
+        self.assertAlmostEqual(statements[0]['weight'], 1.5)
+        self.assertAlmostEqual(statements[1]['weight'], 1.0)
+        self.assertAlmostEqual(statements[2]['weight'], 0.5)
+        query_path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        write_workload(query_path, statements)
+        bench = OLAP(self.dbms, query_path)
+        self.assertEqual(bench.weights, [1.5, 1.0, 0.5])
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertAlmostEqual(
+            result['time'], 1.5 * result['query_ms'][0] +
+            1.0 * result['query_ms'][1] + 0.5 * result['query_ms'][2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.compress import compress, CompressedOLAP, error_bound
+from benchmark.evaluate import OLAP
+from dbms.sqlite import SQLiteConfig
+import os
+import tempfile
+import unittest
+
+class TestCompress(unittest.TestCase):
+    """ Test selecting representative queries of workloads. """
+
+    def test_error_bound(self):
+        """ Test error bound of stratified sample. """
+        self.assertEqual(error_bound([[0, 1], [2]], [10, 10, 50]), 0)
+        self.assertGreater(error_bound([[0, 1, 2]], [10, 10, 50]), 0)
+        self.assertEqual(error_bound([[0], [1], [2]], [10, 10, 50]), 0)
+
+    def test_compress(self):
+        """ Test clustering queries with similar run times and plans. """
+        query_ms = [10, 11, 10.5, 1000, 1010, 990]
+        weights = [1, 1, 2, 1, 1, 1]
+        scan = {'nodes': {'Seq Scan': 1}, 'rows': 100, 'cost': 50}
+        join = {'nodes': {'Hash Join': 1, 'Seq Scan': 2}, 'rows': 1e6,
+                'cost': 5e5}
+        features = [scan] * 3 + [join] * 3
+        representatives, bound = compress(query_ms, weights, features, 0.05)
+        self.assertEqual(len(representatives), 2)
+        self.assertLessEqual(bound, 0.05)
+        total_ms = sum(w * q_ms for w, q_ms in zip(weights, query_ms))
+        estimate_ms = sum(w * query_ms[r] for r, w, _ in representatives)
+        self.assertAlmostEqual(estimate_ms, total_ms)
+        members = sorted(m for _, _, ms in representatives for m in ms)
+        self.assertEqual(members, list(range(6)))
+        representatives, bound = compress(query_ms, weights, features, 0)
+        self.assertEqual(len(representatives), 6)
+        self.assertEqual(bound, 0)
+
+
+class TestCompressedOLAP(unittest.TestCase):
+    """ Test running and validating compressed OLAP workloads. """
+
+    def setUp(self):
+        """ Initialize SQLite database and workload in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.query_path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        with open(self.query_path, 'w') as file:
+            file.write(';\n'.join(
+                ['select count(*) from t'] * 4 +
+                ['-- weight: 2\nselect max(a) from t'] * 4))
+        self.dbms = SQLiteConfig(db_path, 10)
+        self.dbms.update('create table t(a int)')
+        self.dbms.update('insert into t values (1), (2)')
+        self.log_path = os.path.join(self.tmp_dir.name, 'results')
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_evaluate(self):
+        """ Test compressing workload and validating estimates. """
+        bench = CompressedOLAP(self.dbms, self.query_path, 0.5, 1)
+        bench.reset(self.log_path, 0)
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertEqual(len(result['query_ms']), 8)
+        compression = result['compression']
+        self.assertEqual(len(bench.queries), len(compression['query_ids']))
+        self.assertLessEqual(compression['error_bound'], 0.5)
+        result = bench.evaluate()
+        self.assertEqual(len(result['query_ms']), len(bench.queries))
+        validation = bench._validate(result['time'])
+        self.assertFalse(validation['error'])
+        self.assertGreater(validation['time'], 0)
+        compressed = OLAP(self.dbms, self.log_path + '_workload')
+        self.assertEqual(len(compressed.queries), len(bench.queries))
+        self.assertEqual(compressed.weights, bench.weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
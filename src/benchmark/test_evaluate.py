@@ -0,0 +1,200 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.evaluate import OLAP, OLAPStreams, read_queries, SimulatedOLAP
+from benchmark.resources import ResourceSampler
+from benchmark.sampling import AdaptiveSampler
+from benchmark.sketch import QuantileSketch
+from dbms.simulated import SimulatedDBMS
+from dbms.sqlite import SQLiteConfig
+from search.objectives import calculate_reward, Objective, uses_latency
+import json
+import os
+import tempfile
+import unittest
+
+class TestOLAP(unittest.TestCase):
+    """ Test parsing and per-query timing of OLAP workloads. """
+
+    def setUp(self):
+        """ Initialize SQLite database and workload in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.query_path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        with open(self.query_path, 'w') as file:
+            file.write(
+                "-- first query; counts rows\n" \
+                "select count(*) from t;\n" \
+                "select sum(a) from t where b <> ';';\n" \
+                "select max(a) from t;\n")
+        self.dbms = SQLiteConfig(db_path, 10)
+        self.dbms.update('create table t(a int, b text)')
+        self.dbms.update("insert into t values (1, 'x'), (2, ';')")
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_read_queries(self):
+        """ Test splitting workload into queries. """
+        queries = read_queries(self.query_path)
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(queries[1], "select sum(a) from t where b <> ';'")
+
+    def test_evaluate(self):
+        """ Test measuring run times of single queries. """
+        bench = OLAP(self.dbms, self.query_path)
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertEqual(len(result['query_ms']), 3)
+        self.assertAlmostEqual(result['time'], sum(result['query_ms']))
+        self.dbms.update('drop table t')
+        result = bench.evaluate()
+        self.assertTrue(result['error'])
+        self.assertEqual(len(result['query_ms']), 1)
+
+    def test_telemetry(self):
+        """ Test logging resource telemetry with evaluation details. """
+        bench = OLAP(self.dbms, self.query_path)
+        bench.telemetry = ResourceSampler(self.dbms, 0.01)
+        log_path = os.path.join(self.tmp_dir.name, 'results')
+        bench.reset(log_path, 0)
+        bench.evaluate()
+        with open(bench.log_details_path) as file:
+            details = json.loads(file.readlines()[-1].split('\t')[3])
+        self.assertGreater(details['telemetry']['duration_s'], 0)
+        self.assertIn('read_iops', details['telemetry'])
+    
+    def test_racing(self):
+        """ Test canceling slow queries when racing against best run. """
+        with open(self.query_path, 'w') as file:
+            file.write(
+                'select count(*) from t;' \
+                'with recursive c(x) as (select 1 union all ' \
+                'select x+1 from c where x < 100000000) ' \
+                'select count(*) from c;')
+        bench = OLAP(self.dbms, self.query_path, race_factor=1.0)
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        bench.min_time = 100
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertTrue(result['censored'])
+        self.assertGreaterEqual(result['time'], 90)
+        self.assertLess(result['time'], 5000)
+        self.assertEqual(self.dbms.timeout_s, 10)
+    
+    def test_streams(self):
+        """ Test running concurrent query streams over separate sessions. """
+        self.dbms.apply_config({'cache_size':'-4000'})
+        self.dbms.reconfigure()
+        bench = OLAPStreams(self.dbms, self.query_path, 3)
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        self.assertEqual(sorted(bench.orders[2]), [0, 1, 2])
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertGreater(result['throughput'], 0)
+        self.assertEqual(len(result['stream_ms']), 3)
+        self.assertEqual(len(result['latency_ms']), 3)
+        self.assertEqual(bench.max_throughput, result['throughput'])
+        session = self.dbms.open_session()
+        self.assertEqual(session.query_one('pragma cache_size'), -4000)
+        self.assertIsNot(session.connection, self.dbms.connection)
+        session.close_session()
+        self.dbms.update('drop table t')
+        result = bench.evaluate()
+        self.assertTrue(result['error'])
+
+
+class TestSimulatedOLAP(unittest.TestCase):
+    """ Test racing and repeated measurements on simulated workloads. """
+
+    def test_racing(self):
+        """ Test censoring runs that cannot beat the best run. """
+        dbms = SimulatedDBMS()
+        bench = SimulatedOLAP(dbms, race_factor=1.0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bench.reset(os.path.join(tmp_dir, 'results'), 0)
+            self._check_racing(dbms, bench)
+
+    def _check_racing(self, dbms, bench):
+        """ Checks that slower configuration is censored. """
+        def_metrics = bench.evaluate()
+        self.assertFalse(def_metrics['censored'])
+        self.assertEqual(len(def_metrics['query_ms']), 22)
+        dbms.apply_config({'random_page_cost':'100'})
+        dbms.reconfigure()
+        metrics = bench.evaluate()
+        self.assertFalse(metrics['error'])
+        self.assertTrue(metrics['censored'])
+        self.assertLess(len(metrics['query_ms']), 22)
+        self.assertGreaterEqual(metrics['time'], def_metrics['time'])
+        self.assertEqual(bench.min_time, def_metrics['time'])
+        reward = calculate_reward(metrics, def_metrics, Objective.TIME)
+        self.assertLessEqual(reward, 0)
+    
+    def test_repetitions(self):
+        """ Test repeating measurements until results are conclusive. """
+        dbms = SimulatedDBMS()
+        bench = SimulatedOLAP(dbms)
+        bench.sampler = AdaptiveSampler(10, rel_ci=0.001)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bench.reset(os.path.join(tmp_dir, 'results'), 0)
+            def_metrics = bench.evaluate()
+            self.assertEqual(def_metrics['nr_samples'], 10)
+            self.assertGreater(def_metrics['variance'], 0)
+            self.assertEqual(len(def_metrics['query_ms']), 22)
+            self.assertAlmostEqual(
+                sum(def_metrics['query_ms']), def_metrics['time'])
+            sketch = QuantileSketch.from_dict(def_metrics['latency_sketch'])
+            self.assertEqual(sketch.count, 220)
+            dbms.apply_config({
+                'shared_buffers':'2GB', 'work_mem':'256MB',
+                'random_page_cost':'1.1'})
+            dbms.reconfigure()
+            metrics = bench.evaluate()
+            self.assertLess(metrics['nr_samples'], 10)
+            reward = calculate_reward(metrics, def_metrics, Objective.TIME)
+            self.assertGreater(reward, 0)
+            self.assertEqual(calculate_reward(
+                def_metrics, def_metrics, Objective.TIME), 0)
+    
+    def test_latency_objective(self):
+        """ Test rewarding lower percentiles of query latency. """
+        dbms = SimulatedDBMS()
+        bench = SimulatedOLAP(dbms)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bench.reset(os.path.join(tmp_dir, 'results'), 0)
+            def_metrics = bench.evaluate()
+            dbms.apply_config({'shared_buffers':'2GB', 'work_mem':'256MB'})
+            dbms.reconfigure()
+            metrics = bench.evaluate()
+            for objective in [Objective.P95_LATENCY, Objective.P99_LATENCY]:
+                reward = calculate_reward(metrics, def_metrics, objective)
+                self.assertGreater(reward, 0)
+                self.assertLess(
+                    calculate_reward(def_metrics, metrics, objective), 0)
+            del metrics['latency_sketch']
+            self.assertEqual(calculate_reward(
+                metrics, def_metrics, Objective.P95_LATENCY), 0)
+    
+    def test_latency_runs(self):
+        """ Test combining query times of multiple runs for percentiles. """
+        bench = SimulatedOLAP(SimulatedDBMS())
+        self.assertTrue(uses_latency(Objective.P99_LATENCY))
+        self.assertTrue(uses_latency(Objective.TIME, {'p95_latency':1}))
+        self.assertFalse(uses_latency(Objective.TIME, {'time':1}))
+        bench.track_latency()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bench.reset(os.path.join(tmp_dir, 'results'), 0)
+            metrics = bench.evaluate()
+        self.assertEqual(metrics['nr_samples'], bench.latency_runs)
+        sketch = QuantileSketch.from_dict(metrics['latency_sketch'])
+        self.assertEqual(sketch.count, 22 * bench.latency_runs)
+
+
+if __name__ == "__main__":
+    unittest.main()
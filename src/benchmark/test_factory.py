@@ -0,0 +1,51 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.evaluate import SimulatedOLAP
+from configparser import ConfigParser
+from dbms.simulated import SimulatedDBMS
+import argparse
+import benchmark.factory
+import os
+import tempfile
+import unittest
+
+class TestFactory(unittest.TestCase):
+    """ Test configuring benchmarks from arguments and files. """
+
+    def setUp(self):
+        """ Initialize simulated benchmark. """
+        self.dbms = SimulatedDBMS()
+        self.bench = SimulatedOLAP(self.dbms)
+
+    def test_arguments(self):
+        """ Test configuring benchmark from command line arguments. """
+        parser = argparse.ArgumentParser()
+        benchmark.factory.add_arguments(parser)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'cache.json')
+            args = parser.parse_args([
+                '--eval_cache', cache_path, '--cache_max_age_s', '60',
+                '--max_samples', '3'])
+            benchmark.factory.configure(self.bench, vars(args), self.dbms)
+        self.assertEqual(self.bench.cache.max_age_s, 60)
+        self.assertIsNone(self.bench.cache.max_rel_std)
+        self.assertEqual(self.bench.sampler.max_samples, 3)
+        self.assertIsNone(self.bench.telemetry)
+
+    def test_file(self):
+        """ Test configuring benchmark from configuration file. """
+        config = ConfigParser()
+        config.read_string(
+            '[BENCHMARK]\nmax_samples = 4\nrel_ci = 0.1\ntelemetry_s = 1\n')
+        benchmark.factory.configure(self.bench, config['BENCHMARK'], self.dbms)
+        self.assertIsNone(self.bench.cache)
+        self.assertEqual(self.bench.sampler.max_samples, 4)
+        self.assertEqual(self.bench.sampler.rel_ci, 0.1)
+        self.assertEqual(self.bench.telemetry.interval_s, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.oltp import OLTP, parse_transactions, read_update_mix
+from dbms.sqlite import SQLiteConfig
+import os
+import random
+import tempfile
+import unittest
+
+script = '''
+-- transaction transfer 3
+-- param src 1 10
+-- param amount 1 100
+update accounts set balance = balance - :amount where id = :src;
+update accounts set balance = balance + :amount where id = 11 - :src;
+
+-- transaction balance 1
+-- param id 1 10
+select balance from accounts where id = :id;
+'''
+
+class TestOLTP(unittest.TestCase):
+    """ Test parsing and running weighted transaction mixes. """
+
+    def setUp(self):
+        """ Initialize SQLite database with accounts table. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.dbms = SQLiteConfig(db_path, 10)
+        self.dbms.update('create table accounts(id int, balance int)')
+        for account_id in range(1, 11):
+            self.dbms.update(f'insert into accounts values ({account_id}, 0)')
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_parse(self):
+        """ Test parsing transaction scripts and binding parameters. """
+        transactions = parse_transactions(script)
+        self.assertEqual([t.name for t in transactions], ['transfer', 'balance'])
+        self.assertEqual(transactions[0].weight, 3)
+        self.assertEqual(transactions[0].params['amount'], (1, 100))
+        self.assertEqual(len(transactions[0].statements), 2)
+        statements = transactions[0].bind(random.Random(0))
+        self.assertNotIn(':', ''.join(statements))
+        self.assertEqual(statements[0].split()[-1], statements[1].split()[-1])
+        mix = read_update_mix(4)
+        self.assertEqual(len(mix), 5)
+        self.assertEqual(sum(t.weight for t in mix), 100)
+        self.assertEqual(mix[0].params['w_id'], (1, 4))
+
+    def test_evaluate(self):
+        """ Test measuring throughput and latency of concurrent clients. """
+        bench = OLTP(self.dbms, parse_transactions(script), 2, 0.1, 0.3)
+        bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        result = bench.evaluate()
+        self.assertFalse(result['error'])
+        self.assertGreater(result['throughput'], 0)
+        self.assertLessEqual(
+            result['latency_ms']['p50'], result['latency_ms']['p99'])
+        self.assertEqual(
+            self.dbms.query_one('select sum(balance) from accounts'), 0)
+        self.dbms.update('drop table accounts')
+        result = bench.evaluate()
+        self.assertTrue(result['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.reset import (
+    CachedDump, CopyDB, DBReset, FileClone, ResetStrategy)
+from dbms.sqlite import SQLiteConfig
+import os
+import tempfile
+import unittest
+
+class FailingReset(ResetStrategy):
+    """ Strategy that is available but always fails. """
+    
+    name = 'failing'
+    
+    def available(self, dbms):
+        """ Strategy is always available. """
+        return True
+    
+    def reset(self, dbms, source_db, target_db):
+        """ Reset always fails. """
+        return False
+
+
+class FakeServer():
+    """ Server whose stop and start commands succeed as given by test. """
+    
+    def __init__(self, stops, starts):
+        """ Initialize with results of stop and start commands. """
+        self.stops = list(stops)
+        self.starts = list(starts)
+    
+    def stop_server(self, stop_cmd):
+        """ Returns next result of stop command. """
+        return self.stops.pop(0)
+    
+    def start_server(self):
+        """ Returns next result of start command. """
+        return self.starts.pop(0)
+
+
+class TestFileClone(unittest.TestCase):
+    """ Test swapping data directories without losing data. """
+    
+    def setUp(self):
+        """ Initialize snapshot and data directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_dir = os.path.join(self.tmp_dir.name, 'snapshot')
+        self.data_dir = os.path.join(self.tmp_dir.name, 'data')
+        for path, content in [
+            (self.snapshot_dir, 'snapshot'), (self.data_dir, 'live')]:
+            os.makedirs(path)
+            with open(os.path.join(path, 'file'), 'w') as file:
+                file.write(content)
+        self.clone = FileClone(self.snapshot_dir, self.data_dir, 'stop')
+    
+    def tearDown(self):
+        """ Delete temporary files. """
+        self.tmp_dir.cleanup()
+    
+    def _data(self):
+        """ Returns content of file in data directory. """
+        with open(os.path.join(self.data_dir, 'file')) as file:
+            return file.read()
+    
+    def test_reset(self):
+        """ Test replacing data directory by snapshot. """
+        self.assertTrue(self.clone.reset(FakeServer([True], [True]), '', ''))
+        self.assertEqual(self._data(), 'snapshot')
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), 
+                         ['data', 'snapshot'])
+    
+    def test_failures(self):
+        """ Test keeping or restoring data if server fails to stop or start. """
+        self.assertFalse(self.clone.reset(FakeServer([False], [True]), '', ''))
+        self.assertEqual(self._data(), 'live')
+        server = FakeServer([True, True], [False, True])
+        self.assertFalse(self.clone.reset(server, '', ''))
+        self.assertEqual(self._data(), 'live')
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), 
+                         ['data', 'snapshot'])
+
+
+class MetadataDBMS():
+    """ DBMS returning table metadata given by test. """
+    
+    def __init__(self, tables, update_time):
+        """ Initialize with tables and update time of all tables. """
+        self.tables = tables
+        self.update_time = update_time
+        self.queries = []
+    
+    def update(self, sql):
+        """ Accepts all updates. """
+        return True
+    
+    def query_all(self, sql):
+        """ Returns metadata for each table. """
+        self.queries.append(sql)
+        return [(t, '2026-10-18', self.update_time, 16384, 0, 10) 
+                for t in self.tables]
+
+
+class TestCachedDump(unittest.TestCase):
+    """ Test identifying and deleting cached dumps. """
+    
+    def setUp(self):
+        """ Initialize cache in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cached = CachedDump(cache_dir=self.tmp_dir.name)
+    
+    def tearDown(self):
+        """ Delete temporary files. """
+        self.tmp_dir.cleanup()
+    
+    def test_content_id(self):
+        """ Test that dumps are identified by table metadata. """
+        tables = ['t', 'u`v']
+        dbms = MetadataDBMS(tables, '2026-10-18')
+        content_id = self.cached._content_id(dbms, "d'b", tables)
+        self.assertIsNotNone(content_id)
+        self.assertIn("table_schema = 'd''b'", dbms.queries[0])
+        self.assertNotIn('checksum', dbms.queries[0])
+        self.assertEqual(self.cached._content_id(
+            MetadataDBMS(tables, '2026-10-18'), 'db', tables), content_id)
+        self.assertNotEqual(self.cached._content_id(
+            MetadataDBMS(tables, '2026-10-19'), 'db', tables), content_id)
+        self.assertIsNone(self.cached._content_id(
+            MetadataDBMS(['t'], '2026-10-18'), 'db', tables))
+        self.assertIsNone(self.cached._content_id(dbms, 'db', []))
+    
+    def test_invalidate(self):
+        """ Test deleting dumps of one or all template databases. """
+        for db in ['db1', 'db2']:
+            os.makedirs(os.path.join(self.tmp_dir.name, db, 'id'))
+        self.cached.invalidate('db1')
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['db2'])
+        self.cached.invalidate()
+        self.assertFalse(os.path.exists(self.tmp_dir.name))
+
+
+class TestDBReset(unittest.TestCase):
+    """ Test choosing reset strategies and falling back on failures. """
+
+    def setUp(self):
+        """ Initialize template and target SQLite databases. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp_dir.name, 'template.db')
+        self.target = os.path.join(self.tmp_dir.name, 'target.db')
+        self.dbms = SQLiteConfig(self.source, 10)
+        self.dbms.update('create table t(a int)')
+        self.dbms.update('insert into t values (1)')
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_fallback(self):
+        """ Test falling back to next strategy if reset fails. """
+        resetter = DBReset([FailingReset(), CopyDB()])
+        strategy, reset_ms = resetter.reset(self.dbms, self.source, self.target)
+        self.assertEqual(strategy, 'copy_db')
+        self.assertGreaterEqual(reset_ms, 0)
+        target = SQLiteConfig(self.target, 10)
+        self.assertEqual(target.query_one('select count(*) from t'), 1)
+        target._disconnect()
+        strategy, _ = DBReset([FailingReset()]).reset(
+            self.dbms, self.source, self.target)
+        self.assertIsNone(strategy)
+        missing = os.path.join(self.tmp_dir.name, 'missing', 'target.db')
+        strategy, _ = DBReset([CopyDB()]).reset(
+            self.dbms, self.source, missing)
+        self.assertIsNone(strategy)
+
+    def test_default(self):
+        """ Test using only strategies supported by the DBMS. """
+        resetter = DBReset.default(cache_dir=self.tmp_dir.name)
+        self.assertIsInstance(resetter.strategies[1], CachedDump)
+        available = [s.name for s in resetter.strategies 
+                     if s.available(self.dbms)]
+        self.assertEqual(available, ['copy_db'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.resources import (
+    current_pss, current_rss, PeakMemory, ResourceSampler)
+from dbms.sqlite import SQLiteConfig
+import os
+import tempfile
+import unittest
+
+class TestResources(unittest.TestCase):
+    """ Test reading resource consumption of processes and system. """
+
+    def setUp(self):
+        """ Initialize SQLite database in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.dbms = SQLiteConfig(db_path, 10)
+
+    def tearDown(self):
+        """ Close connection and delete temporary files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    @unittest.skipUnless(os.path.exists('/proc/self/status'), 'Linux only')
+    def test_rss(self):
+        """ Test reading memory consumption of current process. """
+        pid = os.getpid()
+        self.assertGreater(current_rss([pid]), 0)
+        self.assertIsNone(current_rss([]))
+
+    @unittest.skipUnless(
+        os.path.exists('/proc/self/smaps_rollup'), 'Linux only')
+    def test_pss(self):
+        """ Test sampling peak memory consumption of current process. """
+        pid = os.getpid()
+        self.assertGreater(current_pss([pid]), 0)
+        self.assertLessEqual(current_pss([pid]), current_rss([pid]))
+        self.assertIsNone(current_pss([]))
+        memory = PeakMemory([pid], 0.01)
+        memory.start()
+        data = bytearray(64 * 1024 * 1024)
+        del data
+        peak = memory.stop()
+        self.assertGreaterEqual(peak, 64 * 1024 * 1024)
+        # Peak is not monotonic over measurements
+        memory.start()
+        self.assertLess(memory.stop(), peak)
+
+    def test_sampler(self):
+        """ Test collecting telemetry while running queries. """
+        sampler = ResourceSampler(self.dbms, 0.01)
+        sampler.start()
+        self.dbms.update('create table t(a int)')
+        self.dbms.query_one('select count(*) from t')
+        telemetry = sampler.stop()
+        self.assertGreater(telemetry['duration_s'], 0)
+        self.assertIsNone(telemetry['max_rss'])
+        self.assertIsNone(telemetry['cache_hit_ratio'])
+        self.assertEqual(telemetry['counters'], {})
+        if telemetry['cpu_util'] is not None:
+            self.assertGreaterEqual(telemetry['cpu_util'], 0)
+            self.assertLessEqual(telemetry['max_cpu_util'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.sampling import AdaptiveSampler, mean_var, t_quantile
+import unittest
+
+class TestSampling(unittest.TestCase):
+    """ Test stopping criterion for repeated measurements. """
+
+    def test_mean_var(self):
+        """ Test calculating mean and sample variance. """
+        self.assertEqual(mean_var([100, 200]), (150, 5000))
+        self.assertEqual(mean_var([100]), (100, 0))
+        self.assertEqual(t_quantile(12), t_quantile(10))
+        self.assertEqual(t_quantile(100), 1.96)
+
+    def test_done(self):
+        """ Test stopping once confidence interval is tight or separated. """
+        sampler = AdaptiveSampler(5, rel_ci=0.05)
+        self.assertFalse(sampler.done([100], None))
+        self.assertTrue(sampler.done([100, 100.5], None))
+        self.assertFalse(sampler.done([100, 150], None))
+        self.assertFalse(sampler.done([100, 150], 130))
+        self.assertTrue(sampler.done([1000, 1050, 1100], 100))
+        self.assertTrue(sampler.done([100, 150, 200, 250, 300], None))
+        self.assertTrue(AdaptiveSampler(1).done([100], None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.sketch import metric_percentiles, QuantileSketch
+import json
+import random
+import unittest
+
+class TestQuantileSketch(unittest.TestCase):
+    """ Test approximating quantiles of streamed values. """
+
+    def test_quantiles(self):
+        """ Test that quantiles are within relative error bound. """
+        rng = random.Random(0)
+        values = [rng.expovariate(0.01) for _ in range(5000)]
+        sketch = QuantileSketch(0.01)
+        for value in values:
+            sketch.add(value)
+        ordered = sorted(values)
+        for fraction in [0.5, 0.95, 0.99]:
+            exact = ordered[round(fraction * len(ordered)) - 1]
+            self.assertAlmostEqual(
+                sketch.quantile(fraction), exact, delta=0.01 * exact)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+        self.assertLess(len(sketch.buckets), 1000)
+
+    def test_merge(self):
+        """ Test merging sketches and restoring them from JSON. """
+        sketch_1 = QuantileSketch()
+        sketch_2 = QuantileSketch()
+        for value in range(100):
+            sketch_1.add(value)
+            sketch_2.add(value + 100)
+        sketch_1.merge(sketch_2)
+        self.assertEqual(sketch_1.count, 200)
+        self.assertAlmostEqual(sketch_1.quantile(0.5), 99, delta=1)
+        self.assertEqual(sketch_1.quantile(0.001), 0)
+        data = json.loads(json.dumps(sketch_1.to_dict()))
+        restored = QuantileSketch.from_dict(data)
+        self.assertEqual(restored.percentiles(), sketch_1.percentiles())
+        self.assertEqual(
+            metric_percentiles({'latency_sketch':data})['p95'],
+            restored.quantile(0.95))
+        self.assertIsNone(metric_percentiles({}))
+        with self.assertRaises(ValueError):
+            sketch_1.merge(QuantileSketch(0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()
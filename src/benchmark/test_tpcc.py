@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.evaluate import Benchmark, TpcC
+from benchmark.sketch import QuantileSketch
+import contextlib
+import io
+import os
+import stat
+import time
+import tempfile
+import unittest
+
+class TestTpcC(unittest.TestCase):
+    """ Test monitoring throughput of OLTP benchmark runs. """
+
+    def setUp(self):
+        """ Create benchmark runner printing throughput periodically. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.oltp_path = self.tmp_dir.name
+        self.result_path = os.path.join(self.oltp_path, 'results')
+        os.makedirs(self.result_path)
+        self.bench = TpcC(
+            self.oltp_path, 'tpcc_config.xml', self.result_path, 
+            None, None, None, 100, monitor_s=1, rel_tolerance=0.05)
+
+    def tearDown(self):
+        """ Delete benchmark runner. """
+        self.tmp_dir.cleanup()
+
+    def _runner(self, throughputs, latencies_us=(), child_path=None):
+        """ Writes runner script that reports given throughput values. 
+        
+        The script writes transaction latencies into the raw results file.
+        If a path is given, it starts a child process (running until it is
+        stopped) and writes the child's process ID into that file.
+        """
+        path = os.path.join(self.oltp_path, 'oltpbenchmark')
+        raw_path = os.path.join(self.result_path, 'tuningtest.raw')
+        with open(path, 'w') as file:
+            file.write('#!/bin/sh\n')
+            if child_path:
+                file.write(f'sleep 1000 &\necho $! > {child_path}\n')
+            for throughput in throughputs:
+                file.write(f'echo "[INFO] Throughput: {throughput} txn/sec"\n')
+            if latencies_us:
+                file.write(
+                    'echo "Transaction Type Index,Transaction Name,' \
+                    'Start Time (microseconds),Latency (microseconds),' \
+                    f'Worker Id (start number),Phase Id" > {raw_path}\n')
+            for latency_us in latencies_us:
+                file.write(f'echo "1,NewOrder,0,{latency_us},0,0" >> {raw_path}\n')
+            if child_path:
+                file.write('wait\n')
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+    def test_stable(self):
+        """ Test stopping once throughput is stable. """
+        self._runner([50, 100, 101, 100, 101] + [100] * 50)
+        metrics = self.bench._run_benchmark({})
+        self.assertFalse(metrics['error'])
+        self.assertTrue(metrics['stopped_early'])
+        self.assertAlmostEqual(metrics['throughput'], 100.5, delta=0.5)
+        self.assertLess(metrics['nr_samples'], 10)
+        self.assertGreater(metrics['variance'], 0)
+
+    def test_worse(self):
+        """ Test stopping once throughput is clearly below best throughput. """
+        self.bench.max_throughput = 500
+        self.bench.max_config = {'a':'1'}
+        self._runner([50, 100, 150, 80, 120] + [100] * 50)
+        metrics = self.bench._run_benchmark({})
+        self.assertTrue(metrics['stopped_early'])
+        self.assertLess(metrics['nr_samples'], 10)
+
+    def test_unstable(self):
+        """ Test using all intervals if throughput does not stabilize. """
+        self._runner([10, 100, 200, 100, 200])
+        metrics = self.bench._run_benchmark({})
+        self.assertFalse(metrics['error'])
+        self.assertFalse(metrics['stopped_early'])
+        self.assertEqual(metrics['nr_samples'], 4)
+        self.assertEqual(metrics['throughput'], 150)
+
+    def test_stop_children(self):
+        """ Test stopping processes started by the benchmark script. """
+        child_path = os.path.join(self.tmp_dir.name, 'child')
+        self._runner([50, 100, 101, 100, 101] + [100] * 50, 
+                     child_path=child_path)
+        self.bench.stop_timeout_s = 5
+        metrics = self.bench._run_benchmark({})
+        self.assertTrue(metrics['stopped_early'])
+        with open(child_path) as file:
+            child_pid = int(file.read())
+        # Terminated children may remain zombies until their parent exits
+        time.sleep(0.2)
+        try:
+            with open(f'/proc/{child_pid}/stat') as file:
+                self.assertEqual(file.read().split(')')[-1].split()[0], 'Z')
+        except FileNotFoundError:
+            pass
+
+    def test_no_dbms(self):
+        """ Test evaluating without interface to configurable DBMS. """
+        self._runner([10, 100, 200, 100, 200])
+        # Database resets require a DBMS, only reset logging
+        Benchmark.reset(self.bench, os.path.join(self.tmp_dir.name, 'log'), 0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            metrics = self.bench.evaluate()
+        self.assertNotIn('Exception', output.getvalue())
+        self.assertFalse(metrics['error'])
+        self.assertEqual(metrics['restart_ms'], 0)
+    
+    def test_latencies(self):
+        """ Test reading transaction latencies from raw results. """
+        self._runner([10, 100, 200, 100, 200], range(1000, 101000, 1000))
+        metrics = self.bench._run_benchmark({})
+        sketch = QuantileSketch.from_dict(metrics['latency_sketch'])
+        self.assertEqual(sketch.count, 100)
+        self.assertAlmostEqual(sketch.quantile(0.95), 95, delta=1)
+        self._runner([10, 100, 200, 100, 200])
+        metrics = self.bench._run_benchmark({})
+        self.assertNotIn('latency_sketch', metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dataclasses import asdict, dataclass, field
+from typing import Any, Tuple
+import hashlib
+import json
+import os
+
+# Increase if catalog contents change (invalidates catalogs cached on disk)
+catalog_version = 2
+
+@dataclass
+class ParamInfo():
+    """ Describes type, unit, and admissible values of one parameter. """
+    name: str
+    vartype: str # one of bool, integer, real, enum, string
+    unit: str = '' # unit of raw values (e.g., 8kB or ms), empty if none
+    min_val: Any = None # minimal value (in given unit) or None if unknown
+    max_val: Any = None # maximal value (in given unit) or None if unknown
+    enumvals: Tuple[str, ...] = field(default_factory=tuple)
+    context: Any = None # when changes take effect, None if unknown
+    category: str = '' # group of parameter (e.g., where it is stored)
+    default: Any = None # default value (in given unit) or None if unknown
+
+
+class ParamCatalog():
+    """ Answers lookups about configuration parameters from memory. """
+
+    def __init__(self, infos, case_sensitive=True):
+        """ Initializes catalog from parameter descriptions.
+
+        Args:
+            infos: list of parameter descriptions (ParamInfo objects)
+            case_sensitive: whether parameter names are case-sensitive
+        """
+        self.case_sensitive = case_sensitive
+        self.name_to_info = {self._key(i.name):i for i in infos}
+    
+    @classmethod
+    def load(cls, path):
+        """ Loads catalog from given JSON file.
+        
+        Args:
+            path: path to file written via save()
+        
+        Returns:
+            catalog with parameters read from file
+        """
+        with open(path) as file:
+            data = json.load(file)
+        infos = []
+        for info in data['params']:
+            info['enumvals'] = tuple(info['enumvals'])
+            infos.append(ParamInfo(**info))
+        return cls(infos, data['case_sensitive'])
+
+    def __contains__(self, param):
+        """ Returns True iff the catalog contains given parameter. """
+        return self._key(param) in self.name_to_info
+
+    def __len__(self):
+        """ Returns number of parameters in catalog. """
+        return len(self.name_to_info)
+
+    def info(self, param):
+        """ Returns description of parameter or None if unknown. """
+        return self.name_to_info.get(self._key(param))
+
+    def params(self, vartypes=None, categories=None):
+        """ Returns names of parameters, optionally filtered.
+
+        Args:
+            vartypes: only return parameters of those types (if not None)
+            categories: only return parameters in those categories (if not None)
+
+        Returns:
+            list of parameter names
+        """
+        return [i.name for i in self.name_to_info.values()
+                if (vartypes is None or i.vartype in vartypes) and 
+                (categories is None or i.category in categories)]
+    
+    def save(self, path):
+        """ Writes catalog to given path as JSON file. """
+        data = {
+            'case_sensitive':self.case_sensitive, 
+            'params':[asdict(i) for i in self.name_to_info.values()]}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+
+    def _key(self, param):
+        """ Returns key under which given parameter is stored. """
+        param = str(param)
+        return param if self.case_sensitive else param.lower()
+
+
+def fingerprint(*parts):
+    """ Returns short hash identifying server version and extensions.
+    
+    Args:
+        parts: version string, installed extensions, and similar
+    
+    Returns:
+        hexadecimal hash of string representation of all parts
+    """
+    text = json.dumps([str(p) for p in parts])
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,206 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+from dbms.generic_dbms import ConfigurableDBMS
+from dbms.validation import ValueValidator
+import dataclasses
+import duckdb
+import shutil
+import threading
+
+# Tunable settings: type, range, and unit (for settings specifying sizes)
+duck_settings = [
+    ParamInfo('threads', 'integer', '', 1, None, context='user'),
+    ParamInfo('external_threads', 'integer', '', 0, None, context='user'),
+    ParamInfo('memory_limit', 'integer', 'B', 0, None, context='user'),
+    ParamInfo('temp_directory', 'string', context='user'),
+    ParamInfo('max_temp_directory_size', 'integer', 'B', 0, None,
+              context='user'),
+    ParamInfo('preserve_insertion_order', 'bool', context='user'),
+    ParamInfo('enable_object_cache', 'bool', context='user'),
+    ParamInfo('checkpoint_threshold', 'integer', 'B', 0, None,
+              context='user'),
+    ParamInfo('wal_autocheckpoint', 'integer', 'B', 0, None, context='user'),
+    ParamInfo('ordered_aggregate_threshold', 'integer', '', 1, None,
+              context='user'),
+    ParamInfo('partitioned_write_flush_threshold', 'integer', '', 1, None,
+              context='user')]
+# DuckDB units for memory sizes (scaled to bytes)
+duck_unit_groups = [
+    {'B':1, 'KB':1000, 'MB':1000**2, 'GB':1000**3, 'TB':1000**4,
+     'KiB':1024, 'MiB':1024**2, 'GiB':1024**3, 'TiB':1024**4}]
+
+class DuckDBConfig(ConfigurableDBMS):
+    """ DuckDB database running in-process, settings take effect immediately. """
+
+    def __init__(self, db, timeout_s):
+        """ Initialize connection to DuckDB database file.
+
+        Args:
+            db: path to DuckDB database file
+            timeout_s: per-query timeout in seconds
+        """
+        super().__init__(db, None, None, {}, '', '', timeout_s)
+        self.catalog = self._read_catalog()
+        self.validator = ValueValidator(
+            self.catalog, duck_unit_groups, self._can_set_on_server)
+
+    @classmethod
+    def from_file(cls, config):
+        """ Initializes DuckDB DBMS from configuration file.
+
+        Args:
+            cls: class (currently, only DuckDBConfig)
+            config: configuration read from file
+
+        Returns:
+            new DuckDB DBMS object
+        """
+        db_name = config['DATABASE']['name']
+        timeout_s = float(config['LEARNING']['timeout_s'])
+        return cls(db_name, timeout_s)
+
+    def all_params(self):
+        """ Returns names of all tuning parameters. """
+        return self.catalog.params()
+
+    def copy_db(self, source_db, target_db):
+        """ Copy source to target database file, returns success flag. """
+        try:
+            shutil.copyfile(source_db, target_db)
+            return True
+        except OSError as e:
+            print(f'Exception while copying {source_db}: {e}')
+            return False
+
+    def exec_file(self, path):
+        """ Executes all SQL queries in given file and returns error flag. """
+        try:
+            with open(path) as file:
+                sql = file.read()
+            for query in sql.split(';'):
+                if query.strip():
+                    self._execute(query)
+            error = False
+        except Exception as e:
+            error = True
+            print(f'Exception executing {path}: {e}')
+        return error
+
+    def get_value(self, param):
+        """ Returns current value for given parameter. """
+        return self.query_one(f"select current_setting('{param}')")
+
+    def is_param(self, param):
+        """ Returns True iff the given parameter can be configured. """
+        return param in self.catalog
+
+    def query_one(self, sql):
+        """ Runs SQL query and returns first result cell if it succeeds. """
+        try:
+            return self._execute(sql)[0][0]
+        except Exception:
+            return None
+
+    def update(self, sql):
+        """ Runs an SQL update and returns true iff the update succeeds. """
+        try:
+            self._execute(sql)
+            return True
+        except Exception:
+            return False
+
+    def reconfigure(self):
+        """ Settings take effect immediately - nothing to do. """
+        return True
+
+    def reset_config(self):
+        """ Reset all parameters to default values. """
+        for param in self.all_params():
+            self.update(f'reset {param}')
+        self.config = {}
+
+    def reset_param(self, param):
+        """ Reset parameter to its default value. """
+        self.update(f'reset {param}')
+        self.config.pop(param, None)
+
+    def set_param(self, param, value):
+        """ Set parameter to given value (takes effect immediately). """
+        success = self.update(f"set {param} = '{value}'")
+        if success:
+            self.config[param] = value
+        return success
+
+    def set_timeout(self, timeout_s):
+        """ Set per-query timeout. """
+        self.timeout_s = timeout_s
+
+    def _catalog_fingerprint(self):
+        """ Returns hash of DuckDB version. """
+        return fingerprint(duckdb.__version__)
+
+    def _connect(self):
+        """ Open database file and apply settings, returns success flag. """
+        print(f'Trying to connect to {self.db}')
+        try:
+            self.connection = duckdb.connect(self.db)
+            for param, value in self.config.items():
+                self._execute(f"set {param} = '{value}'")
+            return True
+        except Exception as e:
+            print(f'Exception while trying to connect to DuckDB: {e}')
+            self.connection = None
+            return False
+
+    def _disconnect(self):
+        """ Disconnect from database. """
+        if self.connection:
+            print('Disconnecting ...')
+            self.connection.close()
+            self.connection = None
+
+    def _execute(self, sql):
+        """ Executes SQL statement, interrupts it after timeout.
+
+        Args:
+            sql: SQL statement to execute
+
+        Returns:
+            all result rows
+        """
+        timer = threading.Timer(float(self.timeout_s), self.connection.interrupt)
+        timer.start()
+        try:
+            return self.connection.execute(sql).fetchall()
+        finally:
+            timer.cancel()
+
+    def _new_connection(self):
+        """ Returns new connection to open database with current settings. """
+        connection = self.connection.cursor()
+        for param, value in self.config.items():
+            connection.execute(f"set {param} = '{value}'")
+        return connection
+
+    def _probe(self):
+        """ In-process database is always ready for connections. """
+        return True
+
+    def _read_catalog(self):
+        """ Returns catalog of tunable settings supported by this version.
+        
+        Settings have their default values when the catalog is read.
+        """
+        infos = []
+        try:
+            rows = self._execute('select name, value from duckdb_settings()')
+            defaults = {name:value for name, value in rows}
+            infos = [dataclasses.replace(i, default=defaults[i.name]) 
+                     for i in duck_settings if i.name in defaults]
+        except Exception as e:
+            print(f'Exception while reading parameter catalog: {e}')
+        return ParamCatalog(infos, case_sensitive=False)
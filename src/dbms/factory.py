@@ -3,8 +3,11 @@ Created on May 12, 2021
 
 @author: immanueltrummer
 '''
+from dbms.duck import DuckDBConfig
 from dbms.postgres import PgConfig
 from dbms.mysql import MySQLconfig
+from dbms.simulated import read_model, SimulatedDBMS
+from dbms.sqlite import SQLiteConfig
 
 
 def from_file(config):
@@ -14,11 +17,17 @@ def from_file(config):
         config: parsed configuration file
         
     Return:
-        Object representing Postgres or MySQL
+        Object representing Postgres, MySQL, SQLite, DuckDB, or simulated DBMS
     """
     dbms_name = config['DATABASE']['dbms']
     if dbms_name == 'pg':
         return PgConfig.from_file(config)
+    elif dbms_name == 'sim':
+        return SimulatedDBMS.from_file(config)
+    elif dbms_name == 'sqlite':
+        return SQLiteConfig.from_file(config)
+    elif dbms_name == 'duck':
+        return DuckDBConfig.from_file(config)
     else:
         return MySQLconfig.from_file(config)
 
@@ -40,5 +49,11 @@ def from_args(args):
         return MySQLconfig(
             args.db_name, args.db_user, args.db_pwd, args.restart_cmd, 
             args.recover_cmd, args.timeout_s)
+    elif args.dbms == 'sim':
+        return SimulatedDBMS(read_model(args.sim_model), args.timeout_s)
+    elif args.dbms == 'sqlite':
+        return SQLiteConfig(args.db_name, args.timeout_s)
+    elif args.dbms == 'duck':
+        return DuckDBConfig(args.db_name, args.timeout_s)
     else:
         raise ValueError(f'DBMS {args.dbms} not supported!')
\ No newline at end of file
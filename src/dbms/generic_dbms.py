@@ -4,11 +4,29 @@ Created on Apr 2, 2021
 @author: immanueltrummer
 '''
 from abc import ABC, abstractmethod
+from dbms.catalog import catalog_version, fingerprint, ParamCatalog
 import copy
+import enum
+import os
+import time
+
+class ChangeType(enum.IntEnum):
+    """ Describes what is required to make parameter changes take effect. """
+    NONE=0, # no parameter changes
+    RELOAD=1, # reload configuration (no restart)
+    RESTART=2, # restart database server
 
 class ConfigurableDBMS(ABC):
     """ Represents a configurable database management system. """
     
+    # Give up waiting for the server after so many seconds
+    ready_timeout_s = 60
+    # Initial and maximal wait time between readiness probes
+    min_probe_wait_s = 0.05
+    max_probe_wait_s = 1.0
+    # Parameter catalogs are cached in this directory
+    catalog_dir = os.path.join(os.path.expanduser('~'), '.dbbert', 'catalogs')
+    
     def __init__(self, db, user, password, unit_to_size, 
                  restart_cmd, recovery_cmd, timeout_s):
         """ Initialize DB connection with given credentials. 
@@ -30,8 +48,12 @@ class ConfigurableDBMS(ABC):
         self.recovery_cmd = recovery_cmd
         self.timeout_s = timeout_s
         self.config = {}
+        self.pending = set()
+        self.catalog = ParamCatalog([])
+        self.validator = None
         self.failed_connections = 0
         self.connection = None
+        self.restart_ms = 0.0
         self._connect()
         
     def __del__(self):
@@ -42,34 +64,156 @@ class ConfigurableDBMS(ABC):
         """ Returns names of all tuning parameters. """
         pass
     
+    def apply_config(self, config):
+        """ Apply given configuration, only changing parameters as needed.
+        
+        Compares target configuration to the current configuration and
+        only sets or resets parameters whose values differ. If setting a
+        parameter fails, it is reset to its default value. Changes take
+        effect after calling reconfigure().
+        
+        Args:
+            config: maps parameters to values (others use default values)
+        
+        Returns:
+            change type (i.e., whether reload or restart is required)
+        """
+        for param in list(self.config.keys()):
+            if param not in config:
+                self.reset_param(param)
+        for param, value in config.items():
+            trans_value = self._transform_val(param, value)
+            if self.config.get(param) != trans_value:
+                success = self.set_param(param, trans_value)
+                if not success and param in self.config:
+                    self.reset_param(param)
+        change = self.pending_change()
+        print(f'Changed parameters: {self.pending} ({change.name})')
+        return change
+    
     def can_query(self, sql):
         """ Returns True iff the query_one can be executed. """
         return True if self.query_one(sql) else False
     
     def can_set(self, param, value):
         """ Returns True iff we can set parameter to value. """
-        current_value = self.get_value(param)
-        # Try setting to new value
-        try:
-            valid = self.set_param_smart(param, value)
-            self.set_param_smart(param, current_value)
-            return valid
-        except Exception:
-            return False
+        if self.validator:
+            trans_value = self._transform_val(param, value)
+            return self.validator.can_set(param, trans_value)
+        else:
+            return self._can_set_on_server(param, value)
+    
+    def canonical_config(self, config):
+        """ Returns configuration in canonical form (e.g., as cache key).
+        
+        Values are converted into the unit of their parameter (if possible),
+        parameters set to their default value are dropped, and parameters
+        are sorted by name.
+        
+        Args:
+            config: maps parameters to (transformed) values, see changed()
+        
+        Returns:
+            dictionary mapping parameters to normalized values
+        """
+        canonical = {}
+        for param, value in config.items():
+            value = str(value)
+            info = self.param_info(param)
+            if info is not None and self.validator:
+                value = self.validator.normalize(param, value)
+                if info.default is not None and value == \
+                    self.validator.normalize(param, info.default):
+                    continue
+                param = info.name
+            canonical[param] = value
+        return dict(sorted(canonical.items()))
+    
+    def cache_hit_ratio(self, counters):
+        """ Returns buffer cache hit ratio (None if unknown).
+        
+        Args:
+            counters: deltas of statistics counters (see stat_counters)
+        """
+        return None
     
     def changed(self):
         """ Return assignments for all changed parameters. """
         return copy.deepcopy(self.config)
     
+    def configured_memory(self):
+        """ Returns total size of memory parameters in bytes.
+        
+        Parameters without value in the current configuration count with
+        their default value.
+        
+        Returns:
+            sum of memory parameters in bytes (None if unknown)
+        """
+        params = self.memory_params()
+        if not params or self.validator is None:
+            return None
+        changed = {}
+        for param, value in self.config.items():
+            info = self.param_info(param)
+            if info is not None:
+                changed[info.name] = value
+        total = 0
+        for param in params:
+            info = self.param_info(param)
+            value = changed.get(info.name, info.default)
+            nr_bytes = self.validator.base_value(param, value)
+            if nr_bytes is not None and nr_bytes > 0:
+                total += nr_bytes
+        return total
+    
     @abstractmethod
     def copy_db(self, source_db, target_db):
-        """ Copy source to target database (overriding target). """
+        """ Copy source to target database (overriding target).
+        
+        Returns:
+            True iff target database was copied successfully
+        """
         pass
   
     @abstractmethod
     def exec_file(self, path):
         """ Executes all SQL queries in given file and returns error flag. """
-        pass            
+        pass
+    
+    def column_values(self, column, tables=None):
+        """ Returns frequent values of column (e.g., from optimizer statistics).
+        
+        Args:
+            column: name of column (without table name)
+            tables: only consider columns of those tables (all tables if None)
+        
+        Returns:
+            list of values (as strings), empty if unknown
+        """
+        return []
+    
+    def exec_query(self, sql):
+        """ Executes one SQL query to completion and returns error flag. """
+        return not self.update(sql)
+    
+    def exec_transaction(self, statements):
+        """ Executes SQL statements as one transaction.
+        
+        Args:
+            statements: list of SQL statements
+        
+        Returns:
+            True iff transaction was committed
+        """
+        if not self.update('begin'):
+            return False
+        for sql in statements:
+            if self.exec_query(sql):
+                self.update('rollback')
+                return False
+        return self.update('commit')
+    
     @abstractmethod
     def get_value(self, param):
         """ Returns current value for given parameter. """
@@ -80,6 +224,91 @@ class ConfigurableDBMS(ABC):
         """ Returns True iff the given parameter can be configured. """
         pass
 
+    def memory_params(self):
+        """ Returns names of parameters allocating memory (in bytes). """
+        return []
+
+    def open_session(self):
+        """ Returns copy of this object with a separate connection.
+        
+        Sessions use the current configuration and allow running queries
+        concurrently (e.g., one session per thread). Parameters must be
+        changed via the original object. Sessions should be closed by the
+        thread that opened them (see close_session).
+        
+        Returns:
+            DBMS object with new connection or None if connecting fails
+            (or if the DBMS does not support multiple sessions)
+        """
+        session = copy.copy(self)
+        session.connection = None
+        try:
+            session.connection = self._new_connection()
+            if session.connection is None:
+                print(f'{type(self).__name__} does not support sessions')
+                return None
+            session.set_timeout(self.timeout_s)
+            return session
+        except Exception as e:
+            print(f'Exception while opening session: {e}')
+            return None
+    
+    def close_session(self):
+        """ Closes connection of session (see open_session). """
+        self._disconnect()
+        self.connection = None
+    
+    def param_info(self, param):
+        """ Returns description (e.g., type) of parameter or None. """
+        return self.catalog.info(param)
+
+    def plan_params(self):
+        """ Returns names of parameters that only influence query plans. """
+        return set()
+    
+    def plan_features(self, query):
+        """ Returns features of the plan chosen by the optimizer for query.
+        
+        Args:
+            query: SQL query to explain
+        
+        Returns:
+            dictionary with counts of plan node types ('nodes'), estimated
+            number of result rows ('rows'), and estimated cost ('cost'),
+            None if plans are unavailable
+        """
+        return None
+    
+    def plan_fingerprints(self, queries):
+        """ Returns fingerprints of query plans under current configuration.
+        
+        Plans are obtained via EXPLAIN in a new session, parameters are
+        applied at session level. Hence, configurations can be screened
+        before calling reconfigure() (see apply_config).
+        
+        Args:
+            queries: list of SQL queries
+        
+        Returns:
+            list with one plan fingerprint per query or None if unavailable
+        """
+        if not self.plan_params():
+            return None
+        session = self.open_session()
+        if session is None:
+            return None
+        fingerprints = None
+        if session._apply_to_session():
+            plans = [session._explain(q) for q in queries]
+            if None not in plans:
+                fingerprints = [fingerprint(p) for p in plans]
+        session.close_session()
+        return fingerprints
+    
+    def pending_change(self):
+        """ Returns what is needed to apply changes since last reconfiguration. """
+        return ChangeType.RESTART if self.pending else ChangeType.NONE
+
     @abstractmethod
     def query_one(self, sql):
         """ Runs SQL query_one and returns one result if query_one succeeds. """
@@ -104,24 +333,102 @@ class ConfigurableDBMS(ABC):
         """ Reset all parameters to default values. """
         pass
     
+    @abstractmethod
+    def reset_param(self, param):
+        """ Reset parameter to its default value. """
+        pass
+    
     @abstractmethod
     def set_param(self, param, value):
         """ Set parameter to scaled value (exactly). """
         pass
 
+    def restart_latency(self):
+        """ Returns restart (or reload) time since last call in milliseconds. """
+        restart_ms = self.restart_ms
+        self.restart_ms = 0.0
+        return restart_ms
+
+    def stat_counters(self):
+        """ Returns cumulative statistics counters of DBMS (e.g., reads). """
+        return {}
+
+    def top_statements(self, nr_statements):
+        """ Returns read-only statements with highest total execution time.
+        
+        Statements are taken from statistics collected by the server (e.g.,
+        pg_stat_statements). Their text may contain placeholders for
+        constants (e.g., "$1").
+        
+        Args:
+            nr_statements: return at most that many statements
+        
+        Returns:
+            list of tuples: statement text, number of calls, and total time 
+                in milliseconds (empty if statistics are unavailable)
+        """
+        return []
+
+    def version_id(self):
+        """ Returns hash of DBMS version and extensions (None if unknown). """
+        return self._catalog_fingerprint()
+
+    def server_pids(self):
+        """ Returns IDs of database server processes on this machine. """
+        return []
+
     def set_param_smart(self, param, value):
         """ Set parameter to value, using simple transformations. """
-        trans_value = self._transform_val(value)
+        trans_value = self._transform_val(param, value)
         #print(f'set_param_smart: Trying to set {param} to {trans_value}')
         success = self.set_param(param, trans_value)
         #print(f'set_param_smart: {success}')
         return success
     
+    def start_server(self):
+        """ Restarts server, reconnects, and applies configuration again.
+        
+        Server files may have been replaced while the server was stopped
+        (see stop_server). Hence, all parameter changes of the current
+        configuration are applied again, starting from default values.
+        
+        Returns:
+            True iff the server runs with the current configuration
+        """
+        config = self.changed()
+        ready = self._restart_server() and self._connect()
+        if ready:
+            self.config = {}
+            self.apply_config(config)
+            ready = self.reconfigure()
+        return ready
+    
+    def stop_server(self, stop_cmd):
+        """ Disconnects, stops server, and waits until it stops answering.
+        
+        Args:
+            stop_cmd: command for stopping database server
+        
+        Returns:
+            True iff stop command succeeded and server stopped in time
+        """
+        self._disconnect()
+        exit_code = os.system(stop_cmd)
+        if exit_code != 0:
+            print(f'Stop command "{stop_cmd}" failed ({exit_code})')
+            return False
+        return self._wait_until_stopped()
+    
     @abstractmethod
     def set_timeout(self, timeout_s):
         """ Set per-query timeout. """
         pass
                 
+    @abstractmethod
+    def _probe(self):
+        """ Returns True iff the server currently accepts connections. """
+        pass
+                
     @abstractmethod    
     def _connect(self):
         """ Establish connection to database, returns success flag. """
@@ -131,11 +438,180 @@ class ConfigurableDBMS(ABC):
     def _disconnect(self):
         """ Disconnect from database. """
         pass
+    
+    def _apply_to_session(self):
+        """ Applies configuration to session, returns success flag.
+        
+        New sessions use the current configuration by default.
+        """
+        return True
+    
+    def _explain(self, query):
+        """ Returns description of query plan (None if unavailable). """
+        return None
+    
+    def _new_connection(self):
+        """ Returns new connection to database (None if unsupported). """
+        return None
             
-    def _transform_val(self, value: str):
-        """ Transforms parameter values using heuristic. """
+    def _cached_catalog(self, dbms_name):
+        """ Loads parameter catalog from disk or reads it from the server.
+        
+        Catalogs are stored per server version and set of extensions.
+        Hence, the catalog is refreshed if either of them changes.
+        
+        Args:
+            dbms_name: short name of DBMS (used in file name)
+        
+        Returns:
+            catalog describing all parameters
+        """
+        fingerprint = self._catalog_fingerprint()
+        if fingerprint is None:
+            return self._read_catalog()
+        file_name = f'{dbms_name}_v{catalog_version}_{fingerprint}.json'
+        path = os.path.join(self.catalog_dir, file_name)
+        if os.path.exists(path):
+            try:
+                catalog = ParamCatalog.load(path)
+                print(f'Loaded catalog of {len(catalog)} parameters from {path}')
+                return catalog
+            except Exception as e:
+                print(f'Exception while loading catalog from {path}: {e}')
+        catalog = self._read_catalog()
+        if catalog:
+            try:
+                catalog.save(path)
+                print(f'Stored catalog of {len(catalog)} parameters at {path}')
+            except OSError as e:
+                print(f'Exception while storing catalog at {path}: {e}')
+        return catalog
+    
+    def _catalog_fingerprint(self):
+        """ Returns hash of server version and extensions (None if unknown). """
+        return None
+    
+    def _read_catalog(self):
+        """ Reads catalog of all tuning parameters from the server. """
+        return ParamCatalog([])
+    
+    def _can_set_on_server(self, param, value):
+        """ Try setting parameter to value on server, then restore it. 
+        
+        Args:
+            param: name of parameter
+            value: try setting parameter to this value
+        
+        Returns:
+            True iff the server accepted the value
+        """
+        config = self.config.copy()
+        pending = self.pending.copy()
+        current_value = self.get_value(param)
+        # Try setting to new value
+        try:
+            valid = self.set_param_smart(param, value)
+            self.set_param_smart(param, current_value)
+        except Exception:
+            valid = False
+        self.config = config
+        self.pending = pending
+        return valid
+            
+    def _restart_server(self):
+        """ Runs restart command and waits until server is ready.
+        
+        The time until the server accepts connections again is added
+        to the restart latency (reported with benchmark evaluations).
+        
+        Returns:
+            True iff server accepts connections before the deadline
+        """
+        start_s = time.time()
+        os.system(self.restart_cmd)
+        ready = self._wait_until_ready()
+        restart_ms = (time.time() - start_s) * 1000.0
+        self.restart_ms += restart_ms
+        print(f'Restart took {restart_ms} ms (ready: {ready})')
+        return ready
+            
+    def _wait_until_ready(self):
+        """ Polls server with exponential backoff until it is ready.
+        
+        Returns:
+            True iff server accepts connections before the deadline
+        """
+        deadline_s = time.time() + self.ready_timeout_s
+        wait_s = self.min_probe_wait_s
+        while not self._probe():
+            remaining_s = deadline_s - time.time()
+            if remaining_s <= 0:
+                print(f'Server not ready after {self.ready_timeout_s} seconds')
+                return False
+            time.sleep(min(wait_s, remaining_s))
+            wait_s = min(2 * wait_s, self.max_probe_wait_s)
+        return True
+            
+    def _wait_until_stopped(self):
+        """ Polls server with exponential backoff until it stops answering.
+        
+        Returns:
+            True iff server rejects connections before the deadline
+        """
+        deadline_s = time.time() + self.ready_timeout_s
+        wait_s = self.min_probe_wait_s
+        while self._probe():
+            remaining_s = deadline_s - time.time()
+            if remaining_s <= 0:
+                print(f'Server still running after {self.ready_timeout_s} seconds')
+                return False
+            time.sleep(min(wait_s, remaining_s))
+            wait_s = min(2 * wait_s, self.max_probe_wait_s)
+        return True
+            
+    def _transform_val(self, param, value: str):
+        """ Transforms parameter values using heuristic (e.g., size units). """
         value = str(value)
         for unit in self.unit_to_size:
             size = self.unit_to_size[unit]
             value = value.replace(unit, size)
-        return value
\ No newline at end of file
+        return value
+
+
+def plan_nodes(plan, key):
+    """ Counts values of key in nested plan description (e.g., node types).
+    
+    Args:
+        plan: query plan, given as nested dictionaries and lists
+        key: count values of this key (in all nested dictionaries)
+    
+    Returns:
+        dictionary mapping (string) values to their number of occurrences
+    """
+    counts = {}
+    for value in plan_values(plan, key):
+        if isinstance(value, str):
+            counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def plan_values(plan, key):
+    """ Returns all values of key in nested plan description.
+    
+    Args:
+        plan: query plan, given as nested dictionaries and lists
+        key: collect values of this key (in all nested dictionaries)
+    
+    Returns:
+        list of values (in depth-first order)
+    """
+    values = []
+    if isinstance(plan, dict):
+        for k, v in plan.items():
+            if k == key:
+                values.append(v)
+            values += plan_values(v, key)
+    elif isinstance(plan, list):
+        for v in plan:
+            values += plan_values(v, key)
+    return values
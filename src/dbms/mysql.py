@@ -3,13 +3,24 @@ Created on Apr 7, 2021
 
 @author: immanueltrummer
 '''
-from dbms.generic_dbms import ConfigurableDBMS
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+from dbms.generic_dbms import (
+    ChangeType, ConfigurableDBMS, plan_nodes, plan_values)
+from dbms.validation import ValueValidator
 
+import json
 import mysql.connector
 import os
 from parameters.util import is_numerical
 import time
 
+# Suffixes of global variables allocating memory (in bytes)
+mysql_memory_suffixes = ('_buffer_size', '_buffer_pool_size', '_cache_size')
+# Global variables that only influence plans (take effect in new sessions)
+mysql_plan_params = [
+    'optimizer_prune_level', 'optimizer_search_depth',
+    'eq_range_index_dive_limit']
+
 class MySQLconfig(ConfigurableDBMS):
     """ Represents configurable MySQL database. """
     
@@ -29,12 +40,13 @@ class MySQLconfig(ConfigurableDBMS):
                       'K':'000', 'M':'000000', 'G':'000000000'}
         super().__init__(db, user, password, unit_to_size, 
                          restart_cmd, recovery_cmd, timeout_s)
-        self.global_vars = [t[0] for t in self.query_all(
-            'show global variables') if is_numerical(t[1])]
-        self.server_cost_params = [t[0] for t in self.query_all(
-            'select cost_name from mysql.server_cost')]
-        self.engine_cost_params = [t[0] for t in self.query_all(
-            'select cost_name from mysql.engine_cost')]
+        self.catalog = self._cached_catalog('ms')
+        self._record_startup_values()
+        self.global_vars = self.catalog.params(categories=['global'])
+        self.server_cost_params = self.catalog.params(
+            categories=['server_cost'])
+        self.engine_cost_params = self.catalog.params(
+            categories=['engine_cost'])
         self.all_variables = self.global_vars + \
             self.server_cost_params + self.engine_cost_params
             
@@ -42,6 +54,8 @@ class MySQLconfig(ConfigurableDBMS):
         print(f'Server cost parameters: {self.server_cost_params}')
         print(f'Engine cost parameters: {self.engine_cost_params}')
         print(f'All parameters: {self.all_variables}')
+        self.validator = ValueValidator(
+            self.catalog, [], self._can_set_on_server)
         
     @classmethod
     def from_file(cls, config):
@@ -68,17 +82,21 @@ class MySQLconfig(ConfigurableDBMS):
         super().__del__()
         
     def copy_db(self, source_db, target_db):
-        """ Copy source to target database. """
+        """ Copy source to target database, returns success flag. """
         ms_clc_prefix = f'mysql -u{self.user} -p{self.password} '
         ms_dump_prefix = f'mysqldump -u{self.user} -p{self.password} '
-        os.system(ms_dump_prefix + f' {source_db} > copy_db_dump')
+        if os.system(ms_dump_prefix + f' {source_db} > copy_db_dump') != 0:
+            return False
         print('Dumped old database')
         os.system(ms_clc_prefix + f" -e 'drop database if exists {target_db}'")
         print('Dropped old database')
-        os.system(ms_clc_prefix + f" -e 'create database {target_db}'")
+        if os.system(ms_clc_prefix + f" -e 'create database {target_db}'") != 0:
+            return False
         print('Created new database')
-        os.system(ms_clc_prefix + f" {target_db} < copy_db_dump")
+        if os.system(ms_clc_prefix + f" {target_db} < copy_db_dump") != 0:
+            return False
         print('Initialized new database')
+        return True
             
     def _connect(self):
         """ Establish connection to database, returns success flag. 
@@ -89,9 +107,7 @@ class MySQLconfig(ConfigurableDBMS):
         print(f'Trying to connect to {self.db} with user {self.user}')
         # Need to recover in case of bad configuration
         try:
-            self.connection = mysql.connector.connect(
-                database=self.db, user=self.user, 
-                password=self.password, host="localhost")
+            self.connection = self._new_connection()
             self.set_timeout(self.timeout_s)
             self.failed_connections = 0
             return True
@@ -102,7 +118,7 @@ class MySQLconfig(ConfigurableDBMS):
             if self.failed_connections < 3:
                 print(f'Trying recovery with "{self.recovery_cmd}" ...')
                 os.system(self.recovery_cmd)
-                os.system(self.restart_cmd)            
+                self._restart_server()
                 self.reset_config()
                 self.reconfigure()
             return False
@@ -113,6 +129,78 @@ class MySQLconfig(ConfigurableDBMS):
             print('Disconnecting ...')
             self.connection.close()
     
+    def _category(self, param):
+        """ Returns category of parameter (global variable or cost table). """
+        info = self.catalog.info(param)
+        return info.category if info else None
+    
+    def _catalog_fingerprint(self):
+        """ Returns hash of server version and active plugins. """
+        version = self.query_one('select @@version')
+        plugins = self.query_all(
+            'select plugin_name, plugin_version from information_schema.plugins ' \
+            "where plugin_status = 'ACTIVE' order by plugin_name")
+        if version is None or plugins is None:
+            return None
+        return fingerprint(version, plugins)
+    
+    def _record_startup_values(self):
+        """ Stores current values of global variables as their defaults.
+        
+        Called while global variables have their startup values (i.e.,
+        values from option files such as my.cnf or compiled-in defaults).
+        Parameters are reset to those values, as after a restart.
+        """
+        rows = self.query_all('show global variables')
+        for name, value in rows or []:
+            info = self.catalog.info(name)
+            if info is not None and info.category == 'global':
+                info.default = value
+    
+    def _read_catalog(self):
+        """ Returns catalog describing all tuning parameters. 
+        
+        Global variables are integer-valued unless their current value 
+        contains a decimal point. We do not store value ranges since 
+        MySQL clamps out-of-range values instead of rejecting them. It
+        is unknown whether global variables are dynamic (context None),
+        the validator verifies this on the server once per variable.
+        Parameters are omitted if reading them fails (e.g., if reading 
+        cost tables is not permitted).
+        """
+        infos = []
+        for name, value in self.query_all('show global variables') or []:
+            if is_numerical(value):
+                vartype = 'real' if '.' in str(value) else 'integer'
+                infos.append(ParamInfo(
+                    name=name, vartype=vartype, category='global'))
+        for table in ['server_cost', 'engine_cost']:
+            rows = self.query_all(f'select cost_name from mysql.{table}')
+            for (name,) in rows or []:
+                infos.append(ParamInfo(
+                    name=name, vartype='real', 
+                    context='dynamic', category=table))
+        return ParamCatalog(infos)
+    
+    def _new_connection(self):
+        """ Returns new connection to MySQL database. """
+        return mysql.connector.connect(
+            database=self.db, user=self.user, 
+            password=self.password, host="localhost")
+    
+    def _probe(self):
+        """ Returns True iff MySQL accepts connections and answers a ping. """
+        try:
+            connection = mysql.connector.connect(
+                database=self.db, user=self.user, 
+                password=self.password, host="localhost",
+                connection_timeout=1)
+            connection.ping()
+            connection.close()
+            return True
+        except Exception:
+            return False
+    
     def exec_file(self, path):
         """ Executes all SQL queries in given file and returns error flag. """
         try:
@@ -150,6 +238,24 @@ class MySQLconfig(ConfigurableDBMS):
             print(f'Exception in mysql.query_all: {e}')
             return None
     
+    def exec_transaction(self, statements):
+        """ Executes SQL statements as one transaction, returns success flag. """
+        cursor = self.connection.cursor(buffered=True)
+        try:
+            self.connection.start_transaction()
+            for sql in statements:
+                cursor.execute(sql)
+            self.connection.commit()
+            success = True
+        except Exception:
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            success = False
+        cursor.close()
+        return success
+    
     def update(self, sql):
         """ Runs an SQL update and returns true iff the update succeeds. """
         #print(f'Trying update {sql}')
@@ -166,18 +272,19 @@ class MySQLconfig(ConfigurableDBMS):
     
     def is_param(self, param):
         """ Returns True iff the given parameter can be configured. """
-        return param in self.all_variables
+        return param in self.catalog
     
     def get_value(self, param):
         """ Returns current value for given parameter. """
-        if param in self.global_vars:
+        category = self._category(param)
+        if category == 'global':
             return self.query_one(f'select @@{param}')
-        elif param in self.server_cost_params:
+        elif category == 'server_cost':
             return self.query_one(
                 "select case when cost_value is NULL then default_value " \
                 "else cost_value end from mysql.server_cost " \
                 f"where cost_name='{param}'")
-        elif param in self.engine_cost_params:
+        elif category == 'engine_cost':
             return self.query_one(
                 "select case when cost_value is NULL then default_value " \
                 "else cost_value end from mysql.engine_cost " \
@@ -187,20 +294,36 @@ class MySQLconfig(ConfigurableDBMS):
     
     def set_param(self, param, value):
         """ Set parameter to given value. """
-        if param in self.global_vars:
+        category = self._category(param)
+        if category == 'global':
             success = self.update(f'set global {param}={value}')
-        elif param in self.server_cost_params:
+        elif category == 'server_cost':
             success = self.update(
                 f"update mysql.server_cost set cost_value={value} where cost_name='{param}'")
-        elif param in self.engine_cost_params:
+        elif category == 'engine_cost':
             success = self.update(
                 f"update mysql.engine_cost set cost_value={value} where cost_name='{param}'")
         else: 
             success = False
         if success:
             self.config[param] = value
+            self.pending.add(param)
         return success
     
+    def reset_param(self, param):
+        """ Reset parameter to its startup value (compiled-in default if unknown). """
+        category = self._category(param)
+        if category == 'global':
+            default = self.catalog.info(param).default
+            if default is None:
+                default = 'DEFAULT'
+            self.update(f'set global {param}={default}')
+        elif category in ['server_cost', 'engine_cost']:
+            self.update(
+                f"update mysql.{category} set cost_value=NULL where cost_name='{param}'")
+        self.config.pop(param, None)
+        self.pending.add(param)
+    
     def set_timeout(self, timeout_s):
         """ Set per-query timeout. """
         timeout_ms = int(timeout_s * 1000)
@@ -213,12 +336,14 @@ class MySQLconfig(ConfigurableDBMS):
     def reset_config(self):
         """ Reset all parameters to default values. """
         self._disconnect()
-        os.system(self.restart_cmd)
-        time.sleep(2)
+        self._restart_server()
         self._connect()
+        self._record_startup_values()
         self.update('update mysql.server_cost set cost_value = NULL')
         self.update('update mysql.engine_cost set cost_value = NULL')
         self.config = {}
+        # Need to flush cost parameters (global variables were reset)
+        self.pending = set(self.server_cost_params + self.engine_cost_params)
     
     def reconfigure(self):
         """ Makes all parameter changes take effect (may require restart). 
@@ -226,9 +351,106 @@ class MySQLconfig(ConfigurableDBMS):
         Returns:
             Whether reconfiguration was successful
         """
+        if self.pending_change() == ChangeType.NONE:
+            return True
         # Optimizer cost parameters requires flush and reconnect
+        start_s = time.time()
         self.update('flush optimizer_costs')
         self._disconnect()
         self._connect()
+        self.restart_ms += (time.time() - start_s) * 1000.0
+        self.pending = set()
         # Currently, we consider no MySQL parameters requiring restart
-        return True
\ No newline at end of file
+        return True
+    
+    def pending_change(self):
+        """ Returns what is needed to apply changes since last reconfiguration. 
+        
+        Global variables take effect for new sessions, optimizer cost 
+        parameters after a flush. Hence, reconnecting is sufficient.
+        """
+        return ChangeType.RELOAD if self.pending else ChangeType.NONE
+    
+    def cache_hit_ratio(self, counters):
+        """ Returns fraction of InnoDB reads served by the buffer pool. """
+        requests = counters.get('innodb_buffer_pool_read_requests', 0)
+        misses = counters.get('innodb_buffer_pool_reads', 0)
+        return (requests - misses) / requests if requests > 0 else None
+    
+    def memory_params(self):
+        """ Returns global variables for buffer and cache sizes. """
+        return [p for p in self.catalog.params(categories=['global'])
+                if p.endswith(mysql_memory_suffixes)]
+    
+    def plan_features(self, query):
+        """ Returns table access types, examined rows, and cost of plan.
+        
+        Rows are summed over all tables, hence they describe the amount of
+        data processed rather than the result size.
+        """
+        result = self.query_one(f'explain format=json {query}')
+        try:
+            plan = json.loads(result)
+            rows = sum(float(r) for r in 
+                       plan_values(plan, 'rows_examined_per_scan'))
+            return {
+                'nodes': plan_nodes(plan, 'access_type'), 'rows': rows,
+                'cost': float(plan['query_block']['cost_info']['query_cost'])}
+        except (TypeError, KeyError, ValueError):
+            return None
+    
+    def plan_params(self):
+        """ Returns optimizer variables that only influence query plans.
+        
+        Optimizer cost parameters take effect after a flush only (see 
+        reconfigure) and are therefore not screened via plans.
+        """
+        return {p for p in mysql_plan_params if p in self.catalog}
+    
+    def _explain(self, query):
+        """ Returns rows describing query plan or None if EXPLAIN fails. """
+        return self.query_all(f'explain {query}')
+    
+    def top_statements(self, nr_statements):
+        """ Returns top SELECT statements of current database from the
+        statement digests of performance_schema.
+        
+        Digests replace constants by placeholders that cannot be bound
+        (MySQL keeps no statistics on column values). Hence, statements
+        are represented by the sample query stored with each digest and
+        digests without sample are skipped (samples require MySQL 8.0.3).
+        """
+        rows = self.query_all(
+            'select query_sample_text, count_star, sum_timer_wait ' \
+            'from performance_schema.events_statements_summary_by_digest ' \
+            f"where schema_name = '{self.db}' " \
+            "and digest_text like 'SELECT%' " \
+            "and digest_text not like '%performance_schema%' " \
+            "and digest_text not like '%information_schema%' " \
+            f'order by sum_timer_wait desc limit {int(nr_statements)}')
+        # Timer values are measured in picoseconds
+        return [(q, int(c), float(t) / 1e9) for q, c, t in rows or [] if q]
+    
+    def server_pids(self):
+        """ Returns ID of server process, read from its PID file. """
+        pid_file = self.query_one('select @@pid_file')
+        try:
+            with open(pid_file) as file:
+                return [int(file.read().strip())]
+        except (OSError, TypeError, ValueError):
+            return []
+    
+    def stat_counters(self):
+        """ Returns numerical InnoDB status counters (buffer pool, I/O, log). """
+        rows = self.query_all(
+            "show global status " \
+            "where variable_name like 'Innodb_buffer_pool_%' " \
+            "or variable_name like 'Innodb_data_%' " \
+            "or variable_name like 'Innodb_os_log_%' " \
+            "or variable_name like 'Innodb_pages_%'")
+        counters = {}
+        for name, value in rows or []:
+            if is_numerical(value):
+                counters[name.lower()] = float(value)
+        return counters
+
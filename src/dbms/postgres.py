@@ -3,7 +3,9 @@ Created on Apr 2, 2021
 
 @author: immanueltrummer
 '''
-from dbms.generic_dbms import ConfigurableDBMS
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+from dbms.generic_dbms import ChangeType, ConfigurableDBMS, plan_nodes
+from dbms.validation import pg_unit_groups, ValueValidator
 import os
 import psycopg2
 import time
@@ -27,6 +29,10 @@ class PgConfig(ConfigurableDBMS):
                       'K':'kB', 'M':'000kB', 'G':'000000kB'}
         super().__init__(db, user, password, unit_to_size, 
                          restart_cmd, recovery_cmd, timeout_s)
+        self.catalog = self._cached_catalog('pg')
+        if self.catalog:
+            self.validator = ValueValidator(
+                self.catalog, pg_unit_groups, self._can_set_on_server)
         
     @classmethod
     def from_file(cls, config):
@@ -53,9 +59,10 @@ class PgConfig(ConfigurableDBMS):
         super().__del__()
         
     def copy_db(self, source_db, target_db):
-        """ Copy source to target database. """
+        """ Copy source to target database, returns success flag. """
         self.update(f'drop database if exists {target_db}')
-        self.update(f'create database {target_db} with template {source_db}')
+        return self.update(
+            f'create database {target_db} with template {source_db}')
             
     def _connect(self):
         """ Establish connection to database, returns success flag. 
@@ -66,9 +73,7 @@ class PgConfig(ConfigurableDBMS):
         print(f'Trying to connect to {self.db} with user {self.user}')
         # Need to recover in case of bad configuration
         try:            
-            self.connection = psycopg2.connect(
-                database = self.db, user = self.user, 
-                password = self.password, host = "localhost")
+            self.connection = self._new_connection()
             self.set_timeout(self.timeout_s)
             self.failed_connections = 0
             return True
@@ -80,7 +85,7 @@ class PgConfig(ConfigurableDBMS):
             if self.failed_connections < 3:
                 print(f'Trying recovery with "{self.recovery_cmd}" ...')
                 os.system(self.recovery_cmd)
-                self.reconfigure()
+                self._restart()
             return False
         
     def _disconnect(self):
@@ -88,15 +93,28 @@ class PgConfig(ConfigurableDBMS):
         if self.connection:
             print('Disconnecting ...')
             self.connection.close()
+    
+    def _new_connection(self):
+        """ Returns new connection to Postgres database. """
+        return psycopg2.connect(
+            database = self.db, user = self.user, 
+            password = self.password, host = "localhost")
+    
+    def _probe(self):
+        """ Returns True iff Postgres accepts connections (like pg_isready). """
+        try:
+            connection = psycopg2.connect(
+                database = self.db, user = self.user, 
+                password = self.password, host = "localhost",
+                connect_timeout = 1)
+            connection.close()
+            return True
+        except Exception:
+            return False
 
     def all_params(self):
         """ Return names of all tuning parameters. """
-        cursor = self.connection.cursor()
-        cursor.execute("select name from pg_settings " \
-                       "where vartype in ('bool', 'integer', 'real')")
-        var_vals = cursor.fetchall()
-        cursor.close()
-        return [v[0] for v in var_vals]
+        return self.catalog.params(['bool', 'integer', 'real'])
                         
     def exec_file(self, path):
         """ Executes all SQL queries in given file and returns error flag. """
@@ -123,6 +141,45 @@ class PgConfig(ConfigurableDBMS):
         except Exception:
             return None
          
+    def column_values(self, column, tables=None):
+        """ Returns most common values and histogram bounds from pg_stats. """
+        try:
+            self.connection.autocommit = True
+            cursor = self.connection.cursor()
+            sql = 'select most_common_vals::text::text[], ' \
+                'histogram_bounds::text::text[] from pg_stats ' \
+                "where attname = %s and schemaname not in " \
+                "('pg_catalog', 'information_schema')"
+            params = [column.lower()]
+            if tables is not None:
+                sql += ' and tablename = any(%s)'
+                params.append([t.lower() for t in tables])
+            cursor.execute(sql, params)
+            values = []
+            for common_vals, bounds in cursor.fetchall():
+                values += (common_vals or []) + (bounds or [])
+            cursor.close()
+            return values
+        except Exception as e:
+            print(f'Exception while reading column statistics: {e}')
+            return []
+    
+    def exec_transaction(self, statements):
+        """ Executes SQL statements as one transaction, returns success flag. """
+        try:
+            self.connection.autocommit = False
+            cursor = self.connection.cursor()
+            for sql in statements:
+                cursor.execute(sql)
+            self.connection.commit()
+            return True
+        except Exception:
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            return False
+    
     def update(self, sql):
         """ Executes update and returns true iff the update succeeds. """
         try:
@@ -135,7 +192,10 @@ class PgConfig(ConfigurableDBMS):
     
     def is_param(self, param):
         """ Returns True iff given parameter exists. """
-        return self.can_query(f'show {param}')
+        if self.catalog:
+            return param in self.catalog
+        else:
+            return self.can_query(f'show {param}')
         
     def get_value(self, param):
         """ Get current value of given parameter. """
@@ -143,9 +203,18 @@ class PgConfig(ConfigurableDBMS):
         
     def set_param(self, param, value):
         """ Set given parameter to given value. """
-        self.config[param] = value
         query_one = f'alter system set {param} to \'{value}\''
-        return self.update(query_one)
+        success = self.update(query_one)
+        if success:
+            self.config[param] = value
+            self.pending.add(param)
+        return success
+    
+    def reset_param(self, param):
+        """ Reset parameter to its default value. """
+        self.update(f'alter system reset {param}')
+        self.config.pop(param, None)
+        self.pending.add(param)
     
     def set_timeout(self, timeout_s):
         """ Set per-query timeout. """
@@ -153,17 +222,303 @@ class PgConfig(ConfigurableDBMS):
 
     def reset_config(self):
         """ Reset all parameters to default values. """
+        auto_params = self._auto_conf_params()
         self.update('alter system reset all')
+        self.pending.update(self.config.keys())
+        self.pending.update(auto_params)
         self.config = {}
     
     def reconfigure(self):
         """ Makes parameter settings take effect. Returns true if successful.
         
+        Reloads the configuration if all changed parameters can be changed
+        without restart (according to their context in pg_settings). Falls
+        back to a full restart if the server reports pending changes that
+        still require a restart after the reload.
+        
         Returns:
             True iff reconfiguration was successful
         """
+        change = self.pending_change()
+        if change == ChangeType.NONE:
+            return True
+        elif change == ChangeType.RESTART:
+            success = self._restart()
+        else:
+            print(f'Reloading configuration for {self.pending}')
+            success = self._reload()
+            if success and self.query_one(
+                'select count(*) from pg_settings where pending_restart') != 0:
+                print('Configuration reload incomplete - restarting ...')
+                success = self._restart()
+        if success:
+            self.pending = set()
+        return success
+    
+    def pending_change(self):
+        """ Returns what is needed to apply changes since last reconfiguration. """
+        if not self.pending:
+            return ChangeType.NONE
+        elif self._needs_restart(self.pending):
+            return ChangeType.RESTART
+        else:
+            return ChangeType.RELOAD
+    
+    def cache_hit_ratio(self, counters):
+        """ Returns fraction of blocks found in shared buffers. """
+        hits = counters.get('blks_hit', 0)
+        accesses = hits + counters.get('blks_read', 0)
+        return hits / accesses if accesses else None
+    
+    def memory_params(self):
+        """ Returns memory-sized parameters of the memory category. """
+        return [p for p in self.catalog.params(['integer']) if 
+                self.catalog.info(p).category == 'Resource Usage / Memory'
+                and self.catalog.info(p).unit.endswith('B')]
+    
+    def plan_features(self, query):
+        """ Returns node types, rows, and cost of plan in JSON format. """
+        result = self.query_one(f'explain (format json) {query}')
+        try:
+            plan = result[0]['Plan']
+            return {
+                'nodes': plan_nodes(plan, 'Node Type'), 
+                'rows': float(plan['Plan Rows']), 
+                'cost': float(plan['Total Cost'])}
+        except (TypeError, KeyError, IndexError, ValueError):
+            return None
+    
+    def plan_params(self):
+        """ Returns parameters of query tuning categories (except for JIT).
+        
+        JIT compilation does not change plans but execution, hence it does
+        not count as plan parameter.
+        """
+        params = set()
+        for param in self.catalog.params():
+            category = self.catalog.info(param).category or ''
+            if category.startswith('Query Tuning') and \
+                not param.lower().startswith('jit'):
+                params.add(param)
+        return params
+    
+    def server_pids(self):
+        """ Returns IDs of server processes listed in pg_stat_activity. """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('select pid from pg_stat_activity')
+            pids = [r[0] for r in cursor.fetchall()]
+            cursor.close()
+            return pids
+        except Exception as e:
+            print(f'Exception while reading server processes: {e}')
+            return []
+    
+    def stat_counters(self):
+        """ Returns block accesses and background writer statistics.
+        
+        Includes all numerical columns of pg_stat_bgwriter (and of
+        pg_stat_checkpointer if available), column names are prefixed
+        by the name of the view (without "pg_stat_").
+        """
+        counters = {}
+        try:
+            # Statistics are fixed within transactions
+            self.connection.autocommit = True
+            cursor = self.connection.cursor()
+            cursor.execute(
+                'select sum(blks_hit), sum(blks_read) from pg_stat_database')
+            counters['blks_hit'], counters['blks_read'] = [
+                int(c or 0) for c in cursor.fetchone()]
+            cursor.execute(
+                "select viewname from pg_views where viewname in " \
+                "('pg_stat_bgwriter', 'pg_stat_checkpointer')")
+            for (view,) in cursor.fetchall():
+                cursor.execute(f'select * from {view}')
+                row = cursor.fetchone()
+                prefix = view.replace('pg_stat_', '')
+                for column, value in zip(cursor.description, row):
+                    if isinstance(value, (int, float)):
+                        counters[f'{prefix}.{column.name}'] = value
+            cursor.close()
+        except Exception as e:
+            print(f'Exception while reading statistics: {e}')
+        return counters
+    
+    def top_statements(self, nr_statements):
+        """ Returns top SELECT statements of current database from 
+        pg_stat_statements (the extension must be installed). """
+        # Time column was renamed in PostgreSQL 13
+        for time_column in ['total_exec_time', 'total_time']:
+            try:
+                self.connection.autocommit = True
+                cursor = self.connection.cursor()
+                cursor.execute(
+                    f'select query, sum(calls), sum({time_column}) ' \
+                    'from pg_stat_statements s, pg_database d ' \
+                    'where s.dbid = d.oid and d.datname = current_database() ' \
+                    "and query ~* '^\\s*select\\s' " \
+                    "and query !~* '(pg_catalog|pg_stat|information_schema)' " \
+                    f'group by query order by 3 desc limit {int(nr_statements)}')
+                statements = [(q, int(c), float(t)) for q, c, t in cursor.fetchall()]
+                cursor.close()
+                return statements
+            except Exception as e:
+                print(f'Exception while reading pg_stat_statements: {e}')
+        return []
+    
+    def _apply_to_session(self):
+        """ Sets changed and plan parameters for this session.
+        
+        Parameters without value in the current configuration are set to
+        their defaults (the server may still use prior values). Parameters
+        that cannot be set per session are ignored.
+        
+        Returns:
+            True iff all plan parameters were set
+        """
+        plan_params = self.plan_params()
+        for param in set(self.config) | self.pending | plan_params:
+            value = self.config.get(param)
+            if value is None:
+                info = self.param_info(param)
+                value = None if info is None else info.default
+            if value is not None:
+                success = self.update(f"set {param} to '{value}'")
+                if not success and param in plan_params:
+                    return False
+        return True
+    
+    def _auto_conf_params(self):
+        """ Returns names of parameters currently set via ALTER SYSTEM. """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "select name from pg_settings " \
+                "where sourcefile like '%postgresql.auto.conf'")
+            params = [r[0] for r in cursor.fetchall()]
+            cursor.close()
+            return params
+        except Exception as e:
+            print(f'Exception while reading changed parameters: {e}')
+            return []
+    
+    def _needs_restart(self, params):
+        """ Returns True iff changing given parameters requires restart.
+        
+        Args:
+            params: names of changed parameters
+        
+        Returns:
+            True if any parameter has postmaster (or unknown) context
+        """
+        for param in params:
+            info = self.catalog.info(param)
+            if info is None or info.context == 'postmaster':
+                return True
+        return False
+    
+    def _catalog_fingerprint(self):
+        """ Returns hash of server version, loaded extensions, and defaults.
+        
+        Defaults in the catalog are reset values, taken from postgresql.conf
+        (see _read_catalog). Hence, the hash covers all reset values that
+        differ from built-in defaults (except for values set via ALTER
+        SYSTEM), and the catalog is refreshed if postgresql.conf changes.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute('select version()')
+            version = cursor.fetchone()[0]
+            cursor.execute(
+                'select extname, extversion from pg_extension order by extname')
+            extensions = cursor.fetchall()
+            cursor.execute('show shared_preload_libraries')
+            libraries = cursor.fetchone()[0]
+            cursor.execute(
+                'select name, reset_val from pg_settings ' \
+                'where reset_val is distinct from boot_val and not ' \
+                "coalesce(sourcefile like '%postgresql.auto.conf', false) " \
+                'order by name')
+            defaults = cursor.fetchall()
+            cursor.close()
+            return fingerprint(version, extensions, libraries, defaults)
+        except Exception as e:
+            print(f'Exception while identifying server version: {e}')
+            return None
+    
+    def _explain(self, query):
+        """ Returns query plan in JSON format (without costs) or None. """
+        return self.query_one(f'explain (costs off, format json) {query}')
+    
+    def _read_catalog(self):
+        """ Returns catalog describing all parameters in pg_settings.
+        
+        The default value of a parameter is the value it takes after a 
+        reset (unless that value stems from ALTER SYSTEM).
+        """
+        infos = []
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                'select name, vartype, unit, min_val, max_val, ' \
+                'enumvals, context, category, boot_val, reset_val, ' \
+                "coalesce(sourcefile like '%postgresql.auto.conf', false) " \
+                'from pg_settings')
+            for name, vartype, unit, min_val, max_val, enumvals, context, \
+                category, boot_val, reset_val, auto_conf in cursor.fetchall():
+                # Values set via ALTER SYSTEM are no defaults
+                default = boot_val if auto_conf else reset_val
+                infos.append(ParamInfo(
+                    name=name, vartype=vartype, unit=unit or '', 
+                    min_val=None if min_val is None else float(min_val),
+                    max_val=None if max_val is None else float(max_val),
+                    enumvals=tuple(enumvals or ()), context=context,
+                    category=category, default=default))
+            cursor.close()
+        except Exception as e:
+            print(f'Exception while reading parameter catalog: {e}')
+        return ParamCatalog(infos, case_sensitive=False)
+    
+    def _reload(self):
+        """ Reload configuration files and reconnect (no restart).
+        
+        The reload is asynchronous (pg_reload_conf signals the server).
+        Hence, we reconnect until new sessions report a configuration load 
+        time after the signal. Restarts if the reload does not complete.
+        
+        Returns:
+            True iff reconnecting after the reload was successful
+        """
+        start_s = time.time()
+        load_time = self.query_one('select pg_conf_load_time()')
+        if load_time is None or not self.update('select pg_reload_conf()'):
+            return self._restart()
+        deadline_s = start_s + self.ready_timeout_s
+        wait_s = self.min_probe_wait_s
+        while True:
+            self._disconnect()
+            if not self._connect():
+                return False
+            new_load_time = self.query_one('select pg_conf_load_time()')
+            if new_load_time is not None and new_load_time > load_time:
+                break
+            remaining_s = deadline_s - time.time()
+            if remaining_s <= 0:
+                print('Configuration reload incomplete - restarting ...')
+                return self._restart()
+            time.sleep(min(wait_s, remaining_s))
+            wait_s = min(2 * wait_s, self.max_probe_wait_s)
+        self.restart_ms += (time.time() - start_s) * 1000.0
+        return True
+    
+    def _restart(self):
+        """ Restart database server and reconnect.
+        
+        Returns:
+            True iff connection to restarted server was established
+        """
         self._disconnect()
-        os.system(self.restart_cmd)
-        time.sleep(3)
+        self._restart_server()
         success = self._connect()
         return success    
\ No newline at end of file
@@ -0,0 +1,397 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+from dbms.generic_dbms import ChangeType, ConfigurableDBMS
+from dbms.validation import pg_unit_groups, ValueValidator
+import json
+import math
+import random
+import time
+
+# Postgres-like model: parameters with default values and response surfaces
+default_model = {
+    'base_ms': 60000, # workload run time with default configuration
+    'nr_queries': 22, # number of queries in workload
+    'noise': 0.02, # relative standard deviation of query run times
+    'restart_ms': 3000, # time for restarting the server
+    'reload_ms': 50, # time for reloading the configuration
+    'memory_bytes': 8000000000, # server fails above this memory footprint
+    'params': {
+        'shared_buffers': {
+            'vartype':'integer', 'unit':'8kB', 'min_val':16,
+            'max_val':1073741823, 'default':'16384', 'context':'postmaster',
+            'optimum':'262144', 'impact':0.4, 'memory':1},
+        'work_mem': {
+            'vartype':'integer', 'unit':'kB', 'min_val':64,
+            'max_val':2147483647, 'default':'4096', 'context':'user',
+            'optimum':'262144', 'impact':0.3, 'memory':8},
+        'maintenance_work_mem': {
+            'vartype':'integer', 'unit':'kB', 'min_val':1024,
+            'max_val':2147483647, 'default':'65536', 'context':'user',
+            'memory':1},
+        'effective_cache_size': {
+            'vartype':'integer', 'unit':'8kB', 'min_val':1,
+            'max_val':2147483647, 'default':'524288', 'context':'user',
+            'optimum':'786432', 'impact':0.1},
+        'wal_buffers': {
+            'vartype':'integer', 'unit':'8kB', 'min_val':-1,
+            'max_val':262143, 'default':'512', 'context':'postmaster',
+            'memory':1},
+        'random_page_cost': {
+            'vartype':'real', 'min_val':0, 'max_val':1.79769e+308,
+            'default':'4', 'context':'user',
+            'optimum':'1.1', 'impact':0.15},
+        'seq_page_cost': {
+            'vartype':'real', 'min_val':0, 'max_val':1.79769e+308,
+            'default':'1', 'context':'user'},
+        'cpu_tuple_cost': {
+            'vartype':'real', 'min_val':0, 'max_val':1.79769e+308,
+            'default':'0.01', 'context':'user',
+            'optimum':'0.03', 'impact':0.05},
+        'effective_io_concurrency': {
+            'vartype':'integer', 'min_val':0, 'max_val':1000,
+            'default':'1', 'context':'user',
+            'optimum':'200', 'impact':0.1},
+        'max_parallel_workers_per_gather': {
+            'vartype':'integer', 'min_val':0, 'max_val':1024,
+            'default':'2', 'context':'user',
+            'optimum':'8', 'impact':0.3},
+        'max_worker_processes': {
+            'vartype':'integer', 'min_val':0, 'max_val':262143,
+            'default':'8', 'context':'postmaster'},
+        'max_connections': {
+            'vartype':'integer', 'min_val':1, 'max_val':262143,
+            'default':'100', 'context':'postmaster'},
+        'checkpoint_completion_target': {
+            'vartype':'real', 'min_val':0, 'max_val':1,
+            'default':'0.5', 'context':'sighup'},
+        'default_statistics_target': {
+            'vartype':'integer', 'min_val':1, 'max_val':10000,
+            'default':'100', 'context':'user',
+            'optimum':'500', 'impact':0.05},
+        'join_collapse_limit': {
+            'vartype':'integer', 'min_val':1, 'max_val':2147483647,
+            'default':'8', 'context':'user',
+            'optimum':'12', 'impact':0.05},
+        'from_collapse_limit': {
+            'vartype':'integer', 'min_val':1, 'max_val':2147483647,
+            'default':'8', 'context':'user'},
+        'enable_seqscan': {
+            'vartype':'bool', 'default':'on', 'context':'user',
+            'optimum':'on', 'impact':0.5},
+        'jit': {
+            'vartype':'bool', 'default':'on', 'context':'user',
+            'optimum':'off', 'impact':0.05}}}
+
+
+class SimulatedDBMS(ConfigurableDBMS):
+    """ Simulates a configurable DBMS using a parametric performance model.
+
+    Parameters may have a response surface, described by the value with
+    optimal performance and the maximal slowdown when deviating from it
+    (on a logarithmic scale). Each query reacts to a random subset of
+    parameters. The server fails to start if memory allocated by static
+    parameters exceeds the memory limit, queries fail if memory usage
+    including per-operation memory exceeds it.
+    """
+
+    def __init__(self, model=default_model, timeout_s=1500,
+                 seed=0, time_scale=0):
+        """ Initialize simulated DBMS from performance model.
+
+        Args:
+            model: dictionary describing parameters and response surfaces
+            timeout_s: per-query timeout in seconds
+            seed: seed for generating queries and measurement noise
+            time_scale: sleep for simulated time, multiplied by this factor
+        """
+        self.model = model
+        self.time_scale = time_scale
+        self.params = model['params']
+        unit_to_size={'KB':'kB', 'MB':'000kB', 'GB':'000000kB',
+                      'K':'kB', 'M':'000kB', 'G':'000000kB'}
+        super().__init__('simulated', None, None, unit_to_size,
+                         '', '', timeout_s)
+        self.catalog = ParamCatalog([ParamInfo(
+            name=p, vartype=d['vartype'], unit=d.get('unit', ''),
+            min_val=d.get('min_val'), max_val=d.get('max_val'),
+            context=d['context'], category='simulated',
+            default=d['default'])
+            for p, d in self.params.items()])
+        self.validator = ValueValidator(
+            self.catalog, pg_unit_groups, lambda p, v: False)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.queries = self._generate_queries()
+        self.running = {}
+
+    @classmethod
+    def from_file(cls, config):
+        """ Initializes simulated DBMS from configuration file.
+
+        Args:
+            cls: class (currently, only SimulatedDBMS)
+            config: configuration read from file
+
+        Returns:
+            new simulated DBMS object
+        """
+        model_path = config['DATABASE'].get('sim_model')
+        timeout_s = float(config['LEARNING']['timeout_s'])
+        return cls(read_model(model_path), timeout_s)
+
+    def all_params(self):
+        """ Returns names of all tuning parameters. """
+        return self.catalog.params(['bool', 'integer', 'real'])
+
+    def copy_db(self, source_db, target_db):
+        """ Copy source to target database (no effect in simulation). """
+        print(f'Simulating copy from {source_db} to {target_db}')
+        return True
+
+    def exec_file(self, path):
+        """ Simulates running workload and returns error flag. """
+        error, _ = self.simulate()
+        return error
+
+    def get_value(self, param):
+        """ Returns value of parameter in current server configuration. """
+        if param in self.params:
+            return self.running.get(param, self.params[param]['default'])
+        else:
+            return None
+
+    def is_param(self, param):
+        """ Returns True iff the given parameter can be configured. """
+        return param in self.catalog
+
+    def query_one(self, sql):
+        """ Simulated DBMS does not process SQL queries. """
+        return None
+
+    def update(self, sql):
+        """ Simulated DBMS does not process SQL updates. """
+        return False
+
+    def memory_params(self):
+        """ Returns parameters contributing to simulated memory footprint. """
+        return [p for p, d in self.params.items() if 'memory' in d]
+
+    def pending_change(self):
+        """ Returns what is needed to apply changes since last reconfiguration. """
+        if not self.pending:
+            return ChangeType.NONE
+        elif any(self.params[p]['context'] == 'postmaster'
+                 for p in self.pending):
+            return ChangeType.RESTART
+        else:
+            return ChangeType.RELOAD
+
+    def reconfigure(self):
+        """ Makes parameter settings take effect.
+
+        Returns:
+            True iff the (simulated) server starts with new configuration
+        """
+        change = self.pending_change()
+        if change == ChangeType.NONE:
+            return True
+        success = True
+        if change == ChangeType.RESTART:
+            self._pass_restart_time(self.model['restart_ms'])
+            if self._memory_bytes(self.config, False) > \
+                self.model['memory_bytes']:
+                print('Simulated server fails to start - recovering ...')
+                self.config = {}
+                self._pass_restart_time(self.model['restart_ms'])
+                success = False
+        else:
+            self._pass_restart_time(self.model['reload_ms'])
+        self.running = dict(self.config)
+        self.pending = set()
+        return success
+
+    def reset_config(self):
+        """ Reset all parameters to default values. """
+        self.pending.update(self.config.keys())
+        self.config = {}
+
+    def reset_param(self, param):
+        """ Reset parameter to its default value. """
+        self.config.pop(param, None)
+        self.pending.add(param)
+
+    def set_param(self, param, value):
+        """ Set parameter to given value if admissible. """
+        if self.validator.can_set(param, value):
+            self.config[param] = value
+            self.pending.add(param)
+            return True
+        else:
+            return False
+
+    def set_timeout(self, timeout_s):
+        """ Set per-query timeout. """
+        self.timeout_s = timeout_s
+
+    def simulate(self, query_ids=None):
+        """ Simulates execution of workload queries.
+
+        Args:
+            query_ids: indices of queries to run (all queries if None)
+
+        Returns:
+            tuple: error flag and list of run times (in milliseconds,
+                a query that times out is listed with the timeout)
+        """
+        if query_ids is None:
+            query_ids = range(len(self.queries))
+        if self._memory_bytes(self.running, True) > self.model['memory_bytes']:
+            print('Simulated query execution runs out of memory')
+            return True, []
+        param_factors = {p:self._factor(p) for p in self.params}
+        timeout_ms = float(self.timeout_s) * 1000.0
+        times_ms = []
+        for query_id in query_ids:
+            base_ms, sensitivities = self.queries[query_id]
+            query_ms = base_ms
+            for param, sensitivity in sensitivities.items():
+                query_ms *= math.pow(param_factors[param], sensitivity)
+            query_ms *= math.exp(self.random.gauss(0, self.model['noise']))
+            if query_ms > timeout_ms:
+                self._pass_time(timeout_ms)
+                times_ms.append(timeout_ms)
+                return True, times_ms
+            self._pass_time(query_ms)
+            times_ms.append(query_ms)
+        return False, times_ms
+
+    def _catalog_fingerprint(self):
+        """ Returns hash of performance model and seed. """
+        return fingerprint(json.dumps(self.model, sort_keys=True), self.seed)
+
+    def _connect(self):
+        """ Connection to simulated DBMS always succeeds. """
+        return True
+
+    def _disconnect(self):
+        """ No connection to close for simulated DBMS. """
+        pass
+
+    def _probe(self):
+        """ Simulated DBMS always accepts connections. """
+        return True
+
+    def _factor(self, param):
+        """ Returns relative slowdown due to parameter value (default is 1).
+
+        Args:
+            param: name of parameter
+
+        Returns:
+            ratio of run time with current value and with default value
+        """
+        spec = self.params[param]
+        if 'optimum' not in spec:
+            return 1.0
+        return self._slowdown(param, self.get_value(param)) / \
+            self._slowdown(param, spec['default'])
+
+    def _generate_queries(self):
+        """ Generates query run times and parameter sensitivities.
+
+        Returns:
+            list of tuples: default run time and parameter sensitivities
+        """
+        nr_queries = self.model['nr_queries']
+        weights = [self.random.lognormvariate(0, 1) for _ in range(nr_queries)]
+        total_weight = sum(weights)
+        tuned = [p for p, s in self.params.items() if 'optimum' in s]
+        queries = []
+        for weight in weights:
+            base_ms = self.model['base_ms'] * weight / total_weight
+            sensitivities = {p:self.random.random() for p in tuned
+                             if self.random.random() < 0.5}
+            queries.append((base_ms, sensitivities))
+        return queries
+
+    def _memory_bytes(self, config, per_operation):
+        """ Returns memory footprint of given configuration.
+
+        Args:
+            config: maps parameters to values (others use default values)
+            per_operation: whether to include memory allocated per operation
+
+        Returns:
+            memory footprint in bytes
+        """
+        total_bytes = 0
+        for param, spec in self.params.items():
+            factor = spec.get('memory', 0)
+            static = spec['context'] == 'postmaster'
+            if factor and (static or per_operation):
+                value = config.get(param, spec['default'])
+                bytes_ = self.validator.base_value(param, value)
+                total_bytes += factor * max(bytes_ or 0, 0)
+        return total_bytes
+
+    def _pass_time(self, millis):
+        """ Account for simulated time (optionally sleeping).
+
+        Args:
+            millis: simulated time in milliseconds
+        """
+        if self.time_scale:
+            time.sleep(millis * self.time_scale / 1000.0)
+
+    def _pass_restart_time(self, millis):
+        """ Account for simulated restart (or reload) time.
+
+        Args:
+            millis: simulated restart time in milliseconds
+        """
+        self.restart_ms += millis
+        self._pass_time(millis)
+
+    def _slowdown(self, param, value):
+        """ Returns slowdown factor for value (1 for optimal value).
+
+        Args:
+            param: name of parameter
+            value: value of parameter
+
+        Returns:
+            relative slowdown, compared to optimal value
+        """
+        spec = self.params[param]
+        impact = spec['impact']
+        if spec['vartype'] == 'bool':
+            normalize = self.validator.normalize
+            optimal = normalize(param, value) == normalize(param, spec['optimum'])
+            return 1.0 if optimal else 1.0 + impact
+        value = self.validator.base_value(param, value)
+        optimum = self.validator.base_value(param, spec['optimum'])
+        if value is None or value <= 0 or optimum <= 0:
+            return 1.0 + impact
+        # Slowdown grows with distance on logarithmic scale
+        distance = min(abs(math.log2(value / optimum)), 10)
+        return 1.0 + impact * distance / 10
+
+
+def read_model(model_path):
+    """ Reads performance model from JSON file.
+
+    Args:
+        model_path: path to model file (use default model if None)
+
+    Returns:
+        dictionary describing parameters and response surfaces
+    """
+    if model_path is None:
+        return default_model
+    with open(model_path) as file:
+        model = json.load(file)
+    return {**default_model, **model}
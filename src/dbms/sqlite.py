@@ -0,0 +1,320 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+from dbms.generic_dbms import ChangeType, ConfigurableDBMS
+from dbms.validation import ValueValidator
+import dataclasses
+import re
+import sqlite3
+import time
+
+# Tunable PRAGMAs: type, range, scope (connection or database file), default
+sqlite_pragmas = [
+    ParamInfo('cache_size', 'integer', '', -2**63, 2**63-1,
+              context='connection', default='-2000'),
+    ParamInfo('mmap_size', 'integer', '', 0, 2**63-1,
+              context='connection', default='0'),
+    ParamInfo('page_size', 'integer', '', 512, 65536, context='file',
+              default='4096'),
+    ParamInfo('temp_store', 'integer', '', 0, 2, context='connection',
+              default='0'),
+    ParamInfo('synchronous', 'integer', '', 0, 3, context='connection',
+              default='2'),
+    ParamInfo('journal_mode', 'enum', enumvals=(
+        'delete', 'truncate', 'persist', 'memory', 'wal', 'off'),
+        context='file', default='delete'),
+    ParamInfo('threads', 'integer', '', 0, 8, context='connection',
+              default='0'),
+    ParamInfo('automatic_index', 'bool', context='connection',
+              default='on')]
+# PRAGMAs that only influence query plans
+sqlite_plan_pragmas = {'automatic_index'}
+# PRAGMAs whose setting persists in the database file
+sqlite_file_pragmas = ['page_size', 'journal_mode']
+# Sizes (e.g., "4GB"), converted into KiB for cache_size and bytes for mmap_size
+size_pattern = re.compile(r'\s*([0-9]+(?:\.[0-9]+)?)\s*([KMG])i?B?\s*', re.I)
+unit_to_bytes = {'K':2**10, 'M':2**20, 'G':2**30}
+
+class SQLiteConfig(ConfigurableDBMS):
+    """ SQLite database, tuned via PRAGMAs set on each new connection. """
+
+    def __init__(self, db, timeout_s):
+        """ Initialize connection to SQLite database file.
+
+        Args:
+            db: path to SQLite database file
+            timeout_s: per-query timeout in seconds
+        """
+        self.query_start_s = time.time()
+        # Sizes are converted per PRAGMA (see _transform_val)
+        super().__init__(db, None, None, {}, '', '', timeout_s)
+        # Settings of database file when connecting are defaults
+        self.file_defaults = {}
+        for param in sqlite_file_pragmas:
+            value = self.query_one(f'pragma {param}')
+            if value is not None:
+                self.file_defaults[param] = str(value)
+        self.catalog = ParamCatalog([
+            dataclasses.replace(i, default=self.file_defaults[i.name]) 
+            if i.name in self.file_defaults else i for i in sqlite_pragmas])
+        self.validator = ValueValidator(self.catalog, [], None)
+
+    @classmethod
+    def from_file(cls, config):
+        """ Initializes SQLite DBMS from configuration file.
+
+        Args:
+            cls: class (currently, only SQLiteConfig)
+            config: configuration read from file
+
+        Returns:
+            new SQLite DBMS object
+        """
+        db_name = config['DATABASE']['name']
+        timeout_s = float(config['LEARNING']['timeout_s'])
+        return cls(db_name, timeout_s)
+
+    def all_params(self):
+        """ Returns names of all tuning parameters. """
+        return self.catalog.params()
+
+    def can_set(self, param, value):
+        """ Returns True iff we can set parameter to value. """
+        return self._is_valid(param, self._transform_val(param, value))
+
+    def copy_db(self, source_db, target_db):
+        """ Copy source to target database file, returns success flag. """
+        try:
+            source = sqlite3.connect(source_db)
+            target = sqlite3.connect(target_db)
+            source.backup(target)
+            target.close()
+            source.close()
+            return True
+        except sqlite3.Error as e:
+            print(f'Exception while copying {source_db}: {e}')
+            return False
+
+    def exec_file(self, path):
+        """ Executes all SQL queries in given file and returns error flag. """
+        try:
+            with open(path) as file:
+                sql = file.read()
+            for query in sql.split(';'):
+                if query.strip():
+                    self._execute(query).fetchall()
+            error = False
+        except Exception as e:
+            error = True
+            print(f'Exception executing {path}: {e}')
+        return error
+
+    def exec_query(self, sql):
+        """ Executes one SQL query, fetching all results, returns error flag. """
+        try:
+            self._execute(sql).fetchall()
+            return False
+        except Exception as e:
+            print(f'Exception executing query: {e}')
+            return True
+
+    def get_value(self, param):
+        """ Returns current value for given parameter. """
+        if param in self.catalog:
+            return self.query_one(f'pragma {param}')
+        else:
+            return None
+
+    def is_param(self, param):
+        """ Returns True iff the given parameter can be configured. """
+        return param in self.catalog
+
+    def query_one(self, sql):
+        """ Runs SQL query and returns first result cell if it succeeds. """
+        try:
+            return self._execute(sql).fetchone()[0]
+        except Exception:
+            return None
+
+    def update(self, sql):
+        """ Runs an SQL update and returns true iff the update succeeds. """
+        try:
+            self._execute(sql)
+            return True
+        except Exception:
+            return False
+
+    def pending_change(self):
+        """ Returns what is needed to apply changes since last reconfiguration.
+
+        Most PRAGMAs take effect when reopening the connection. Changing
+        the page size requires rebuilding the database file.
+        """
+        if not self.pending:
+            return ChangeType.NONE
+        elif 'page_size' in self.pending:
+            return ChangeType.RESTART
+        else:
+            return ChangeType.RELOAD
+
+    def plan_params(self):
+        """ Returns PRAGMAs that only influence query plans. """
+        return set(sqlite_plan_pragmas)
+
+    def reconfigure(self):
+        """ Makes PRAGMA settings take effect by reopening the connection.
+
+        Returns:
+            True iff reconnecting was successful
+        """
+        change = self.pending_change()
+        if change == ChangeType.NONE:
+            return True
+        start_s = time.time()
+        if change == ChangeType.RESTART:
+            page_size = self.config.get(
+                'page_size', self.file_defaults.get('page_size'))
+            # Page size cannot change in WAL mode
+            self.update('pragma journal_mode = delete')
+            self.update(f'pragma page_size = {page_size}')
+            self.update('vacuum')
+        # Restore journal mode of database file unless configured
+        if 'journal_mode' not in self.config and 'journal_mode' in \
+            self.file_defaults and (change == ChangeType.RESTART or 
+                                    'journal_mode' in self.pending):
+            journal_mode = self.file_defaults['journal_mode']
+            self.update(f'pragma journal_mode = {journal_mode}')
+        self._disconnect()
+        success = self._connect()
+        self.restart_ms += (time.time() - start_s) * 1000.0
+        if success:
+            self.pending = set()
+        return success
+
+    def reset_config(self):
+        """ Reset all parameters to default values. """
+        self.pending.update(self.config.keys())
+        self.config = {}
+
+    def reset_param(self, param):
+        """ Reset parameter to its default value. """
+        self.config.pop(param, None)
+        self.pending.add(param)
+
+    def set_param(self, param, value):
+        """ Set parameter to given value (takes effect after reconnect). """
+        if not self._is_valid(param, value):
+            return False
+        self.config[param] = value
+        self.pending.add(param)
+        return True
+
+    def set_timeout(self, timeout_s):
+        """ Set per-query timeout. """
+        self.timeout_s = timeout_s
+        if self.connection:
+            self.connection.set_progress_handler(self._check_timeout, 10000)
+
+    def _catalog_fingerprint(self):
+        """ Returns hash of SQLite library version. """
+        return fingerprint(sqlite3.sqlite_version)
+
+    def _check_timeout(self):
+        """ Returns non-zero value to interrupt queries after timeout. """
+        elapsed_s = time.time() - self.query_start_s
+        return 1 if elapsed_s > float(self.timeout_s) else 0
+
+    def _connect(self):
+        """ Open database file and apply PRAGMAs, returns success flag. """
+        print(f'Trying to connect to {self.db}')
+        try:
+            self.connection = self._new_connection()
+            self.set_timeout(self.timeout_s)
+            return True
+        except Exception as e:
+            print(f'Exception while trying to connect to SQLite: {e}')
+            self.connection = None
+            return False
+
+    def _disconnect(self):
+        """ Disconnect from database. """
+        if self.connection:
+            print('Disconnecting ...')
+            self.connection.close()
+            self.connection = None
+
+    def _execute(self, sql):
+        """ Executes SQL statement and returns cursor. """
+        self.query_start_s = time.time()
+        return self.connection.execute(sql)
+
+    def plan_features(self, query):
+        """ Returns counts of plan steps (e.g., SCAN or SEARCH).
+        
+        SQLite does not report estimated rows or cost (both are zero).
+        """
+        steps = self._explain(query)
+        if steps is None:
+            return None
+        nodes = {}
+        for _, _, detail in steps:
+            node = detail.split()[0] if detail.split() else ''
+            nodes[node] = nodes.get(node, 0) + 1
+        return {'nodes': nodes, 'rows': 0.0, 'cost': 0.0}
+
+    def _explain(self, query):
+        """ Returns steps of query plan or None if EXPLAIN fails. """
+        try:
+            return [r[1:] for r in self._execute(
+                f'explain query plan {query}').fetchall()]
+        except Exception:
+            return None
+
+    def _is_valid(self, param, value):
+        """ Returns True iff value (after unit transformation) is valid.
+
+        SQLite silently ignores invalid PRAGMA values, hence we validate
+        in memory (page size must be a power of two in addition).
+        """
+        if not self.validator.can_set(param, value):
+            return False
+        return param != 'page_size' or _is_power_of_two(value)
+
+    def _transform_val(self, param, value):
+        """ Converts sizes (e.g., "64MB") into unit of PRAGMA.
+        
+        Positive cache sizes count pages, hence sizes are converted into
+        negative numbers (counting KiB) for cache_size. Memory map sizes
+        are given in bytes. Other values remain unchanged.
+        """
+        value = str(value)
+        match = size_pattern.fullmatch(value)
+        if match is None or param not in ['cache_size', 'mmap_size']:
+            return value
+        nr_bytes = float(match.group(1)) * unit_to_bytes[match.group(2).upper()]
+        if param == 'cache_size':
+            return str(-max(int(nr_bytes / 1024), 1))
+        return str(int(nr_bytes))
+
+    def _new_connection(self):
+        """ Opens database file and returns connection with PRAGMAs applied. """
+        connection = sqlite3.connect(self.db, isolation_level=None)
+        for param, value in self.config.items():
+            connection.execute(f'pragma {param} = {value}')
+        return connection
+
+    def _probe(self):
+        """ Database files are always ready for connections. """
+        return True
+
+
+def _is_power_of_two(value):
+    """ Returns True iff value is integer power of two. """
+    try:
+        number = int(value)
+        return number > 0 and number & (number - 1) == 0
+    except ValueError:
+        return False
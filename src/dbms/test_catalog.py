@@ -0,0 +1,42 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.catalog import fingerprint, ParamCatalog, ParamInfo
+import os
+import tempfile
+import unittest
+
+class TestParamCatalog(unittest.TestCase):
+    """ Test lookups in parameter catalogs and their persistence. """
+
+    def test_persistence(self):
+        """ Test storing catalog and loading it again. """
+        catalog = ParamCatalog([
+            ParamInfo('Work_Mem', 'integer', 'kB', 64, 2147483647,
+                      context='user', category='Memory'),
+            ParamInfo('wal_level', 'enum', 
+                      enumvals=('minimal', 'replica', 'logical'))],
+            case_sensitive=False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'catalogs', 'pg_test.json')
+            catalog.save(path)
+            loaded = ParamCatalog.load(path)
+        self.assertIn('work_mem', loaded)
+        self.assertNotIn('work_memory', loaded)
+        self.assertEqual(loaded.info('WORK_MEM'), catalog.info('work_mem'))
+        self.assertEqual(loaded.info('wal_level').enumvals, 
+                         ('minimal', 'replica', 'logical'))
+        self.assertEqual(loaded.params(['integer']), ['Work_Mem'])
+        self.assertEqual(loaded.params(categories=['Memory']), ['Work_Mem'])
+
+    def test_fingerprint(self):
+        """ Test that fingerprints change with versions and extensions. """
+        base = fingerprint('PostgreSQL 12.16', [('plpgsql', '1.0')])
+        self.assertEqual(
+            base, fingerprint('PostgreSQL 12.16', [('plpgsql', '1.0')]))
+        self.assertNotEqual(
+            base, fingerprint('PostgreSQL 12.17', [('plpgsql', '1.0')]))
+        self.assertNotEqual(
+            base, fingerprint('PostgreSQL 12.16', [('hypopg', '1.4')]))
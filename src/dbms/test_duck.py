@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.duck import DuckDBConfig
+from dbms.generic_dbms import ChangeType
+import os
+import tempfile
+import unittest
+
+class TestDuckDBConfig(unittest.TestCase):
+    """ Test tuning settings of DuckDB database. """
+
+    def setUp(self):
+        """ Initialize small DuckDB database in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.duckdb')
+        self.dbms = DuckDBConfig(db_path, 10)
+        self.dbms.update('create table t as select range as a from range(1000)')
+
+    def tearDown(self):
+        """ Close connection and delete database file. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_apply_config(self):
+        """ Test that settings take effect immediately. """
+        change = self.dbms.apply_config(
+            {'threads':'2', 'preserve_insertion_order':'false'})
+        self.assertEqual(change, ChangeType.NONE)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('threads'), 2)
+        self.assertFalse(self.dbms.get_value('preserve_insertion_order'))
+        self.dbms.apply_config({'memory_limit':'1GB'})
+        self.assertEqual(self.dbms.changed(), {'memory_limit':'1GB'})
+        self.assertTrue(self.dbms.get_value('preserve_insertion_order'))
+        self.dbms.reset_config()
+        self.assertEqual(self.dbms.changed(), {})
+
+    def test_invalid_values(self):
+        """ Test rejecting invalid values without server round trips. """
+        self.assertFalse(self.dbms.can_set('threads', '0'))
+        self.assertFalse(self.dbms.can_set('memory_limit', '2 apples'))
+        self.assertFalse(self.dbms.can_set('no_such_setting', '1'))
+        self.assertTrue(self.dbms.can_set('memory_limit', '512MiB'))
+        self.assertEqual(self.dbms.validator.nr_server_checks, 0)
+
+    def test_exec_file(self):
+        """ Test executing workload file. """
+        path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        with open(path, 'w') as file:
+            file.write('select count(*) from t; select sum(a) from t;')
+        self.assertFalse(self.dbms.exec_file(path))
+        with open(path, 'w') as file:
+            file.write('select count(*) from no_such_table;')
+        self.assertTrue(self.dbms.exec_file(path))
+
+    def test_open_session(self):
+        """ Test opening separate connection with current settings. """
+        self.dbms.apply_config({'ordered_aggregate_threshold':'1000'})
+        session = self.dbms.open_session()
+        self.assertIsNot(session.connection, self.dbms.connection)
+        self.assertEqual(session.get_value('ordered_aggregate_threshold'), 1000)
+        self.assertFalse(session.exec_query('select count(*) from t'))
+        session.close_session()
+        self.assertFalse(self.dbms.exec_query('select count(*) from t'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.generic_dbms import plan_nodes, plan_values
+import unittest
+
+class TestPlanHelpers(unittest.TestCase):
+    """ Test extracting values from nested plan descriptions. """
+
+    def setUp(self):
+        """ Initialize plan in the format of MySQL's JSON explain. """
+        self.plan = {'query_block': {'nested_loop': [
+            {'table': {'access_type': 'ALL', 'rows_examined_per_scan': 10}},
+            {'table': {'access_type': 'ref', 'rows_examined_per_scan': 2}},
+            {'table': {'access_type': 'ref', 'rows_examined_per_scan': 1}}]}}
+
+    def test_plan_nodes(self):
+        """ Test counting values of key in plan. """
+        self.assertEqual(
+            plan_nodes(self.plan, 'access_type'), {'ALL': 1, 'ref': 2})
+        self.assertEqual(plan_nodes(self.plan, 'Node Type'), {})
+
+    def test_plan_values(self):
+        """ Test collecting values of key in plan. """
+        self.assertEqual(
+            plan_values(self.plan, 'rows_examined_per_scan'), [10, 2, 1])
+        self.assertEqual(plan_values([], 'access_type'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.generic_dbms import ChangeType
+from dbms.simulated import SimulatedDBMS
+import unittest
+
+class TestSimulatedDBMS(unittest.TestCase):
+    """ Test simulated DBMS and delta-based configuration changes. """
+    
+    def setUp(self):
+        """ Initialize simulated DBMS with default model. """
+        self.dbms = SimulatedDBMS()
+    
+    def _run_time(self):
+        """ Returns simulated run time of workload in milliseconds. """
+        error, times_ms = self.dbms.simulate()
+        self.assertFalse(error)
+        return sum(times_ms)
+    
+    def test_apply_config(self):
+        """ Test applying configurations as delta to current configuration. """
+        change = self.dbms.apply_config({'work_mem':'64MB', 'jit':'off'})
+        self.assertEqual(change, ChangeType.RELOAD)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('work_mem'), '64000kB')
+        change = self.dbms.apply_config({'work_mem':'64MB', 'jit':'off'})
+        self.assertEqual(change, ChangeType.NONE)
+        change = self.dbms.apply_config({'shared_buffers':'1GB'})
+        self.assertEqual(change, ChangeType.RESTART)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.changed(), {'shared_buffers':'1000000kB'})
+        self.assertEqual(self.dbms.get_value('work_mem'), '4096')
+    
+    def test_invalid_values(self):
+        """ Test rejecting invalid parameter values. """
+        self.assertFalse(self.dbms.can_set('work_mem', '25%'))
+        self.assertFalse(self.dbms.can_set('no_such_param', '1'))
+        self.dbms.apply_config({'work_mem':'1kB'})
+        self.assertEqual(self.dbms.changed(), {})
+    
+    def test_canonical_config(self):
+        """ Test normalizing configurations (e.g., for caching). """
+        canonical = self.dbms.canonical_config({
+            'work_mem':'64000kB', 'jit':'on', 'shared_buffers':'256MB', 
+            'effective_cache_size':'4GB', 'random_page_cost':'4'})
+        self.assertEqual(canonical, {
+            'shared_buffers':'32768', 'work_mem':'64000'})
+        self.assertEqual(list(canonical), ['shared_buffers', 'work_mem'])
+    
+    def test_performance(self):
+        """ Test response surfaces and memory cliff. """
+        default_ms = self._run_time()
+        self.dbms.apply_config({
+            'shared_buffers':'2GB', 'work_mem':'256MB',
+            'random_page_cost':'1.1', 'max_parallel_workers_per_gather':'8'})
+        self.dbms.reconfigure()
+        self.assertLess(self._run_time(), default_ms)
+        self.dbms.apply_config({'shared_buffers':'64GB'})
+        self.assertFalse(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.changed(), {})
+
+    def test_no_sessions(self):
+        """ Test that opening sessions fails without separate connections. """
+        self.assertIsNone(self.dbms.open_session())
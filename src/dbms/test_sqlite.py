@@ -0,0 +1,111 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.generic_dbms import ChangeType
+from dbms.sqlite import SQLiteConfig
+import os
+import tempfile
+import unittest
+
+class TestSQLiteConfig(unittest.TestCase):
+    """ Test tuning PRAGMAs of SQLite database file. """
+
+    def setUp(self):
+        """ Initialize small SQLite database in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        self.dbms = SQLiteConfig(db_path, 10)
+        self.dbms.update('create table t(a int)')
+        self.dbms.update('insert into t values (1), (2), (3)')
+
+    def tearDown(self):
+        """ Close connection and delete database file. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+
+    def test_apply_config(self):
+        """ Test that PRAGMA settings take effect after reconnecting. """
+        change = self.dbms.apply_config({'cache_size':'1000', 'threads':'2'})
+        self.assertEqual(change, ChangeType.RELOAD)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('cache_size'), 1000)
+        self.assertEqual(self.dbms.get_value('threads'), 2)
+        change = self.dbms.apply_config({'journal_mode':'wal'})
+        self.assertEqual(change, ChangeType.RELOAD)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('journal_mode'), 'wal')
+        self.assertEqual(self.dbms.get_value('cache_size'), -2000)
+        self.dbms.reset_config()
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('journal_mode'), 'delete')
+
+    def test_page_size(self):
+        """ Test rebuilding database file when changing page size. """
+        change = self.dbms.apply_config({'page_size':'8192'})
+        self.assertEqual(change, ChangeType.RESTART)
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('page_size'), 8192)
+        self.assertEqual(self.dbms.query_one('select count(*) from t'), 3)
+        self.assertFalse(self.dbms.can_set('page_size', '5000'))
+
+    def test_file_defaults(self):
+        """ Test keeping settings of existing database file by default. """
+        self.dbms.update('pragma journal_mode = wal')
+        self.dbms._disconnect()
+        self.dbms = SQLiteConfig(self.dbms.db, 10)
+        self.assertEqual(self.dbms.get_value('journal_mode'), 'wal')
+        self.assertEqual(self.dbms.param_info('journal_mode').default, 'wal')
+        self.dbms.apply_config({'journal_mode':'delete', 'page_size':'8192'})
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('journal_mode'), 'delete')
+        self.dbms.reset_config()
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('journal_mode'), 'wal')
+        self.assertEqual(self.dbms.get_value('page_size'), 4096)
+
+    def test_invalid_values(self):
+        """ Test rejecting invalid PRAGMA values. """
+        self.assertFalse(self.dbms.can_set('synchronous', '4'))
+        self.assertFalse(self.dbms.can_set('journal_mode', 'fast'))
+        self.assertFalse(self.dbms.can_set('mmap_size', '-1'))
+        self.assertFalse(self.dbms.can_set('no_such_pragma', '1'))
+        self.assertTrue(self.dbms.can_set('mmap_size', '64MB'))
+        self.assertTrue(self.dbms.can_set('cache_size', '64MB'))
+        self.assertTrue(self.dbms.can_set('threads', '4'))
+
+    def test_sizes(self):
+        """ Test converting sizes into KiB for cache and bytes for mmap. """
+        self.dbms.apply_config({'cache_size':'64MB', 'mmap_size':'1GB'})
+        self.assertTrue(self.dbms.reconfigure())
+        self.assertEqual(self.dbms.get_value('cache_size'), -65536)
+        self.assertEqual(self.dbms.config['mmap_size'], str(2**30))
+
+    def test_exec_file(self):
+        """ Test executing workload file and per-query timeout. """
+        path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        with open(path, 'w') as file:
+            file.write('select count(*) from t; select sum(a) from t;')
+        self.assertFalse(self.dbms.exec_file(path))
+        self.dbms.set_timeout(0)
+        self.assertFalse(self.dbms.update(
+            'with recursive c(x) as (select 1 union all ' \
+            'select x+1 from c where x < 100000000) select count(*) from c'))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+    def test_plan_fingerprints(self):
+        """ Test comparing query plans before reconfiguration. """
+        self.dbms.update('create table s(a int)')
+        queries = ['select * from t, s where t.a = s.a']
+        def_plans = self.dbms.plan_fingerprints(queries)
+        self.assertEqual(len(def_plans), 1)
+        self.dbms.apply_config({'automatic_index':'off'})
+        self.assertNotEqual(self.dbms.plan_fingerprints(queries), def_plans)
+        self.dbms.apply_config({'cache_size':'1000'})
+        self.assertEqual(self.dbms.plan_fingerprints(queries), def_plans)
+        self.assertIsNone(self.dbms.plan_fingerprints(['select * from x']))
+        self.assertEqual(self.dbms.plan_params(), {'automatic_index'})
@@ -0,0 +1,94 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from dbms.catalog import ParamCatalog, ParamInfo
+from dbms.validation import pg_unit_groups, ValueValidator
+import unittest
+
+class TestValueValidator(unittest.TestCase):
+    """ Test catalog-based validation of parameter values. """
+
+    def setUp(self):
+        """ Initialize validator with a few Postgres-style parameters. """
+        self.server_checks = []
+        catalog = ParamCatalog([
+            ParamInfo('shared_buffers', 'integer', '8kB', 16, 1073741823,
+                      context='postmaster'),
+            ParamInfo('work_mem', 'integer', 'kB', 64, 2147483647,
+                      context='user'),
+            ParamInfo('random_page_cost', 'real', '', 0, 1.79769e+308,
+                      context='user'),
+            ParamInfo('statement_timeout', 'integer', 'ms', 0, 2147483647,
+                      context='user'),
+            ParamInfo('enable_seqscan', 'bool', context='user'),
+            ParamInfo('wal_level', 'enum',
+                      enumvals=('minimal', 'replica', 'logical'),
+                      context='postmaster'),
+            ParamInfo('block_size', 'integer', '', 8192, 8192,
+                      context='internal'),
+            ParamInfo('search_path', 'string', context='user')],
+            case_sensitive=False)
+        self.validator = ValueValidator(
+            catalog, pg_unit_groups, self._on_server)
+
+    def _on_server(self, param, value):
+        """ Simulates server checks (accepts all values). """
+        self.server_checks.append((param, value))
+        return True
+
+    def test_units(self):
+        """ Test conversion of values with units. """
+        self.assertTrue(self.validator.can_set('shared_buffers', '4000000kB'))
+        self.assertTrue(self.validator.can_set('work_mem', '64MB'))
+        self.assertTrue(self.validator.can_set('statement_timeout', '10s'))
+        self.assertFalse(self.validator.can_set('work_mem', '10s'))
+        self.assertFalse(self.validator.can_set('work_mem', '10gb'))
+        self.assertFalse(self.validator.can_set('random_page_cost', '4kB'))
+        self.assertEqual(
+            self.validator.normalize('shared_buffers', '1MB'), '128')
+        self.assertEqual(
+            self.validator.normalize('statement_timeout', '2min'), '120000')
+
+    def test_ranges(self):
+        """ Test rejection of values outside of admissible range. """
+        self.assertFalse(self.validator.can_set('work_mem', '1kB'))
+        self.assertFalse(self.validator.can_set('shared_buffers', '8'))
+        self.assertFalse(self.validator.can_set('random_page_cost', '-1'))
+        self.assertFalse(self.validator.can_set('work_mem', '25%'))
+
+    def test_types(self):
+        """ Test Boolean, enum, internal, and unknown parameters. """
+        self.assertTrue(self.validator.can_set('enable_seqscan', 'off'))
+        self.assertFalse(self.validator.can_set('enable_seqscan', '2'))
+        self.assertTrue(self.validator.can_set('WAL_LEVEL', 'Replica'))
+        self.assertFalse(self.validator.can_set('block_size', '8192'))
+        self.assertFalse(self.validator.can_set('no_such_param', '1'))
+        self.assertEqual(self.server_checks, [])
+
+    def test_server_fallback(self):
+        """ Test server checks for undecided values and memoization. """
+        self.assertTrue(self.validator.can_set('search_path', 'public'))
+        self.assertTrue(self.validator.can_set('search_path', 'public'))
+        self.assertTrue(self.validator.can_set('work_mem', '1.5'))
+        self.assertEqual(self.server_checks, [
+            ('search_path', 'public'), ('work_mem', '1.5')])
+
+    def test_unknown_context(self):
+        """ Test verifying settability once for parameters of unknown context. """
+        catalog = ParamCatalog([ParamInfo('sort_buffer_size', 'integer')])
+        validator = ValueValidator(catalog, [], self._on_server)
+        self.assertTrue(validator.can_set('sort_buffer_size', '1000'))
+        self.assertTrue(validator.can_set('sort_buffer_size', '2000'))
+        self.assertFalse(validator.can_set('sort_buffer_size', '2000kB'))
+        self.assertEqual(self.server_checks, [('sort_buffer_size', '1000')])
+
+    def test_no_server(self):
+        """ Test rejecting undecided values without server checks. """
+        catalog = ParamCatalog([ParamInfo('level', 'integer', '', 0, 2, 
+                                          context='user')])
+        validator = ValueValidator(catalog, [], None)
+        self.assertTrue(validator.can_set('level', '1'))
+        self.assertFalse(validator.can_set('level', '1.5'))
+        self.assertFalse(validator.can_set('level', 'high'))
@@ -0,0 +1,196 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import re
+
+# Values accepted for Boolean parameters
+bool_values = {'on', 'off', 'true', 'false', 'yes', 'no', '1', '0'}
+# Number, optionally followed by a unit
+number_reg = r'(-?\d+(?:\.\d+)?)\s*([a-zA-Z]*)'
+# Postgres units for memory (scaled to bytes) and time (scaled to microseconds)
+pg_unit_groups = [
+    {'B':1, 'kB':1024, 'MB':1024**2, 'GB':1024**3, 'TB':1024**4},
+    {'us':1, 'ms':1000, 's':1000**2, 'min':60*1000**2, 
+     'h':3600*1000**2, 'd':24*3600*1000**2}]
+
+
+class ValueValidator():
+    """ Checks parameter values against catalog, avoids server round trips. """
+
+    def __init__(self, catalog, unit_groups, on_server):
+        """ Initializes validator for given parameter catalog.
+
+        Args:
+            catalog: describes types and value ranges of parameters
+            unit_groups: list of dictionaries mapping units to scale factors
+            on_server: function checking parameter and value on server
+                (None if values not decided in memory are invalid)
+        """
+        self.catalog = catalog
+        self.unit_groups = unit_groups
+        self.on_server = on_server
+        self.memo = {}
+        self.settable = set()
+        self.nr_server_checks = 0
+
+    def can_set(self, param, value):
+        """ Returns True iff parameter can be set to given value.
+
+        Decides in memory whenever possible, otherwise checks on server.
+        Results are cached for each combination of parameter and value.
+
+        Args:
+            param: name of parameter
+            value: candidate value (after unit transformations)
+
+        Returns:
+            True iff the assignment is valid
+        """
+        key = (param, str(value))
+        if key not in self.memo:
+            self.memo[key] = self._check(param, str(value))
+        return self.memo[key]
+
+    def base_value(self, param, value):
+        """ Returns numerical value in base unit (e.g., bytes).
+
+        Args:
+            param: name of parameter
+            value: parameter value (after unit transformations)
+
+        Returns:
+            float value in base unit or None if not numerical
+        """
+        info = self.catalog.info(param)
+        if info is None:
+            return None
+        scaled = self._scaled_number(info, str(value).strip())
+        if scaled is None:
+            return None
+        param_mult, param_unit = self._split_unit(info.unit)
+        for unit_to_scale in self.unit_groups:
+            if param_unit in unit_to_scale:
+                return scaled * param_mult * unit_to_scale[param_unit]
+        return scaled * param_mult
+
+    def normalize(self, param, value):
+        """ Returns value in canonical form (e.g., converted to base unit).
+
+        Args:
+            param: name of parameter
+            value: parameter value (after unit transformations)
+
+        Returns:
+            normalized value as string, unchanged value if not possible
+        """
+        value = str(value).strip()
+        info = self.catalog.info(param)
+        if info is None:
+            return value
+        if info.vartype == 'bool' and value.lower() in bool_values:
+            on = value.lower() in {'on', 'true', 'yes', '1'}
+            return 'on' if on else 'off'
+        elif info.vartype == 'enum':
+            return value.lower()
+        elif info.vartype in ['integer', 'real']:
+            scaled = self._scaled_number(info, value)
+            if scaled is not None:
+                if info.vartype == 'integer' and float(scaled).is_integer():
+                    return str(int(scaled))
+                return str(float(scaled))
+        return value
+
+    def _check(self, param, value):
+        """ Check assignment, fall back to server if undecided.
+
+        Args:
+            param: name of parameter
+            value: candidate value as string
+
+        Returns:
+            True iff the assignment is valid
+        """
+        info = self.catalog.info(param)
+        if info is None:
+            return False
+        valid = self._decide(info, value.strip())
+        if valid is None or (valid and info.context is None
+                             and param not in self.settable):
+            if self.on_server is None:
+                return bool(valid)
+            self.nr_server_checks += 1
+            valid = self.on_server(param, value)
+            if valid:
+                self.settable.add(param)
+        return valid
+
+    def _decide(self, info, value):
+        """ Decide validity in memory if possible.
+
+        Args:
+            info: describes parameter
+            value: candidate value as string
+
+        Returns:
+            True or False if decided in memory, None otherwise
+        """
+        if info.context == 'internal':
+            return False
+        if info.vartype == 'bool':
+            if value.lower() in bool_values:
+                return True
+            return False if re.fullmatch(number_reg, value) else None
+        elif info.vartype == 'enum':
+            enumvals = [e.lower() for e in info.enumvals]
+            return True if value.lower() in enumvals else None
+        elif info.vartype in ['integer', 'real']:
+            if '%' in value:
+                return False
+            if not re.fullmatch(number_reg, value):
+                return None
+            scaled = self._scaled_number(info, value)
+            if scaled is None:
+                return False
+            if info.vartype == 'integer' and not scaled.is_integer():
+                return None
+            if info.min_val is not None and scaled < info.min_val:
+                return False
+            if info.max_val is not None and scaled > info.max_val:
+                return False
+            return True
+        else:
+            return None
+
+    def _scaled_number(self, info, value):
+        """ Converts value into unit of parameter.
+
+        Args:
+            info: describes parameter
+            value: number, optionally followed by unit
+
+        Returns:
+            float value in parameter unit or None if units are incompatible
+        """
+        match = re.fullmatch(number_reg, value)
+        if not match:
+            return None
+        number = float(match.group(1))
+        unit = match.group(2)
+        if not unit:
+            return number
+        param_mult, param_unit = self._split_unit(info.unit)
+        for unit_to_scale in self.unit_groups:
+            if unit in unit_to_scale and param_unit in unit_to_scale:
+                base_val = number * unit_to_scale[unit]
+                return base_val / (param_mult * unit_to_scale[param_unit])
+        return None
+
+    def _split_unit(self, unit):
+        """ Splits parameter unit (e.g., 8kB) into multiplier and unit. """
+        match = re.fullmatch(r'(\d*)\s*([a-zA-Z]*)', unit or '')
+        if not match:
+            return 1, ''
+        mult = int(match.group(1)) if match.group(1) else 1
+        return mult, match.group(2)
@@ -13,6 +13,7 @@ import pandas as pd
 import parameters.util
 import re
 import torch
+import nlp.batching
 import nlp.nlp_util
 from dbms.generic_dbms import ConfigurableDBMS
 from sentence_transformers import SentenceTransformer, util
@@ -79,7 +80,7 @@ class DocCollection():
         device=models.util.torch_device())
 
     def __init__(self, docs_path, dbms:ConfigurableDBMS, 
-                 size_threshold, filter_params, use_implicit):
+                 size_threshold, filter_params, use_implicit, batch_size=8):
         """ Reads tuning passages from a file. 
         
         Reads passages containing tuning hints from a text. Tries
@@ -92,9 +93,12 @@ class DocCollection():
             size_threshold: start new passage after so many tokens.
             filter_params: whether to filter hints by their parameters.
             use_implicit: whether to consider implicit hints.
+            batch_size: number of model inputs per batch (question-context
+                pairs for extraction, passage-label pairs for classification).
         """
         self.dbms = dbms
         self.size_threshold = size_threshold
+        self.batch_size = batch_size
         self.filter_params = True if filter_params == 1 else False
         print(f'Discard text passages without at least one ' \
               f'explicit parameter reference: ' \
@@ -117,6 +121,8 @@ class DocCollection():
             self.nr_passages.append(len(passages))
         # Prepare caching of tuning hints
         self.doc_to_hints = {}
+        # Extract hints from all documents together (batched inference)
+        self._create_hints(range(self.nr_docs))
         # Calculate statistics
         self.asg_counts, self.param_counts = self._assignment_stats()
         # Sort hints by parameter
@@ -211,11 +217,24 @@ class DocCollection():
         Returns:
             List of candidate tuning hints.
         """
-        if doc_id in self.doc_to_hints:
-            return self.doc_to_hints[doc_id]
-        else:
+        if doc_id not in self.doc_to_hints:
+            self._create_hints([doc_id])
+        return self.doc_to_hints[doc_id]
+    
+    def _create_hints(self, doc_ids):
+        """ Extracts candidate tuning hints from given documents.
+        
+        Recommended values are extracted for all parameters and passages
+        of all documents at once, relative values are classified at once
+        as well (enabling batched inference).
+        
+        Args:
+            doc_ids: store hints extracted from those documents
+        """
+        requests = []
+        for doc_id in doc_ids:
             print(f'Creating hints for document {doc_id}')
-            hints = []
+            self.doc_to_hints[doc_id] = []
             passages = self.passages_by_doc[doc_id]
             for passage in passages:
                 if self.use_implicit:
@@ -229,27 +248,35 @@ class DocCollection():
                 p_names = set([p.group() for p in params])
                 for p_name in p_names:
                     if not self.filter_params or self.dbms.is_param(p_name):
-                        answer, score = self._extract_value(p_name, exp_passage)
-                        if score > 0.05:
-                        # if score > 0:
-                            values = re.finditer(
-                                parameters.util.value_reg, answer)
-                            for value in values:
-                                hint_type = self._classify_hint(
-                                    p_name, passage, value)
-                                param = re.search(p_name, exp_passage)
-                                hint = TuningHint(
-                                    doc_id, exp_passage, answer, 
-                                    param, value, hint_type)
-                                hints.append(hint)
-                                print(f'Adding hint {hint} with confidence {score}')
-                        else:
-                            print(
-                                f'Excluding recommendation "{answer}" for ' \
-                                f'parameter "{p_name}" due to low confidence ' \
-                                f'({score})')
-            self.doc_to_hints[doc_id] = hints
-            return hints
+                        requests.append((doc_id, passage, exp_passage, p_name))
+        
+        recommendations = self._extract_values(
+            [(p_name, exp_passage) for _, _, exp_passage, p_name in requests])
+        new_hints = []
+        relative = []
+        for (doc_id, passage, exp_passage, p_name), (answer, score) in zip(
+            requests, recommendations):
+            if score > 0.05:
+            # if score > 0:
+                values = re.finditer(parameters.util.value_reg, answer)
+                for value in values:
+                    param = re.search(p_name, exp_passage)
+                    hint = TuningHint(
+                        doc_id, exp_passage, answer, 
+                        param, value, HintType.ABSOLUTE)
+                    new_hints.append((hint, score))
+                    if '%' in value.group():
+                        relative.append((hint, p_name, passage))
+            else:
+                print(
+                    f'Excluding recommendation "{answer}" for ' \
+                    f'parameter "{p_name}" due to low confidence ' \
+                    f'({score})')
+        
+        self._classify_hints(relative)
+        for hint, score in new_hints:
+            self.doc_to_hints[hint.doc_id].append(hint)
+            print(f'Adding hint {hint} with confidence {score}')
         
     def _assignment_stats(self):
         """ Generate statistics on candidate parameter assignments. """
@@ -269,48 +296,61 @@ class DocCollection():
                 param_counter.update([param])
         return asg_counter, param_counter
     
-    def _classify_hint(self, p_name, passage, value):
-        """ Classifies hint depending on recommendation type.
+    def _classify_hints(self, hints):
+        """ Classifies relative hints by the resource they refer to.
         
         Args:
-            p_name: name of parameter
-            passage: text recommending values
-            value: one specific recommended value
+            hints: list of tuples (hint recommending a percentage,
+                parameter name, and text recommending values)
         """
-        value_str = value.group()
-        if '%' in value_str:
-            resources = ['Disk', 'RAM', 'Cores']
+        resources = ['Disk', 'RAM', 'Cores']
+        hint_types = [
+            HintType.DISK_RATIO, HintType.RAM_RATIO, HintType.CORES_RATIO]
+        requests = []
+        for hint, p_name, passage in hints:
+            value_str = hint.value.group()
             labels = [f'{p_name}: {value_str} ({r})' for r in resources]
-            result = self.zsc_pipeline(passage, labels)
+            requests.append((passage, labels))
+        
+        results = nlp.batching.classify_zero_shot(
+            self.zsc_pipeline, requests, self.batch_size)
+        for (hint, _, _), (_, labels), result in zip(
+            hints, requests, results):
             winner_label = result['labels'][0]
-            winner_idx = labels.index(winner_label)
-            if winner_idx == 0:
-                return HintType.DISK_RATIO
-            elif winner_idx == 1:
-                return HintType.RAM_RATIO
-            elif winner_idx == 2:
-                return HintType.CORES_RATIO
-            else:
+            if winner_label not in labels:
                 raise ValueError(f'Unknown label "{winner_label}"')
-        else:
-            return HintType.ABSOLUTE
+            hint.hint_type = hint_types[labels.index(winner_label)]
 
-    def _extract_value(self, p_name, passage):
-        """ Extracts recommended parameter value from passage.
+    def _extract_values(self, requests):
+        """ Extracts recommended values for multiple parameters and passages.
+        
+        Requests are processed in batches of similar length (see 
+        nlp.batching.answer_questions), results match the ones obtained
+        by passing each request separately to the pipeline.
+        
+        Args:
+            requests: list of tuples (parameter name and passage)
+        
+        Returns:
+            list of tuples: recommendation, confidence (for each request)
+        """
+        qa_inputs = [self._qa_input(p, c) for p, c in requests]
+        qa_results = nlp.batching.answer_questions(
+            self.qa_pipeline, qa_inputs, self.batch_size)
+        return [(r['answer'], r['score']) for r in qa_results]
+    
+    def _qa_input(self, p_name, passage):
+        """ Returns question-answering input for extracting values.
         
         Args:
             p_name: name of parameter for which to extract values
             passage: extract recommendations from this passage
         
         Returns:
-            tuple: recommendation, confidence
+            dictionary with question and context
         """
         question = f'Which values are recommended for {p_name}?'
-        qa_input = {'question': question, 'context': passage}
-        qa_result = self.qa_pipeline(qa_input)
-        answer = qa_result['answer']
-        score = qa_result['score']
-        return answer, score
+        return {'question': question, 'context': passage}
     
     def _hints_by_param(self):
         """ Maps parameters to corresponding hints. """
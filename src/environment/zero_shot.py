@@ -75,7 +75,8 @@ class NlpTuningEnv(gym.Env):
     
     def __init__(
             self, docs, max_length, hint_order, dbms, benchmark, hardware, 
-            hints_per_episode, nr_evals, scale_perf, scale_asg, objective):
+            hints_per_episode, nr_evals, scale_perf, scale_asg, objective,
+            halving_eta=None, screen_plans=False, objective_weights=None):
         """ Initialize from given tuning documents, database, and benchmark. 
         
         Args:
@@ -90,6 +91,12 @@ class NlpTuningEnv(gym.Env):
             scale_perf: scale performance reward by this factor
             scale_asg: scale reward for successful assignments
             objective: describes the optimization goal
+            halving_eta: pre-select configurations by successive halving
+                over query samples with this factor (disabled if None)
+            screen_plans: skip benchmark runs for configurations leading
+                to the same query plans as measured configurations
+            objective_weights: weights of metrics for multi-objective tuning
+                (optimize for given objective only if None)
         """
         self.docs = docs
         self.max_length = max_length
@@ -102,7 +109,8 @@ class NlpTuningEnv(gym.Env):
         self.scale_perf = scale_perf
         self.scale_asg = scale_asg
         self.explorer = search.search_with_hints.ParameterExplorer(
-            dbms, benchmark, objective)
+            dbms, benchmark, objective, halving_eta, screen_plans,
+            objective_weights)
         self.decision = DecisionType.PICK_FACTOR
         self.factors = [0.25, 0.5, 1, 2, 4]
         self.weights = [1, 2, 4, 8, 16]
@@ -0,0 +1,217 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import numpy as np
+import torch
+
+# Default settings of question answering pipeline
+qa_max_seq_len = 384
+qa_doc_stride = 128
+qa_max_answer_len = 15
+# Default template turning labels into hypotheses for zero-shot classification
+zsc_hypothesis = 'This example is {}.'
+
+
+def answer_questions(qa_pipeline, qa_inputs, batch_size):
+    """ Answers questions about contexts in batches.
+
+    Inputs are tokenized as by the pipeline, sorted by their number of
+    tokens, and grouped into batches. Spans of all inputs in a batch are
+    padded to the same length and processed by one forward pass. Answers
+    are decoded as by the pipeline (padding is masked), hence results
+    are the same as for single inputs (up to floating point rounding).
+    Inputs are processed one by one if the batch size is one or if the
+    tokenizer is not a fast tokenizer padding on the right.
+
+    Args:
+        qa_pipeline: question answering pipeline
+        qa_inputs: list of dictionaries with question and context
+        batch_size: maximal number of inputs per batch
+
+    Returns:
+        list of dictionaries with answer and score (one per input)
+    """
+    tokenizer = qa_pipeline.tokenizer
+    if batch_size <= 1 or not tokenizer.is_fast or \
+        tokenizer.padding_side != 'right':
+        return [qa_pipeline(qa_input) for qa_input in qa_inputs]
+    encodings = [_encode_qa(tokenizer, qa_input) for qa_input in qa_inputs]
+    by_length = sorted(
+        range(len(qa_inputs)),
+        key=lambda i:encodings[i][0]['input_ids'].shape[1])
+    results = [None] * len(qa_inputs)
+    for start in range(0, len(by_length), batch_size):
+        batch = by_length[start:start+batch_size]
+        answers = _answer_batch(
+            qa_pipeline, [qa_inputs[i]['context'] for i in batch],
+            [encodings[i] for i in batch])
+        for i, answer in zip(batch, answers):
+            results[i] = answer
+    return results
+
+
+def classify_zero_shot(zsc_pipeline, requests, batch_size):
+    """ Classifies sequences among their candidate labels in batches.
+
+    Each request is turned into one premise-hypothesis pair per label.
+    Pairs of all requests are sorted by their number of tokens, padded,
+    and processed in batches. Entailment scores are normalized per
+    request as by the pipeline (padding is masked), hence results are the
+    same as for single requests (up to floating point rounding).
+
+    Args:
+        zsc_pipeline: zero-shot classification pipeline
+        requests: list of tuples (sequence and list of candidate labels)
+        batch_size: maximal number of premise-hypothesis pairs per batch
+
+    Returns:
+        list of dictionaries with sequence, labels, and scores (labels
+            sorted by decreasing score), one per request
+    """
+    if batch_size <= 1:
+        return [zsc_pipeline(sequence, labels) for sequence, labels in requests]
+    tokenizer = zsc_pipeline.tokenizer
+    pairs = [[sequence, zsc_hypothesis.format(label)]
+             for sequence, labels in requests for label in labels]
+    by_length = sorted(
+        range(len(pairs)), key=lambda i:len(tokenizer(*pairs[i])['input_ids']))
+    logits = [None] * len(pairs)
+    for start in range(0, len(by_length), batch_size):
+        batch = by_length[start:start+batch_size]
+        inputs = tokenizer(
+            [pairs[i] for i in batch], add_special_tokens=True,
+            return_tensors='pt', padding=True, truncation='only_first')
+        for i, pair_logits in zip(batch, zsc_pipeline._forward(inputs)):
+            logits[i] = pair_logits
+
+    results = []
+    pair_offset = 0
+    for sequence, labels in requests:
+        request_logits = np.array(logits[pair_offset:pair_offset+len(labels)])
+        pair_offset += len(labels)
+        entailment_id = zsc_pipeline.entailment_id
+        if len(labels) == 1:
+            # Entailment versus contradiction for single labels
+            contradiction_id = -1 if entailment_id == 0 else 0
+            entail_contr = request_logits[..., [contradiction_id, entailment_id]]
+            scores = np.exp(entail_contr) / \
+                np.exp(entail_contr).sum(-1, keepdims=True)
+            scores = scores[..., 1]
+        else:
+            entail_logits = request_logits[..., entailment_id]
+            scores = np.exp(entail_logits) / \
+                np.exp(entail_logits).sum(-1, keepdims=True)
+        top_inds = list(reversed(scores.argsort()))
+        results.append({
+            'sequence': sequence, 'labels': [labels[i] for i in top_inds],
+            'scores': scores[top_inds].tolist()})
+    return results
+
+
+def _answer_batch(qa_pipeline, contexts, encodings):
+    """ Returns most likely answer for each encoded input.
+
+    Args:
+        qa_pipeline: question answering pipeline
+        contexts: context of each input
+        encodings: encoded spans and answer masks of each input
+
+    Returns:
+        list of dictionaries with answer and score (one per input)
+    """
+    tokenizer = qa_pipeline.tokenizer
+    max_length = max(e['input_ids'].shape[1] for e, _ in encodings)
+    fw_args = {}
+    for name in tokenizer.model_input_names:
+        pad_value = tokenizer.pad_token_id if name == 'input_ids' else 0
+        padded = [np.pad(
+            e[name], ((0, 0), (0, max_length - e[name].shape[1])),
+            constant_values=pad_value) for e, _ in encodings]
+        fw_args[name] = torch.tensor(
+            np.concatenate(padded), device=qa_pipeline.device).long()
+    with qa_pipeline.device_placement():
+        with torch.no_grad():
+            start, end = qa_pipeline.model(**fw_args)[:2]
+            start, end = start.cpu().numpy(), end.cpu().numpy()
+
+    results = []
+    span_offset = 0
+    for context, (encoded, p_mask) in zip(contexts, encodings):
+        length = encoded['input_ids'].shape[1]
+        answers = []
+        for span_idx in range(len(encoded['input_ids'])):
+            span_start = start[span_offset + span_idx][:length]
+            span_end = end[span_offset + span_idx][:length]
+            answers += _decode_span(
+                qa_pipeline, context, encoded, span_idx,
+                p_mask[span_idx], span_start, span_end)
+        span_offset += len(encoded['input_ids'])
+        results.append(sorted(answers, key=lambda a:a['score'], reverse=True)[0])
+    return results
+
+
+def _decode_span(
+        qa_pipeline, context, encoded, span_idx, p_mask, start, end):
+    """ Decodes most likely answer in one span (as the pipeline does).
+
+    Args:
+        qa_pipeline: question answering pipeline
+        context: context from which the answer is taken
+        encoded: encoded spans of input
+        span_idx: index of span within encoded input
+        p_mask: one for tokens that cannot be part of the answer
+        start: logits of answer start for each token of span
+        end: logits of answer end for each token of span
+
+    Returns:
+        list with dictionary describing answer and score
+    """
+    # Padding and question tokens cannot be part of the answer
+    undesired_tokens = np.abs(np.array(p_mask) - 1) & \
+        encoded['attention_mask'][span_idx]
+    undesired_tokens_mask = undesired_tokens == 0.0
+    start = np.where(undesired_tokens_mask, -10000.0, start)
+    end = np.where(undesired_tokens_mask, -10000.0, end)
+    start = np.exp(start - np.log(np.sum(np.exp(start), axis=-1, keepdims=True)))
+    end = np.exp(end - np.log(np.sum(np.exp(end), axis=-1, keepdims=True)))
+    start[0] = end[0] = 0.0
+    starts, ends, scores = qa_pipeline.decode(start, end, 1, qa_max_answer_len)
+    enc = encoded[span_idx]
+    answers = []
+    for s, e, score in zip(starts, ends, scores):
+        char_start = enc.word_to_chars(enc.token_to_word(s), sequence_index=1)[0]
+        char_end = enc.word_to_chars(enc.token_to_word(e), sequence_index=1)[1]
+        answers.append({
+            'score': score.item(), 'start': char_start, 'end': char_end,
+            'answer': context[char_start:char_end]})
+    return answers
+
+
+def _encode_qa(tokenizer, qa_input):
+    """ Encodes question and context into spans (as the pipeline does).
+
+    Args:
+        tokenizer: fast tokenizer, padding on the right
+        qa_input: dictionary with question and context
+
+    Returns:
+        tuple: encoded spans and masks of tokens that cannot be answers
+    """
+    encoded = tokenizer(
+        text=qa_input['question'], text_pair=qa_input['context'],
+        padding='longest', truncation='only_second',
+        max_length=qa_max_seq_len, stride=qa_doc_stride,
+        return_tensors='np', return_token_type_ids=True,
+        return_overflowing_tokens=True, return_offsets_mapping=True,
+        return_special_tokens_mask=True)
+    nr_spans = len(encoded['input_ids'])
+    p_mask = np.asarray([
+        [tok != 1 for tok in encoded.sequence_ids(span_idx)]
+        for span_idx in range(nr_spans)])
+    # Keep classification token (indicates unanswerable questions)
+    if tokenizer.cls_token_id is not None:
+        cls_index = np.nonzero(encoded['input_ids'] == tokenizer.cls_token_id)
+        p_mask[cls_index] = 0
+    return encoded, p_mask
@@ -0,0 +1,117 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+import importlib.util
+import random
+import unittest
+
+# Language models require torch and transformers (see requirements.txt)
+has_models = importlib.util.find_spec('torch') is not None and \
+    importlib.util.find_spec('transformers') is not None
+if has_models:
+    import nlp.batching
+    import torch
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+    from tokenizers.processors import TemplateProcessing
+    from transformers import (
+        BartConfig, BartForSequenceClassification, PreTrainedTokenizerFast,
+        QuestionAnsweringPipeline, RobertaConfig, RobertaForQuestionAnswering,
+        ZeroShotClassificationPipeline)
+
+# Words used in generated texts
+words = [f'w{i}' for i in range(50)]
+
+
+def stub_tokenizer():
+    """ Returns fast word-level tokenizer adding special tokens as RoBERTa. """
+    special = ['<s>', '<pad>', '</s>', '<unk>']
+    vocab = {t:i for i, t in enumerate(special + words + ['.', '?', '%'])}
+    tokenizer = Tokenizer(WordLevel(vocab, unk_token='<unk>'))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.post_processor = TemplateProcessing(
+        single='<s> $A </s>', pair='<s> $A </s> </s> $B </s>',
+        special_tokens=[('<s>', 0), ('</s>', 2)])
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token='<s>', eos_token='</s>',
+        cls_token='<s>', sep_token='</s>', pad_token='<pad>',
+        unk_token='<unk>', model_input_names=['input_ids', 'attention_mask'])
+
+
+def stub_text(rng, nr_words):
+    """ Returns text consisting of random words. """
+    return ' '.join(rng.choice(words) for _ in range(nr_words))
+
+
+@unittest.skipUnless(has_models, 'requires torch and transformers')
+class TestBatching(unittest.TestCase):
+    """ Test that batched inference yields the results of the pipelines. """
+
+    def setUp(self):
+        """ Initialize pipelines with small, randomly initialized models. """
+        torch.manual_seed(0)
+        self.rng = random.Random(0)
+        tokenizer = stub_tokenizer()
+        sizes = {'vocab_size':len(tokenizer), 'max_position_embeddings':600}
+        qa_config = RobertaConfig(
+            hidden_size=16, num_hidden_layers=2, num_attention_heads=2,
+            intermediate_size=32, type_vocab_size=1, **sizes)
+        self.qa_pipeline = QuestionAnsweringPipeline(
+            model=RobertaForQuestionAnswering(qa_config).eval(),
+            tokenizer=tokenizer, framework='pt')
+        labels = {0:'contradiction', 1:'neutral', 2:'entailment'}
+        zsc_config = BartConfig(
+            d_model=16, encoder_layers=1, decoder_layers=1,
+            encoder_attention_heads=2, decoder_attention_heads=2,
+            encoder_ffn_dim=32, decoder_ffn_dim=32, id2label=labels,
+            label2id={l:i for i, l in labels.items()}, **sizes)
+        self.zsc_pipeline = ZeroShotClassificationPipeline(
+            model=BartForSequenceClassification(zsc_config).eval(),
+            tokenizer=tokenizer, framework='pt')
+
+    def test_answer_questions(self):
+        """ Test answering questions about contexts of different lengths. """
+        # Long contexts are split into multiple spans
+        lengths = [3, 40, 7, 500, 20, 1, 60]
+        qa_inputs = [
+            {'question':f'what is {stub_text(self.rng, 2)} ?',
+             'context':stub_text(self.rng, l)} for l in lengths]
+        expected = [self.qa_pipeline(qa_input) for qa_input in qa_inputs]
+        for batch_size in [1, 3, 8]:
+            answers = nlp.batching.answer_questions(
+                self.qa_pipeline, qa_inputs, batch_size)
+            self.assertEqual(len(answers), len(expected))
+            for answer, exp_answer in zip(answers, expected):
+                self.assertEqual(answer['answer'], exp_answer['answer'])
+                self.assertEqual(answer['start'], exp_answer['start'])
+                self.assertEqual(answer['end'], exp_answer['end'])
+                self.assertAlmostEqual(
+                    answer['score'], exp_answer['score'], places=5)
+
+    def test_classify_zero_shot(self):
+        """ Test classifying passages of different lengths among labels. """
+        requests = []
+        for length in [12, 3, 30, 8, 1]:
+            p_name = self.rng.choice(words)
+            labels = [f'{p_name} : 25 % ( {r} )' for r in ['w1', 'w2', 'w3']]
+            requests.append((stub_text(self.rng, length), labels))
+        # Single labels are scored against contradiction
+        requests.append((stub_text(self.rng, 5), ['w4']))
+        expected = [self.zsc_pipeline(s, l) for s, l in requests]
+        for batch_size in [1, 4, 20]:
+            results = nlp.batching.classify_zero_shot(
+                self.zsc_pipeline, requests, batch_size)
+            self.assertEqual(len(results), len(expected))
+            for result, exp_result in zip(results, expected):
+                self.assertEqual(result['sequence'], exp_result['sequence'])
+                self.assertEqual(result['labels'], exp_result['labels'])
+                for score, exp_score in zip(
+                    result['scores'], exp_result['scores']):
+                    self.assertAlmostEqual(score, exp_score, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
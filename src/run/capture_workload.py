@@ -0,0 +1,40 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from benchmark.capture import capture_workload, write_workload
+
+import argparse
+import dbms.factory
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'dbms', type=str, choices={'pg', 'ms'},
+        help='Set to "pg" for PostgreSQL, "ms" for MySQL')
+    parser.add_argument('db_name', type=str, help='Name of database to capture')
+    parser.add_argument('db_user', type=str, help='Name of database login')
+    parser.add_argument('db_pwd', type=str, help='Password for database login')
+    parser.add_argument(
+        'query_path', type=str, help='Write weighted workload into this file')
+    parser.add_argument(
+        '--nr_statements', type=int, default=20,
+        help='Capture that many statements with highest total time')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed for selecting values of query parameters')
+    parser.add_argument(
+        '--timeout_s', type=int, default=60, help='Per-query timeout in seconds')
+    args = parser.parse_args()
+    print(f'Input arguments: {args}')
+
+    # Capturing neither restarts nor recovers the server
+    args.restart_cmd = None
+    args.recover_cmd = None
+    dbms = dbms.factory.from_args(args)
+    statements = capture_workload(dbms, args.nr_statements, args.seed)
+    write_workload(args.query_path, statements)
+    print(f'Wrote {len(statements)} statements to {args.query_path}')
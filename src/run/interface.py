@@ -219,7 +219,8 @@ if st.button('Start Tuning'):
     st.write(f'Pre-processing input text at "{path_to_docs}" ...')
     docs = DocCollection(
         docs_path=path_to_docs, dbms=dbms, size_threshold=max_length,
-        use_implicit=use_implicit, filter_params=filter_params)
+        use_implicit=use_implicit, filter_params=filter_params,
+        batch_size=min_batch_size)
     st.write('Pre-processing of input text is finished.')
     
     st.markdown('### Extracted Tuning Hints')
@@ -8,6 +8,7 @@ from pybullet_utils.util import set_global_seeds
 import argparse
 import benchmark.factory
 import dbms.factory
+import search.objectives
 import numpy as np
 import random
 import time
@@ -59,8 +60,10 @@ if __name__ == '__main__':
     parser.add_argument(
         'cores', type=int, default=8, help='Number of cores of target system')
     parser.add_argument(
-        'dbms', type=str, choices={'pg', 'ms'},
-        help='Set to "pg" to tune PostgreSQL, "ms" to tune MySQL')
+        'dbms', type=str, choices={'pg', 'ms', 'sqlite', 'duck', 'sim'},
+        help='Set to "pg" to tune PostgreSQL, "ms" to tune MySQL, ' \
+            '"sqlite" to tune SQLite, "duck" to tune DuckDB, ' \
+            '"sim" to tune a simulated DBMS')
     parser.add_argument('db_name', type=str, help='Name of database to tune')
     parser.add_argument('db_user', type=str, help='Name of database login')
     parser.add_argument('db_pwd', type=str, help='Password for database login')
@@ -74,6 +77,19 @@ if __name__ == '__main__':
     parser.add_argument(
         'query_path', type=str, default=None, 
         help='Path to file containing SQL queries')
+    parser.add_argument(
+        '--sim_model', type=str, default=None,
+        help='Path to JSON file with performance model for simulated DBMS')
+    benchmark.factory.add_arguments(parser)
+    parser.add_argument(
+        '--objective_weights', type=str, default=None,
+        help='Weighted metrics for multi-objective tuning (e.g., time:1)')
+    parser.add_argument(
+        '--halving_eta', type=float, default=None,
+        help='Pre-select configurations via successive halving over queries')
+    parser.add_argument(
+        '--screen_plans', type=int, default=0, choices={0, 1},
+        help='Set to 1 to skip runs of configurations with known query plans')
     parser.add_argument(
         '--nr_runs', type=int, default=1, help='Number of benchmark runs')
     parser.add_argument(
@@ -97,6 +113,10 @@ if __name__ == '__main__':
     
     dbms = dbms.factory.from_args(args)
     objective, bench = benchmark.factory.from_args(args, dbms)
+    objective_weights = None
+    if args.objective_weights is not None:
+        objective_weights = search.objectives.parse_weights(
+            args.objective_weights)
     
     for run_ctr in range(args.nr_runs):
         # Initialize for new run
@@ -109,7 +129,8 @@ if __name__ == '__main__':
             docs_path=args.text_source_path, dbms=dbms, 
             size_threshold=args.max_length,
             use_implicit=args.use_implicit, 
-            filter_params=args.filter_params)
+            filter_params=args.filter_params,
+            batch_size=args.min_batch_size)
         
         # Initialize environment
         set_random_seed(0)
@@ -123,7 +144,9 @@ if __name__ == '__main__':
             dbms=dbms, benchmark=bench, hardware=hardware, 
             hints_per_episode=args.nr_hints, nr_evals=args.nr_evaluations, 
             scale_perf=args.performance_scaling, 
-            scale_asg=args.assignment_scaling, objective=objective)
+            scale_asg=args.assignment_scaling, objective=objective,
+            halving_eta=args.halving_eta, screen_plans=args.screen_plans,
+            objective_weights=objective_weights)
         unsupervised_env.reset()
         
         # Initialize agents
@@ -19,7 +19,7 @@ import torch
 from analysis.util import get_analysis_logger, TimerStruct  # noqa
 from analysis.ddpg.ddpg import DDPG  # noqa
 from parameters.util import decompose_val, is_numerical
-from search.objectives import calculate_reward
+from search.objectives import calculate_reward, uses_latency
 
 
 class DDPGenv(object):
@@ -46,6 +46,8 @@ class DDPGenv(object):
         self.knob_units = []
         self.metric_dim = 1
         self._set_val_ranges()
+        if uses_latency(objective):
+            self.benchmark.track_latency()
         self.dbms.reset_config()
         self.dbms.reconfigure()
         self.def_metrics = self.benchmark.evaluate()
@@ -79,17 +81,17 @@ class DDPGenv(object):
         Returns:
             reward values (twice).
         """
-        self.dbms.reset_config()
+        config = {}
         for i in range(self.knob_dim):
             knob = self.knob_names[i]
             min_ = self.knobs_min[i]
             max_ = self.knobs_max[i]
             int_val = int(round(min_ + (max_ - min_) * knob_data[i]))
             unit = self.knob_units[i]
-            value = str(int_val) + unit
-            print(f'Setting {knob} to {value}')
-            success = self.dbms.set_param_smart(knob, value)
-            print(f'Set successful: {success}')
+            config[knob] = str(int_val) + unit
+        print(f'Setting knobs to {config}')
+        self.dbms.apply_config(config)
+        print(f'Set successfully: {self.dbms.changed()}')
         self.dbms.reconfigure()
         metrics = self.benchmark.evaluate()
         reward_val = calculate_reward(metrics, self.def_metrics, self.objective)
@@ -128,8 +130,10 @@ if __name__ == '__main__':
     parser.add_argument(
         '--timeout_s', type=int, default=1500, help='Tuning timeout in seconds')
     parser.add_argument(
-        'dbms', type=str, choices={'pg', 'ms'},
-        help='Set to "pg" to tune PostgreSQL, "ms" to tune MySQL')
+        'dbms', type=str, choices={'pg', 'ms', 'sqlite', 'duck', 'sim'},
+        help='Set to "pg" to tune PostgreSQL, "ms" to tune MySQL, ' \
+            '"sqlite" to tune SQLite, "duck" to tune DuckDB, ' \
+            '"sim" to tune a simulated DBMS')
     parser.add_argument('db_name', type=str, help='Name of database to tune')
     parser.add_argument('db_user', type=str, help='Name of database login')
     parser.add_argument('db_pwd', type=str, help='Password for database login')
@@ -143,6 +147,10 @@ if __name__ == '__main__':
     parser.add_argument(
         'query_path', type=str, default=None, 
         help='Path to file containing SQL queries')
+    parser.add_argument(
+        '--sim_model', type=str, default=None,
+        help='Path to JSON file with performance model for simulated DBMS')
+    benchmark.factory.add_arguments(parser)
     parser.add_argument(
         '--nr_runs', type=int, default=1, help='Number of benchmark runs')
     parser.add_argument(
@@ -3,13 +3,27 @@ Created on Apr 24, 2021
 
 @author: immanueltrummer
 '''
+from benchmark.sketch import QuantileSketch
 from enum import IntEnum
+import math
+
+# Quantile of normal distribution for two-sided 95% confidence
+z_95 = 1.96
 
 class Objective(IntEnum):
     """ The optimization objective (e.g., latency). """
     
     TIME = 0,  # minimize execution time
     THROUGHPUT = 1,  # maximize throughput
+    P95_LATENCY = 2,  # minimize 95th percentile of query/transaction latency
+    P99_LATENCY = 3,  # minimize 99th percentile of query/transaction latency
+
+# Fraction of latency samples below percentile for latency objectives
+latency_fractions = {Objective.P95_LATENCY:0.95, Objective.P99_LATENCY:0.99}
+# Metrics for multi-objective tuning (1: maximize, -1: minimize)
+metric_senses = {
+    'time':-1, 'throughput':1, 'p95_latency':-1, 'p99_latency':-1,
+    'peak_rss':-1, 'config_memory':-1}
             
 def from_file(config):
     """ Parse objective from configuration file. 
@@ -20,18 +34,142 @@ def from_file(config):
     Returns:
         objective as parsed from file
     """
-    obj_str = config['BENCHMARK']['objective']
+    return from_name(config['BENCHMARK']['objective'])
+
+def from_name(obj_str):
+    """ Parse objective from its name (e.g., "time" or "p95_latency"). """
     if obj_str == 'time':
         return Objective.TIME
     elif obj_str == 'throughput':
         return Objective.THROUGHPUT
+    elif obj_str == 'p95_latency':
+        return Objective.P95_LATENCY
+    elif obj_str == 'p99_latency':
+        return Objective.P99_LATENCY
     
 def calculate_reward(metrics, default_metrics, objective):
-    """ Returns reward metrics, given objectives and metrics. """
+    """ Returns reward metrics, given objectives and metrics. 
+    
+    Censored metrics stem from runs that were aborted early, they only
+    bound performance (e.g., a lower bound on execution time). Such runs
+    never count as improvement over the default configuration. If both
+    metrics stem from repeated measurements, differences that are not
+    statistically significant (at 95% confidence) yield zero reward.
+    
+    Latency percentiles are taken from the latency sketches of both
+    metrics (zero reward if either of them has no sketch).
+    """
     if metrics['error']:
         return -10000
     else:
         if objective == Objective.TIME:
-            return default_metrics['time'] - metrics['time']
+            reward = default_metrics['time'] - metrics['time']
         elif objective == Objective.THROUGHPUT:
-            return metrics['throughput'] - default_metrics['throughput']
\ No newline at end of file
+            reward = metrics['throughput'] - default_metrics['throughput']
+        elif objective in latency_fractions:
+            fraction = latency_fractions[objective]
+            latency = _latency(metrics, fraction)
+            def_latency = _latency(default_metrics, fraction)
+            if latency is None or def_latency is None:
+                return 0
+            reward = def_latency - latency
+        if metrics.get('censored', False):
+            reward = min(reward, 0)
+        # Variance refers to run time or throughput
+        if objective not in latency_fractions and \
+            abs(reward) < z_95 * _std_error(metrics, default_metrics):
+            reward = 0
+        return reward
+
+def parse_weights(weights_str):
+    """ Parses weights of metrics for multi-objective tuning.
+    
+    Args:
+        weights_str: comma-separated pairs of metric and weight such as
+            "time:1,peak_rss:0.5" (see metric_senses for metrics)
+    
+    Returns:
+        dictionary mapping metrics to weights
+    """
+    weights = {}
+    for pair in weights_str.split(','):
+        metric, weight = pair.split(':')
+        metric = metric.strip()
+        if metric not in metric_senses:
+            raise ValueError(f'Unknown metric for tuning: {metric}')
+        weights[metric] = float(weight)
+    return weights
+
+def uses_latency(objective, weights=None):
+    """ Returns True iff objective or weighted metrics refer to latency.
+    
+    Args:
+        objective: optimization objective
+        weights: weights of metrics for multi-objective tuning (or None)
+    """
+    latency_metrics = ['p95_latency', 'p99_latency']
+    return objective in latency_fractions or \
+        any(m in (weights or {}) for m in latency_metrics)
+
+def metric_values(metrics):
+    """ Returns values of metrics for multi-objective tuning.
+    
+    Args:
+        metrics: benchmark results, possibly with resource consumption
+    
+    Returns:
+        dictionary mapping metrics (see metric_senses) to values or None
+    """
+    values = {m:metrics.get(m) for m in metric_senses}
+    values['p95_latency'] = _latency(metrics, 0.95)
+    values['p99_latency'] = _latency(metrics, 0.99)
+    return values
+
+def scalarized_reward(metrics, default_metrics, weights):
+    """ Returns weighted sum of relative improvements (in percent).
+    
+    Each metric contributes its improvement over the default configuration,
+    relative to its default value. Metrics that are unavailable for either
+    configuration do not contribute. Failed and censored runs are treated 
+    as in calculate_reward.
+    
+    Args:
+        metrics: benchmark results of current configuration
+        default_metrics: benchmark results of default configuration
+        weights: maps metrics to weights (see parse_weights)
+    
+    Returns:
+        scalarized reward
+    """
+    if metrics['error']:
+        return -10000
+    values = metric_values(metrics)
+    def_values = metric_values(default_metrics)
+    reward = 0
+    for metric, weight in weights.items():
+        value = values[metric]
+        def_value = def_values[metric]
+        if value is not None and def_value:
+            improvement = metric_senses[metric] * (value - def_value)
+            reward += weight * 100.0 * improvement / abs(def_value)
+    if metrics.get('censored', False):
+        reward = min(reward, 0)
+    return reward
+
+def _latency(metrics, fraction):
+    """ Returns latency percentile from sketch in metrics (None if unknown). """
+    if 'latency_sketch' not in metrics:
+        return None
+    sketch = QuantileSketch.from_dict(metrics['latency_sketch'])
+    return sketch.quantile(fraction)
+
+def _std_error(metrics, default_metrics):
+    """ Returns standard error of difference between means (0 if unknown). """
+    squared_error = 0
+    for m in [metrics, default_metrics]:
+        nr_samples = m.get('nr_samples') or 0
+        variance = m.get('variance')
+        if nr_samples < 2 or variance is None:
+            return 0
+        squared_error += variance / nr_samples
+    return math.sqrt(squared_error)
\ No newline at end of file
@@ -0,0 +1,71 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from search.objectives import metric_senses
+import json
+import os
+
+
+class ParetoFront():
+    """ Maintains configurations not dominated by others for several metrics. """
+
+    def __init__(self, metrics):
+        """ Initialize empty front for given metrics.
+
+        Args:
+            metrics: names of metrics to compare (see metric_senses)
+        """
+        self.metrics = list(metrics)
+        self.points = []
+
+    def add(self, config, values, eval_ctr=None):
+        """ Adds configuration unless it is dominated, removes dominated ones.
+
+        Args:
+            config: evaluated configuration
+            values: maps metrics to values measured for configuration
+            eval_ctr: number of evaluation within tuning run
+
+        Returns:
+            True iff the configuration was added to the front
+        """
+        point = {m:values.get(m) for m in self.metrics}
+        if None in point.values():
+            return False
+        for other in self.points:
+            if other['values'] == point or \
+                self._dominates(other['values'], point):
+                return False
+        self.points = [p for p in self.points
+                       if not self._dominates(point, p['values'])]
+        self.points.append(
+            {'eval':eval_ctr, 'config':config, 'values':point})
+        return True
+
+    def save(self, path, run_ctr):
+        """ Writes front of given run into JSON file.
+
+        Fronts of prior runs are kept unless this is the first run.
+
+        Args:
+            path: path to JSON file
+            run_ctr: number of current tuning run
+        """
+        runs = {}
+        if run_ctr > 0 and os.path.exists(path):
+            with open(path) as file:
+                runs = json.load(file)['runs']
+        runs[str(run_ctr)] = self.points
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump({'metrics':self.metrics, 'runs':runs}, file)
+        os.replace(tmp_path, path)
+
+    def _dominates(self, values_1, values_2):
+        """ Returns True iff first values are better or equal for all metrics
+        and strictly better for at least one metric. """
+        diffs = [metric_senses[m] * (values_1[m] - values_2[m])
+                 for m in self.metrics]
+        return min(diffs) >= 0 and max(diffs) > 0
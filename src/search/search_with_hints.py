@@ -6,31 +6,57 @@ Created on Apr 16, 2021
 from collections import defaultdict
 from dbms.generic_dbms import ConfigurableDBMS
 from benchmark.evaluate import Benchmark
+from benchmark.resources import PeakMemory
 from parameters.util import is_numerical, convert_to_bytes
-from search.objectives import calculate_reward
+from search.objectives import calculate_reward, metric_values, Objective, \
+    scalarized_reward, uses_latency
+from search.pareto import ParetoFront
+import json
+import math
 
 class ParameterExplorer():
     """ Explores the parameter space using previously collected tuning hints. """
 
-    def __init__(self, dbms: ConfigurableDBMS, benchmark: Benchmark, objective):
+    def __init__(
+            self, dbms: ConfigurableDBMS, benchmark: Benchmark, objective,
+            halving_eta=None, screen_plans=False, weights=None):
         """ Initializes for given benchmark and database system. 
         
         Args:
             dbms: explore parameters of this database system.
             benchmark: optimize parameters for this benchmark.
             objective: goal of parameter optimization.
+            halving_eta: pre-select configurations via successive halving
+                over query samples, keeping the best 1/halving_eta of them
+                per round (all configurations run all queries if None).
+            screen_plans: compare query plans before running the benchmark
+                and re-use measurements of configurations with same plans.
+            weights: maps metrics to weights for multi-objective tuning,
+                tracking the Pareto front (single objective if None).
         """
         self.dbms = dbms
         self.benchmark = benchmark
+        if benchmark and uses_latency(objective, weights):
+            benchmark.track_latency()
+        self.weights = weights
+        self.pareto = ParetoFront(weights) if weights else None
+        self.screen_plans = screen_plans
+        # Maps configuration and query index to plan fingerprint
+        self.plan_cache = {}
+        # Maps plans and other parameter settings to measurements
+        self.plan_metrics = {}
         self.def_metrics = self._def_conf_metrics()
         self.objective = objective
+        self.halving_eta = halving_eta
 
     def _def_conf_metrics(self):
         """ Returns metrics for running benchmark with default configuration. """
         if self.dbms and self.benchmark:
             self.dbms.reset_config()
             self.dbms.reconfigure()
-            def_metrics = self.benchmark.evaluate()
+            plan_key = self._plan_key()
+            def_metrics = self._run_benchmark()
+            self._store_plan_metrics(plan_key, def_metrics)
         else:
             print('Warning: no DBMS or benchmark specified for parameter exploration.')
             def_metrics = {'error': False, 'time': 0}
@@ -49,6 +75,9 @@ class ParameterExplorer():
         print(f'Weighted hints: {hint_to_weight}')
         configs = self._select_configs(hint_to_weight, nr_evals)
         print(f'Selected configurations: {configs}')
+        if self._can_halve():
+            configs = self._successive_halving(configs)
+            print(f'Promoted configurations: {configs}')
         # Identify best configuration
         max_reward = 0
         best_config = {}
@@ -138,6 +167,91 @@ class ParameterExplorer():
             param_to_vals[param] += [(value, weight)]
         return param_to_vals
     
+    def _can_halve(self):
+        """ Returns True iff configurations can be compared on query samples. """
+        return self.dbms is not None and \
+            self.halving_eta is not None and self.halving_eta > 1 and \
+            self.objective == Objective.TIME and \
+            hasattr(self.benchmark, 'evaluate_queries') and \
+            not self.def_metrics['error'] and \
+            len(self.def_metrics.get('query_ms', [])) == \
+            len(self.benchmark.queries)
+    
+    def _successive_halving(self, configs):
+        """ Filters configurations by evaluating them on growing query samples.
+        
+        All configurations are first evaluated on a small sample of queries.
+        Only the best configurations (a fraction of 1/halving_eta) are then
+        evaluated on a sample that is larger by factor halving_eta. This is
+        repeated until sample size reaches the number of workload queries.
+        
+        Args:
+            configs: list of candidate configurations
+        
+        Returns:
+            List of configurations to evaluate on the entire workload
+        """
+        eta = self.halving_eta
+        nr_queries = len(self.benchmark.queries)
+        nr_rounds = 0
+        while eta ** nr_rounds < len(configs):
+            nr_rounds += 1
+        for round_ctr in range(nr_rounds, 0, -1):
+            sample_size = max(1, round(nr_queries / eta ** round_ctr))
+            if len(configs) <= 1 or sample_size >= nr_queries:
+                break
+            query_ids = self._sample_queries(sample_size)
+            rewards = [self._evaluate_sample(c, query_ids) for c in configs]
+            ranked = sorted(
+                range(len(configs)), key=lambda i: rewards[i], reverse=True)
+            nr_promoted = math.ceil(len(configs) / eta)
+            configs = [configs[i] for i in ranked[:nr_promoted]]
+        return configs
+    
+    def _sample_queries(self, sample_size):
+        """ Select representative sample of workload queries.
+        
+        Queries are sorted by their (weighted) run time with default 
+        configuration and the sample is spread evenly over this order (i.e.,
+        it contains short-running as well as long-running queries).
+        
+        Args:
+            sample_size: number of queries to select
+        
+        Returns:
+            Sorted list of query indices
+        """
+        def_ms = self._weighted_def_ms()
+        by_time = sorted(range(len(def_ms)), key=lambda q: def_ms[q])
+        step = len(by_time) / sample_size
+        return sorted(by_time[int((i + 0.5) * step)] for i in range(sample_size))
+    
+    def _evaluate_sample(self, config, query_ids):
+        """ Evaluates configuration on query sample.
+        
+        Args:
+            config: dictionary mapping parameters to values
+            query_ids: indices of queries to run
+        
+        Returns:
+            Improvement over default configuration on query sample.
+        """
+        print(f'Trying configuration on {len(query_ids)} queries: {config}')
+        self.dbms.apply_config(config)
+        self.dbms.reconfigure()
+        metrics = self.benchmark.evaluate_queries(query_ids)
+        def_ms = self._weighted_def_ms()
+        def_metrics = {'error': False, 'time': sum(def_ms[q] for q in query_ids)}
+        reward = calculate_reward(metrics, def_metrics, self.objective)
+        print(f'Reward {reward} on query sample with {config}')
+        return reward
+    
+    def _weighted_def_ms(self):
+        """ Returns query times with default configuration, multiplied by
+        query weights (see benchmark.evaluate.query_weights). """
+        return [w * q_ms for w, q_ms in zip(
+            self.benchmark.weights, self.def_metrics['query_ms'])]
+    
     def _evaluate_config(self, config):
         """ Evaluates given configuration and returns duration in milliseconds. 
         
@@ -148,14 +262,93 @@ class ParameterExplorer():
             Improvement over default configuration in milliseconds.
         """
         if self.dbms:
-            self.dbms.reset_config()
             print(f'Trying configuration: {config}')
-            for param, value in config.items():
-                self.dbms.set_param_smart(param, value)
-            self.dbms.reconfigure()
-            metrics = self.benchmark.evaluate()
-            reward = calculate_reward(metrics, self.def_metrics, self.objective)
+            self.dbms.apply_config(config)
+            plan_key = self._plan_key()
+            if plan_key in self.plan_metrics:
+                print('Same plans as measured configuration - skip benchmark')
+                metrics = self.plan_metrics[plan_key]
+            else:
+                # Reconfiguration is deferred if results are cached
+                if not self.benchmark.has_cached_result():
+                    self.dbms.reconfigure()
+                metrics = self._run_benchmark()
+                self._store_plan_metrics(plan_key, metrics)
+            reward = self._reward(metrics)
             print(f'Reward {reward} with {config}')
             return reward
         else:
-            return 0
\ No newline at end of file
+            return 0
+    
+    def _reward(self, metrics):
+        """ Returns reward for metrics (scalarized for multiple objectives). """
+        if self.weights:
+            return scalarized_reward(metrics, self.def_metrics, self.weights)
+        else:
+            return calculate_reward(metrics, self.def_metrics, self.objective)
+    
+    def _run_benchmark(self):
+        """ Runs benchmark, adds memory consumption and updates Pareto front.
+        
+        Peak memory consumption of server processes (summed proportional
+        set size, sampled while the benchmark runs) is only measured for
+        database servers running on this machine (and not for cached 
+        results). Configured memory is the sum of memory parameters.
+        
+        Returns:
+            benchmark metrics with peak memory and configured memory (bytes)
+        """
+        memory = PeakMemory(self.dbms.server_pids())
+        memory.start()
+        metrics = self.benchmark.evaluate()
+        peak = memory.stop()
+        metrics['peak_rss'] = None if metrics.get('cached', False) else peak
+        metrics['config_memory'] = self.dbms.configured_memory()
+        if self.pareto is not None and not metrics['error'] and \
+            not metrics.get('censored', False):
+            config = self.dbms.changed()
+            values = metric_values(metrics)
+            if self.pareto.add(config, values, self.benchmark.eval_ctr):
+                print(f'Added to Pareto front: {values} with {config}')
+                if self.benchmark.log_path:
+                    self.pareto.save(
+                        self.benchmark.log_path + '_pareto', 
+                        self.benchmark.run_ctr)
+        return metrics
+    
+    def _plan_key(self):
+        """ Returns key identifying performance of applied configuration.
+        
+        The key consists of plan fingerprints for all workload queries 
+        and of the settings of all parameters that influence more than
+        query plans. Plans are obtained via EXPLAIN (without running the
+        benchmark) and cached per configuration and query.
+        
+        Returns:
+            tuple of strings or None if plans cannot be compared
+        """
+        if not self.screen_plans or not hasattr(self.benchmark, 'queries'):
+            return None
+        config = self.dbms.canonical_config(self.dbms.changed())
+        config_id = json.dumps(config)
+        nr_queries = len(self.benchmark.queries)
+        fingerprints = [
+            self.plan_cache.get((config_id, q)) for q in range(nr_queries)]
+        if None in fingerprints:
+            fingerprints = self.dbms.plan_fingerprints(self.benchmark.queries)
+            if fingerprints is None:
+                return None
+            for query_id, plan_id in enumerate(fingerprints):
+                self.plan_cache[(config_id, query_id)] = plan_id
+        plan_params = self.dbms.plan_params()
+        others = {p:v for p, v in config.items() if p not in plan_params}
+        return (json.dumps(others),) + tuple(fingerprints)
+    
+    def _store_plan_metrics(self, plan_key, metrics):
+        """ Store metrics for configurations with given key (see _plan_key). 
+        
+        Failed runs and runs aborted early (censored) are not stored.
+        """
+        if plan_key is not None and not metrics['error'] and \
+            not metrics.get('censored', False):
+            self.plan_metrics[plan_key] = metrics
@@ -0,0 +1,67 @@
+'''
+Created on Oct 18, 2026
+
+@author: immanueltrummer
+'''
+from search.objectives import parse_weights, scalarized_reward
+from search.pareto import ParetoFront
+import json
+import os
+import tempfile
+import unittest
+
+class TestParetoFront(unittest.TestCase):
+    """ Test tracking non-dominated configurations for several metrics. """
+
+    def test_add(self):
+        """ Test adding dominated and non-dominated configurations. """
+        front = ParetoFront(['time', 'config_memory'])
+        self.assertTrue(front.add({'a':'1'}, {'time':10, 'config_memory':5}))
+        self.assertTrue(front.add({'a':'2'}, {'time':5, 'config_memory':10}))
+        self.assertFalse(front.add({'a':'3'}, {'time':10, 'config_memory':10}))
+        self.assertFalse(front.add({'a':'4'}, {'time':5, 'config_memory':10}))
+        self.assertFalse(front.add({'a':'5'}, {'time':1, 'config_memory':None}))
+        self.assertEqual(len(front.points), 2)
+        self.assertTrue(front.add({'a':'6'}, {'time':4, 'config_memory':4}))
+        self.assertEqual([p['config'] for p in front.points], [{'a':'6'}])
+        front = ParetoFront(['throughput', 'peak_rss'])
+        front.add({}, {'throughput':10, 'peak_rss':100})
+        self.assertTrue(front.add({}, {'throughput':20, 'peak_rss':100}))
+        self.assertEqual(len(front.points), 1)
+
+    def test_save(self):
+        """ Test persisting fronts of several runs. """
+        front = ParetoFront(['time'])
+        front.add({'a':'1'}, {'time':10}, 3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results_pareto')
+            front.save(path, 0)
+            front.save(path, 1)
+            with open(path) as file:
+                data = json.load(file)
+            self.assertEqual(set(data['runs']), {'0', '1'})
+            self.assertEqual(data['runs']['0'][0]['eval'], 3)
+            front.save(path, 0)
+            with open(path) as file:
+                self.assertEqual(set(json.load(file)['runs']), {'0'})
+
+    def test_scalarization(self):
+        """ Test weighting relative improvements of several metrics. """
+        weights = parse_weights('time:1, config_memory:0.5')
+        self.assertEqual(weights, {'time':1, 'config_memory':0.5})
+        def_metrics = {'error':False, 'time':100, 'config_memory':1000}
+        metrics = {'error':False, 'time':80, 'config_memory':1500}
+        reward = scalarized_reward(metrics, def_metrics, weights)
+        self.assertAlmostEqual(reward, 20 - 25)
+        metrics['peak_rss'] = 10
+        weights['peak_rss'] = 1
+        self.assertAlmostEqual(
+            scalarized_reward(metrics, def_metrics, weights), reward)
+        metrics['error'] = True
+        self.assertLess(scalarized_reward(metrics, def_metrics, weights), 0)
+        with self.assertRaises(ValueError):
+            parse_weights('speed:1')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,13 @@ Created on Apr 20, 2021
 
 @author: immanueltrummer
 '''
+from benchmark.evaluate import OLAP, SimulatedOLAP
+from dbms.simulated import SimulatedDBMS
+from dbms.sqlite import SQLiteConfig
+from search.objectives import Objective
 from search.search_with_hints import ParameterExplorer
+import os
+import tempfile
 import unittest
 
 class TestParameterExplorer(unittest.TestCase):
@@ -19,4 +25,102 @@ class TestParameterExplorer(unittest.TestCase):
         hint_to_weight[('innodb_buffer_pool_size', 2)] = 10
         hint_to_weight[('innodb_buffer_pool_size', 4)] = 10
         print(self.explorer._gather_values(hint_to_weight))
-        print(self.explorer._select_configs(hint_to_weight, 2))
\ No newline at end of file
+        print(self.explorer._select_configs(hint_to_weight, 2))
+
+class TestSuccessiveHalving(unittest.TestCase):
+    """ Test pre-selecting configurations on query samples. """
+    
+    def setUp(self):
+        """ Initialize explorer for simulated DBMS and workload. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dbms = SimulatedDBMS()
+        self.bench = SimulatedOLAP(self.dbms)
+        self.bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        self.explorer = ParameterExplorer(
+            self.dbms, self.bench, Objective.TIME, halving_eta=3)
+    
+    def tearDown(self):
+        """ Delete result files. """
+        self.tmp_dir.cleanup()
+    
+    def test_sample_queries(self):
+        """ Test selecting queries with short and long run times. """
+        def_ms = self.explorer.def_metrics['query_ms']
+        query_ids = self.explorer._sample_queries(3)
+        self.assertEqual(len(set(query_ids)), 3)
+        self.assertEqual(query_ids, sorted(query_ids))
+        sample_ms = [def_ms[q] for q in query_ids]
+        self.assertLess(min(sample_ms), sorted(def_ms)[8])
+        self.assertGreater(max(sample_ms), sorted(def_ms)[-8])
+        self.assertEqual(len(self.explorer._sample_queries(22)), 22)
+    
+    def test_halving(self):
+        """ Test promoting best configurations to the full workload. """
+        configs = [{'random_page_cost':str(c)} for c in range(1, 10)]
+        configs[4] = {'shared_buffers':'2GB', 'work_mem':'256MB'}
+        promoted = self.explorer._successive_halving(configs)
+        self.assertEqual(promoted, [configs[4]])
+        # Query samples do not count as (logged) evaluations
+        self.assertEqual(self.bench.eval_ctr, 1)
+        self.explorer.halving_eta = None
+        self.assertFalse(self.explorer._can_halve())
+
+    
+    def test_multi_objective(self):
+        """ Test tracking Pareto front of time and configured memory. """
+        explorer = ParameterExplorer(
+            self.dbms, self.bench, Objective.TIME, 
+            weights={'time':1, 'config_memory':1})
+        self.assertGreater(explorer.def_metrics['config_memory'], 0)
+        self.assertEqual(len(explorer.pareto.points), 1)
+        # Less memory but slower than default configuration
+        reward = explorer._evaluate_config({'shared_buffers':'64MB'})
+        self.assertGreater(reward, 0)
+        self.assertEqual(len(explorer.pareto.points), 2)
+        explorer._evaluate_config({'random_page_cost':'100'})
+        self.assertEqual(len(explorer.pareto.points), 2)
+        self.assertTrue(os.path.exists(self.bench.log_path + '_pareto'))
+
+
+class TestPlanScreening(unittest.TestCase):
+    """ Test re-using measurements of configurations with same plans. """
+    
+    def setUp(self):
+        """ Initialize explorer for SQLite database and join query. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test.db')
+        query_path = os.path.join(self.tmp_dir.name, 'queries.sql')
+        with open(query_path, 'w') as file:
+            file.write('select count(*) from r, s where r.a = s.a;')
+        self.dbms = SQLiteConfig(db_path, 10)
+        self.dbms.update('create table r(a int)')
+        self.dbms.update('create table s(a int)')
+        self.bench = OLAP(self.dbms, query_path)
+        self.bench.reset(os.path.join(self.tmp_dir.name, 'results'), 0)
+        self.explorer = ParameterExplorer(
+            self.dbms, self.bench, Objective.TIME, screen_plans=True)
+    
+    def tearDown(self):
+        """ Close connection and delete files. """
+        self.dbms._disconnect()
+        self.tmp_dir.cleanup()
+    
+    def test_screening(self):
+        """ Test skipping benchmark runs if plans do not change. """
+        self.assertEqual(self.bench.eval_ctr, 1)
+        self.explorer._evaluate_config({'automatic_index':'on'})
+        self.assertEqual(self.bench.eval_ctr, 1)
+        self.explorer._evaluate_config({'automatic_index':'off'})
+        self.assertEqual(self.bench.eval_ctr, 2)
+        self.explorer._evaluate_config({'automatic_index':'0'})
+        self.assertEqual(self.bench.eval_ctr, 2)
+        # Other parameters may change performance without changing plans
+        self.explorer._evaluate_config({'cache_size':'100'})
+        self.assertEqual(self.bench.eval_ctr, 3)
+        self.assertEqual(len(self.explorer.plan_cache), 3)
+    
+    def test_disabled(self):
+        """ Test that all configurations run if screening is disabled. """
+        self.explorer.screen_plans = False
+        self.explorer._evaluate_config({'automatic_index':'on'})
+        self.assertEqual(self.bench.eval_ctr, 2)